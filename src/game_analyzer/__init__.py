@@ -1,13 +1,21 @@
-from .state import State, HashArray, HashState  # noqa: I001
+from .state import State, FrozenState, HashArray, HashState, StateEncoding, BoardSymmetry  # noqa: I001
+from .hash_index import DenseIndex, HashIndex, SortedIndex
 from .game import Game
-from .result import Result
+from .result import LazyResult, Result
 from .solver import Solver
 
 __all__ = [
     "Game",
     "Solver",
     "Result",
+    "LazyResult",
     "State",
+    "FrozenState",
     "HashArray",
     "HashState",
+    "StateEncoding",
+    "BoardSymmetry",
+    "HashIndex",
+    "DenseIndex",
+    "SortedIndex",
 ]
@@ -0,0 +1,11 @@
+from .runner import BACKEND_DICT, SIZE_LIST, WORKLOAD_DICT, compare, run_case, run_isolated, run_suite
+
+__all__ = [
+    "BACKEND_DICT",
+    "SIZE_LIST",
+    "WORKLOAD_DICT",
+    "compare",
+    "run_case",
+    "run_isolated",
+    "run_suite",
+]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .runner import BACKEND_DICT, SIZE_LIST, WORKLOAD_DICT, compare, run_suite
+
+
+def _format_record(record: dict) -> str:
+    head = f"{record['workload']:>10} {record['size']:>9} {record['backend']:>8}"
+    if "error" in record:
+        return f"{head} error={record['error']}"
+    return (
+        f"{head} nodes={record['nodes']:>9} sgg={record['sgg_time']:8.3f}s ra={record['ra_time']:8.3f}s"
+        f" rate={record['nodes_per_sec']:10.0f}/s peak={record['peak_rss'] / (1 << 20):8.1f}MB"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m game_analyzer.bench")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOAD_DICT), choices=list(WORKLOAD_DICT))
+    parser.add_argument("--backends", nargs="+", default=list(BACKEND_DICT), choices=list(BACKEND_DICT))
+    parser.add_argument("--sizes", nargs="+", type=float, default=None)
+    parser.add_argument("--max-size", type=float, default=1e5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--time-threshold", type=float, default=0.2)
+    parser.add_argument("--memory-threshold", type=float, default=0.2)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--no-isolate", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.sizes is None:
+        size_list = [size for size in SIZE_LIST if size <= args.max_size]
+    else:
+        size_list = [int(size) for size in args.sizes]
+    report = run_suite(
+        args.workloads,
+        size_list,
+        args.backends,
+        args.seed,
+        not args.no_isolate,
+        callback=lambda record: print(_format_record(record), flush=True),
+    )
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regression_list = compare(report, baseline, args.time_threshold, args.memory_threshold, args.min_time)
+    for regression in regression_list:
+        case, metric = regression["case"], regression["metric"]
+        print(f"REGRESSION {case} {metric}: {regression['baseline']} -> {regression['current']}")
+    return 1 if regression_list else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
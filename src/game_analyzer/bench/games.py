@@ -0,0 +1,183 @@
+# ruff: noqa: PLR6301, ARG002
+from __future__ import annotations
+
+import random
+import string
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+
+from game_analyzer import Game, State
+
+ALPHABET = string.ascii_lowercase
+
+
+@dataclass
+class StonesState(State):
+    stones: int
+
+
+class Stones(Game):
+    def __init__(self, init_stones: int, hand_list: list[int]):
+        self.init_state = StonesState(stones=init_stones)
+        self.hand_list = hand_list
+        self.default_eval = -1
+
+    def find_next_states(self, state):
+        for hand in self.hand_list:
+            next_stones = state.stones - hand
+            if next_stones >= 0:
+                yield StonesState(stones=next_stones)
+
+    def find_mirror_states(self, state):
+        yield state
+
+    def evaluate_state(self, state):
+        return None
+
+
+class BatchStones(Stones):
+    def encode_state(self, state):
+        return state.stones
+
+    def decode_state(self, code):
+        return StonesState(stones=code)
+
+    def find_next_states_batch(self, codes):
+        next_stones = codes.astype(np.int64)[:, None] - np.array(self.hand_list)[None, :]
+        parent, hand = np.nonzero(next_stones >= 0)
+        return parent, next_stones[parent, hand], np.full(len(parent), self.NO_EVAL)
+
+
+@dataclass
+class LRUDState(State):
+    r: int
+    c: int
+    step: int
+    turn: Literal[0, 1]
+
+
+class LRUD(Game):
+    move_dict = {"L": (0, -1), "R": (0, 1), "U": (-1, 0), "D": (1, 0)}
+
+    def __init__(self, h: int, w: int, init_cd: tuple[int, int], s_list: str, t_list: str, max_step: int):  # noqa: PLR0913, PLR0917
+        self.h = h
+        self.w = w
+        self.s_list = s_list
+        self.t_list = t_list
+        self.max_step = max_step
+        r, c = init_cd
+        self.init_state = LRUDState(r=r, c=c, step=0, turn=0)
+
+    def find_next_states(self, state):
+        r, c, step, turn = state.r, state.c, state.step, state.turn
+        move_list = self.s_list if turn == 0 else self.t_list
+        for dr, dc in [(0, 0), self.move_dict[move_list[step]]]:
+            yield LRUDState(r=r + dr, c=c + dc, step=step + turn, turn=1 - turn)
+
+    def find_mirror_states(self, state):
+        yield state
+
+    def evaluate_state(self, state):
+        if not (1 <= state.r <= self.h and 1 <= state.c <= self.w):
+            return 1 if state.turn == 0 else -1
+        if state.step == self.max_step:
+            return -1 if state.turn == 0 else 1
+        return None
+
+
+@dataclass
+class ShiritoriState(State):
+    last: Literal[-1] | str
+
+
+class Shiritori(Game):
+    def __init__(self, words: list[str], key_len: int = 3):
+        self.words = words
+        self.key_len = key_len
+        self.word_dict: dict[str, set[str]] = {}
+        for word in words:
+            self.word_dict.setdefault(word[:key_len], set()).add(word[-key_len:])
+        self.default_eval = 1
+        self.init_state = ShiritoriState(last=-1)
+
+    def find_next_states(self, state):
+        if state.last == -1:
+            for word in self.words:
+                yield ShiritoriState(last=word[-self.key_len :])
+            return
+        for last in self.word_dict.get(state.last, ()):
+            yield ShiritoriState(last=last)
+
+    def find_mirror_states(self, state):
+        yield state
+
+    def evaluate_state(self, state):
+        return None
+
+
+@dataclass
+class GraphState(State):
+    position: int
+    confirm: bool
+    turn: Literal[0, 1]
+
+
+class Graph(Game):
+    def __init__(self, point_list: list[int], edge_list: list[tuple[int, int]]):
+        self.point_list = point_list
+        self.graph: list[list[int]] = [[] for _ in range(len(point_list))]
+        for u, v in edge_list:
+            self.graph[u - 1].append(v - 1)
+        self.init_state = GraphState(position=0, confirm=False, turn=0)
+
+    def find_next_states(self, state):
+        for node in self.graph[state.position]:
+            yield GraphState(position=node, confirm=False, turn=1 - state.turn)
+        yield GraphState(position=state.position, confirm=True, turn=1 - state.turn)
+
+    def find_mirror_states(self, state):
+        yield state
+
+    def evaluate_state(self, state):
+        if state.confirm:
+            point = self.point_list[state.position]
+            return point if state.turn == 0 else -point
+        return None
+
+
+def make_stones(size: int, seed: int, *, batch: bool = False) -> Stones:  # noqa: ARG001
+    cls = BatchStones if batch else Stones
+    return cls(init_stones=size - 1, hand_list=[1, 2, 3])
+
+
+def make_lrud(size: int, seed: int) -> LRUD:
+    rnd = random.Random(seed)
+    side = max(4, round((size * 1.4) ** (1 / 3)))
+    max_step = side
+    s_list = "".join(rnd.choice("LRUD") for _ in range(max_step))
+    t_list = "".join(rnd.choice("LRUD") for _ in range(max_step))
+    return LRUD(side, side, (side // 2, side // 2), s_list, t_list, max_step)
+
+
+def make_shiritori(size: int, seed: int) -> Shiritori:
+    rnd = random.Random(seed)
+    key_len = 1
+    while len(ALPHABET) ** key_len < 2 * size:
+        key_len += 1
+
+    def key(i: int) -> str:
+        return "".join(ALPHABET[i // len(ALPHABET) ** k % len(ALPHABET)] for k in range(key_len))
+
+    key_list = [key(i) for i in rnd.sample(range(len(ALPHABET) ** key_len), size)]
+    words = [rnd.choice(key_list) + rnd.choice(key_list) for _ in range(2 * size)]
+    return Shiritori(words, key_len)
+
+
+def make_graph(size: int, seed: int) -> Graph:
+    rnd = random.Random(seed)
+    n = max(2, size // 4)
+    point_list = [rnd.randrange(1, 10) for _ in range(n)]
+    edge_list = [(u, rnd.randrange(1, n + 1)) for u in range(1, n + 1) for _ in range(2)]
+    return Graph(point_list, edge_list)
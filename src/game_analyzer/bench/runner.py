@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import platform
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+
+import numpy as np
+
+from game_analyzer import Game, Solver
+
+from .games import make_graph, make_lrud, make_shiritori, make_stones
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+SIZE_LIST = [10**3, 10**4, 10**5, 10**6, 10**7]
+WORKLOAD_DICT: dict[str, Callable[[int, int], Game]] = {
+    "stones": make_stones,
+    "lrud": make_lrud,
+    "shiritori": make_shiritori,
+    "graph": make_graph,
+}
+BACKEND_DICT: dict[str, dict] = {
+    "python": {},
+    "numpy": {"ra_backend": "numpy"},
+    "hash": {"index": "hash"},
+    "parallel": {"workers": 2},
+    "workdir": {"workdir": None},
+    "batch": {},
+}
+BATCH_WORKLOAD_LIST = ["stones"]
+
+
+def _peak_rss() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_case(workload: str, size: int, backend: str, seed: int = 0) -> dict:
+    game = make_stones(size, seed, batch=True) if backend == "batch" else WORKLOAD_DICT[workload](size, seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        kwargs = {key: tmp_dir if value is None else value for key, value in BACKEND_DICT[backend].items()}
+        start_rss = _peak_rss()
+        solver = Solver(**kwargs)
+        start_time = time.perf_counter()
+        result = solver.solve(game)
+        total_time = time.perf_counter() - start_time
+        edges = solver._graph_inv.edge_size  # noqa: SLF001
+        nodes = solver.node_size
+        root = result.state_to_params(game.init_state)
+    return {
+        "workload": workload,
+        "size": size,
+        "backend": backend,
+        "seed": seed,
+        "nodes": nodes,
+        "edges": edges,
+        "sgg_time": result.sgg_time,
+        "ra_time": result.ra_time,
+        "total_time": total_time,
+        "nodes_per_sec": nodes / total_time if total_time > 0 else 0.0,
+        "start_rss": start_rss,
+        "peak_rss": _peak_rss(),
+        "root": None if root is None else [int(root[0]), int(root[1])],
+    }
+
+
+def _run_case_child(conn, workload: str, size: int, backend: str, seed: int) -> None:
+    try:
+        conn.send(run_case(workload, size, backend, seed))
+    except Exception as e:  # noqa: BLE001
+        conn.send({"workload": workload, "size": size, "backend": backend, "seed": seed, "error": repr(e)})
+    finally:
+        conn.close()
+
+
+def run_isolated(workload: str, size: int, backend: str, seed: int = 0) -> dict:
+    ctx = mp.get_context("spawn")
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_run_case_child, args=(send_conn, workload, size, backend, seed))
+    process.start()
+    send_conn.close()
+    try:
+        record = recv_conn.recv()
+    except EOFError:
+        record = {"workload": workload, "size": size, "backend": backend, "seed": seed, "error": "worker died"}
+    process.join()
+    return record
+
+
+def iter_cases(workload_list: Iterable[str], size_list: Iterable[int], backend_list: Iterable[str]):
+    for workload in workload_list:
+        for size in size_list:
+            for backend in backend_list:
+                if backend == "batch" and workload not in BATCH_WORKLOAD_LIST:
+                    continue
+                yield workload, size, backend
+
+
+def run_suite(  # noqa: PLR0913, PLR0917
+    workload_list: Iterable[str],
+    size_list: Iterable[int],
+    backend_list: Iterable[str],
+    seed: int = 0,
+    isolate: bool = True,  # noqa: FBT001, FBT002
+    callback: Callable[[dict], None] | None = None,
+) -> dict:
+    run = run_isolated if isolate else run_case
+    record_list = []
+    for workload, size, backend in iter_cases(workload_list, list(size_list), list(backend_list)):
+        record = run(workload, size, backend, seed)
+        record_list.append(record)
+        if callback is not None:
+            callback(record)
+    return {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": record_list,
+    }
+
+
+def _case_key(record: dict) -> tuple:
+    return record["workload"], record["size"], record["backend"], record.get("seed", 0)
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    time_threshold: float = 0.2,
+    memory_threshold: float = 0.2,
+    min_time: float = 0.05,
+) -> list[dict]:
+    baseline_dict = {_case_key(record): record for record in baseline["results"] if "error" not in record}
+    regression_list = []
+    for record in current["results"]:
+        base = baseline_dict.get(_case_key(record))
+        if base is None:
+            continue
+        if "error" in record:
+            regression_list.append({"case": _case_key(record), "metric": "error", "baseline": None, "current": None})
+            continue
+        if record["root"] != base["root"]:
+            regression_list.append({
+                "case": _case_key(record),
+                "metric": "root",
+                "baseline": base["root"],
+                "current": record["root"],
+            })
+        for metric, threshold in [
+            ("total_time", time_threshold),
+            ("sgg_time", time_threshold),
+            ("ra_time", time_threshold),
+            ("peak_rss", memory_threshold),
+        ]:
+            if metric.endswith("_time") and base[metric] < min_time:
+                continue
+            if base[metric] > 0 and record[metric] > base[metric] * (1 + threshold):
+                regression_list.append({
+                    "case": _case_key(record),
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": record[metric],
+                })
+    return regression_list
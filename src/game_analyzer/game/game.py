@@ -1,15 +1,21 @@
 from abc import ABC, abstractmethod
+from array import array
 from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import Literal
+from functools import cached_property
+from typing import ClassVar, Literal
 
-from game_analyzer import State
+import numpy as np
+
+from game_analyzer import BoardSymmetry, State, StateEncoding
 
 
 @dataclass
 class Game(ABC):
     init_state: State
     default_eval: int = 0
+    symmetry: BoardSymmetry | None = None
+    NO_EVAL: ClassVar[int] = -(1 << 31)
 
     @abstractmethod
     def find_next_states(self, state: State) -> Iterable[State]:
@@ -22,3 +28,38 @@ class Game(ABC):
     @abstractmethod
     def evaluate_state(self, state: State) -> Literal[-1, 0, 1] | None:
         return None
+
+    def mirror_digests(self, state: State) -> Iterable[int]:
+        if self.symmetry is not None:
+            return self.symmetry.mirror_digests(state)
+        return (mirror_state.digest for mirror_state in self.find_mirror_states(state))
+
+    def canonical_digest(self, state: State) -> int:
+        return min(self.mirror_digests(state))
+
+    def state_encoding(self) -> StateEncoding:
+        return StateEncoding.from_type(type(self.init_state))
+
+    @cached_property
+    def _state_encoding(self) -> StateEncoding:
+        return self.state_encoding()
+
+    def encode_state(self, state: State) -> int:
+        return self._state_encoding.encode(state)
+
+    def decode_state(self, code: int) -> State:
+        return self._state_encoding.decode(code)
+
+    def find_next_states_batch(self, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        parent_list, next_code_list, next_res_list = array("q"), array("Q"), array("q")
+        for parent, code in enumerate(np.asarray(codes).tolist()):
+            for next_state in self.find_next_states(self.decode_state(code)):
+                next_res = self.evaluate_state(next_state)
+                parent_list.append(parent)
+                next_code_list.append(self.encode_state(next_state))
+                next_res_list.append(self.NO_EVAL if next_res is None else next_res)
+        return (
+            np.frombuffer(parent_list, dtype=np.int64),
+            np.frombuffer(next_code_list, dtype=np.uint64),
+            np.frombuffer(next_res_list, dtype=np.int64),
+        )
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+
+import numpy as np
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_MAX_VALUE = (1 << 32) - 1
+
+
+class HashIndex:
+    def __init__(self, capacity: int = 8, max_load: float = 0.7):
+        self._max_load = max_load
+        self._key_list = array("Q")
+        self._value_list = array("I")
+        self._init_slots(capacity)
+
+    def __len__(self) -> int:
+        return len(self._key_list)
+
+    def __contains__(self, key: int) -> bool:
+        return self._find(key) >= 0
+
+    def __getitem__(self, key: int) -> int:
+        entry = self._find(key)
+        if entry < 0:
+            raise KeyError(key)
+        return self._value_list[entry]
+
+    def __setitem__(self, key: int, value: int) -> None:
+        if not 0 <= value < _MAX_VALUE:
+            raise ValueError("value out of range")
+        slot_list, key_list, mask = self._slot_list, self._key_list, self._mask
+        pos = ((key * _GOLDEN) & _MASK64) >> self._shift
+        while True:
+            entry = slot_list[pos]
+            if entry == 0:
+                break
+            if key_list[entry - 1] == key:
+                self._value_list[entry - 1] = value
+                return
+            pos = (pos + 1) & mask
+        key_list.append(key)
+        self._value_list.append(value)
+        slot_list[pos] = len(key_list)
+        if len(key_list) > self._max_size:
+            self._init_slots(len(key_list) * 2)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._key_list)
+
+    def __getstate__(self) -> dict:
+        return {"max_load": self._max_load, "key_list": self._key_list, "value_list": self._value_list}
+
+    def __setstate__(self, state: dict) -> None:
+        self._max_load = state["max_load"]
+        self._key_list = state["key_list"]
+        self._value_list = state["value_list"]
+        self._init_slots(len(self._key_list))
+
+    def get(self, key: int, default: int | None = None) -> int | None:
+        slot_list, key_list, mask = self._slot_list, self._key_list, self._mask
+        pos = ((key * _GOLDEN) & _MASK64) >> self._shift
+        while True:
+            entry = slot_list[pos]
+            if entry == 0:
+                return default
+            if key_list[entry - 1] == key:
+                return self._value_list[entry - 1]
+            pos = (pos + 1) & mask
+
+    def items(self) -> Iterator[tuple[int, int]]:
+        return zip(self._key_list, self._value_list, strict=True)
+
+    def clear(self) -> None:
+        del self._key_list[:]
+        del self._value_list[:]
+        self._init_slots(8)
+
+    def keys(self) -> np.ndarray:
+        return np.array(self._key_list, dtype=np.uint64)
+
+    def values(self) -> np.ndarray:
+        return np.array(self._value_list, dtype=np.uint32)
+
+    def items_since(self, start: int) -> tuple[array, array]:
+        return self._key_list[start:], self._value_list[start:]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._slot_list) * 4 + len(self._key_list) * 12
+
+    @classmethod
+    def from_arrays(cls, keys: np.ndarray, values: np.ndarray, max_load: float = 0.7) -> HashIndex:
+        index = cls(max_load=max_load)
+        index._key_list.frombytes(np.ascontiguousarray(keys, dtype=np.uint64).tobytes())  # noqa: SLF001
+        index._value_list.frombytes(np.ascontiguousarray(values, dtype=np.uint32).tobytes())  # noqa: SLF001
+        index._init_slots(len(index))  # noqa: SLF001
+        return index
+
+    def get_many(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        keys = np.ascontiguousarray(keys, dtype=np.uint64)
+        slots = np.frombuffer(self._slot_list, dtype=np.uint32)
+        key_arr = np.frombuffer(self._key_list, dtype=np.uint64)
+        value_arr = np.frombuffer(self._value_list, dtype=np.uint32)
+        values = np.zeros(len(keys), dtype=np.uint32)
+        found = np.zeros(len(keys), dtype=bool)
+        todo = np.arange(len(keys))
+        pos = self._positions(keys)
+        while len(todo) > 0:
+            entry = slots[pos].astype(np.int64)
+            hit = entry > 0
+            hit[hit] = key_arr[entry[hit] - 1] == keys[todo[hit]]
+            found[todo[hit]] = True
+            values[todo[hit]] = value_arr[entry[hit] - 1]
+            rest = (entry > 0) & ~hit
+            todo = todo[rest]
+            pos = (pos[rest] + 1) & self._mask
+        return values, found
+
+    def _find(self, key: int) -> int:
+        slot_list, key_list, mask = self._slot_list, self._key_list, self._mask
+        pos = ((key * _GOLDEN) & _MASK64) >> self._shift
+        while True:
+            entry = slot_list[pos]
+            if entry == 0:
+                return -1
+            if key_list[entry - 1] == key:
+                return entry - 1
+            pos = (pos + 1) & mask
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        return ((keys * np.uint64(_GOLDEN)) >> np.uint64(self._shift)).astype(np.int64)
+
+    def _init_slots(self, capacity: int) -> None:
+        bit_size = 3
+        while (1 << bit_size) * self._max_load < max(capacity, 1):
+            bit_size += 1
+        slot_size = 1 << bit_size
+        self._shift = 64 - bit_size
+        self._mask = slot_size - 1
+        self._max_size = int(slot_size * self._max_load)
+        slots = np.zeros(slot_size, dtype=np.uint32)
+        size = len(self._key_list)
+        if size > 0:
+            keys = np.frombuffer(self._key_list, dtype=np.uint64)
+            todo = np.arange(size)
+            pos = self._positions(keys)
+            while len(todo) > 0:
+                free = slots[pos] == 0
+                _, first = np.unique(pos, return_index=True)
+                claim = np.zeros(len(todo), dtype=bool)
+                claim[first] = True
+                claim &= free
+                slots[pos[claim]] = todo[claim] + 1
+                todo, pos, free = todo[~claim], pos[~claim], free[~claim]
+                pos[~free] = (pos[~free] + 1) & self._mask
+        self._slot_list = array("I")
+        self._slot_list.frombytes(slots.tobytes())
+
+
+class SortedIndex:
+    def __init__(self, buffer):
+        self._key_list = memoryview(buffer).cast("B").cast("Q")
+        self._keys = np.frombuffer(self._key_list, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._key_list)
+
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: int) -> int:
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._key_list)
+
+    def get(self, key: int, default: int | None = None) -> int | None:
+        key_list = self._key_list
+        entry = bisect_left(key_list, key)
+        if entry < len(key_list) and key_list[entry] == key:
+            return entry
+        return default
+
+    def items(self) -> Iterator[tuple[int, int]]:
+        return zip(self._key_list, range(len(self)), strict=True)
+
+    def keys(self) -> np.ndarray:
+        return self._keys
+
+    def values(self) -> np.ndarray:
+        return np.arange(len(self), dtype=np.uint32)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * 8
+
+    def get_many(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        keys = np.ascontiguousarray(keys, dtype=np.uint64)
+        values = np.searchsorted(self._keys, keys).astype(np.uint32)
+        found = values < len(self)
+        found[found] = self._keys[values[found]] == keys[found]
+        values[~found] = 0
+        return values, found
+
+
+class DenseIndex:
+    def __init__(self, size: int):
+        self.size = size
+        self._slot_list = array("I")
+        self._slot_list.frombytes(np.full(size, _MAX_VALUE, dtype=np.uint32).tobytes())
+        self._key_list = array("Q")
+
+    def __len__(self) -> int:
+        return len(self._key_list)
+
+    def __contains__(self, key: int) -> bool:
+        return 0 <= key < self.size and self._slot_list[key] != _MAX_VALUE
+
+    def __getitem__(self, key: int) -> int:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: int, value: int) -> None:
+        if not 0 <= value < _MAX_VALUE:
+            raise ValueError("value out of range")
+        if not 0 <= key < self.size:
+            raise ValueError("key out of range")
+        if self._slot_list[key] == _MAX_VALUE:
+            self._key_list.append(key)
+        self._slot_list[key] = value
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._key_list)
+
+    def get(self, key: int, default: int | None = None) -> int | None:
+        if not 0 <= key < self.size:
+            return default
+        value = self._slot_list[key]
+        return default if value == _MAX_VALUE else value
+
+    def items(self) -> Iterator[tuple[int, int]]:
+        slot_list = self._slot_list
+        return ((key, slot_list[key]) for key in self._key_list)
+
+    def clear(self) -> None:
+        np.frombuffer(self._slot_list, dtype=np.uint32)[self.keys().astype(np.int64)] = _MAX_VALUE
+        del self._key_list[:]
+
+    def keys(self) -> np.ndarray:
+        return np.array(self._key_list, dtype=np.uint64)
+
+    def values(self) -> np.ndarray:
+        return np.frombuffer(self._slot_list, dtype=np.uint32)[self.keys().astype(np.int64)]
+
+    def items_since(self, start: int) -> tuple[array, array]:
+        keys = self._key_list[start:]
+        values = array("I")
+        values.frombytes(np.frombuffer(self._slot_list, dtype=np.uint32)[np.frombuffer(keys, dtype=np.int64)].tobytes())
+        return keys, values
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._slot_list) * 4 + len(self._key_list) * 8
+
+    @classmethod
+    def from_arrays(cls, size: int, keys: np.ndarray, values: np.ndarray) -> DenseIndex:
+        index = cls(size)
+        keys = np.ascontiguousarray(keys, dtype=np.uint64)
+        slots = np.frombuffer(index._slot_list, dtype=np.uint32)  # noqa: SLF001
+        slots[keys.astype(np.int64)] = values
+        index._key_list.frombytes(keys.tobytes())  # noqa: SLF001
+        return index
+
+    def get_many(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        keys = np.ascontiguousarray(keys, dtype=np.uint64)
+        inside = keys < self.size
+        values = np.full(len(keys), _MAX_VALUE, dtype=np.uint32)
+        values[inside] = np.frombuffer(self._slot_list, dtype=np.uint32)[keys[inside].astype(np.int64)]
+        found = values != _MAX_VALUE
+        values[~found] = 0
+        return values, found
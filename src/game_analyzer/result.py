@@ -1,20 +1,191 @@
+from __future__ import annotations
+
+import io
+import mmap as _mmap
+import pickle  # noqa: S403
+import struct
 from array import array
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from game_analyzer import Game, HashIndex, SortedIndex, State, StateEncoding
+from game_analyzer.state.state import dump_digest_maps, loaded_digest, merge_digest_maps, state_classes
+
+_MAGIC = b"GARESULT"
+_VERSION = 2
+_HEADER = struct.Struct("<8sIcBxxQdd")
+_CANONICAL = 1
+_DENSE = 2
+
+
+def _layout(size: int, eval_itemsize: int) -> tuple[int, int, int, int]:
+    key_start = _HEADER.size
+    eval_start = key_start + size * 8
+    depth_start = -(-(eval_start + size * eval_itemsize) // 4) * 4
+    table_start = depth_start + size * 4
+    return key_start, eval_start, depth_start, table_start
 
-from game_analyzer import State
+
+def _read_trailer(
+    data: memoryview,
+    flags: int,
+    game: Game | None,
+) -> dict:
+    f = io.BytesIO(data)
+    digest_map_dict = pickle.load(f)  # noqa: S301
+    encoding = pickle.load(f) if flags & _DENSE else None  # noqa: S301
+    key_func, state_types = None, None
+    if encoding is not None:
+        key_func, digest_map_dict = encoding.encode, None
+    else:
+        try:
+            merge_digest_maps(digest_map_dict)
+        except ValueError:
+            key_func = partial(loaded_digest, digest_map_dict=digest_map_dict)
+        else:
+            state_types, digest_map_dict = state_classes(digest_map_dict), None
+    if flags & _CANONICAL:
+        if game is None:
+            raise ValueError("canonical results need the game to load")
+        key_func = game.canonical_digest if key_func is None else partial(_canonical_key, game=game, key_func=key_func)
+    return {
+        "key_func": key_func,
+        "canonical": bool(flags & _CANONICAL),
+        "encoding": encoding,
+        "digest_map_dict": digest_map_dict,
+        "state_types": state_types,
+    }
+
+
+def _canonical_key(state: State, game: Game, key_func: Callable[[State], int]) -> int:
+    return min(map(key_func, game.find_mirror_states(state)))
 
 
 @dataclass
 class Result:
-    hash_dict: dict[int, int]
-    eval_list: array
-    depth_list: array
+    hash_dict: dict[int, int] | HashIndex | SortedIndex
+    eval_list: array | memoryview
+    depth_list: array | memoryview
     sgg_time: float
     ra_time: float
+    _lookup_index: HashIndex | SortedIndex | None = field(default=None, init=False, repr=False, compare=False)
+    budget_exceeded: str | None = None
+    profile: dict[str, dict[str, float]] | None = None
+    key_func: Callable[[State], int] | None = field(default=None, repr=False, compare=False)
+    canonical: bool = False
+    encoding: StateEncoding | None = field(default=None, repr=False, compare=False)
+    digest_map_dict: dict[str, dict] | None = field(default=None, repr=False, compare=False)
+    state_types: set[type[State]] | None = field(default=None, repr=False, compare=False)
 
     def state_to_params(self, state: State) -> tuple[int, int] | None:
-        state_hash = state.digest
-        if state_hash in self.hash_dict:
-            idx = self.hash_dict[state_hash]
-            return self.eval_list[idx], self.depth_list[idx]
-        return None
+        idx = self.hash_dict.get(self.state_key(state))
+        if idx is None:
+            return None
+        return self.eval_list[idx], self.depth_list[idx]
+
+    def state_key(self, state: State) -> int:
+        if self.key_func is None:
+            return state.digest  # type: ignore
+        return self.key_func(state)
+
+    def lookup_digests(self, digests: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._lookup_index is None:
+            if isinstance(self.hash_dict, dict):
+                keys = np.fromiter(self.hash_dict.keys(), dtype=np.uint64, count=len(self.hash_dict))
+                values = np.fromiter(self.hash_dict.values(), dtype=np.uint32, count=len(self.hash_dict))
+                self._lookup_index = HashIndex.from_arrays(keys, values)
+            else:
+                self._lookup_index = self.hash_dict
+        idx, found = self._lookup_index.get_many(digests)
+        evals = np.zeros(len(idx), dtype=np.int32)
+        depths = np.full(len(idx), -1, dtype=np.int32)
+        evals[found] = np.asarray(self.eval_list)[idx[found]]
+        depths[found] = np.asarray(self.depth_list)[idx[found]]
+        return evals, depths, found
+
+    def lookup_many(self, states: Sequence[State]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if len(states) == 0:
+            return self.lookup_digests(np.zeros(0, dtype=np.uint64))
+        if self.key_func is not None:
+            return self.lookup_digests(np.fromiter(map(self.key_func, states), dtype=np.uint64, count=len(states)))
+        return self.lookup_digests(type(states[0]).digest_many(states))
+
+    def save(self, path: str | Path) -> None:
+        if isinstance(self.hash_dict, dict):
+            keys = np.fromiter(self.hash_dict.keys(), dtype=np.uint64, count=len(self.hash_dict))
+            values = np.fromiter(self.hash_dict.values(), dtype=np.int64, count=len(self.hash_dict))
+        else:
+            keys, values = self.hash_dict.keys(), self.hash_dict.values()
+        order = np.argsort(keys, kind="stable")
+        keys, values = keys[order], values[order]
+        evals = np.asarray(self.eval_list)[values]
+        depths = np.asarray(self.depth_list, dtype=np.int32)[values]
+        eval_typecode = "b" if len(evals) == 0 or (evals.min() >= -128 and evals.max() <= 127) else "i"  # noqa: PLR2004
+        evals = evals.astype(np.int8 if eval_typecode == "b" else np.int32)
+        _, eval_start, depth_start, _ = _layout(len(keys), evals.itemsize)
+        flags = (_CANONICAL if self.canonical else 0) | (0 if self.encoding is None else _DENSE)
+        if self.encoding is not None:
+            digest_map_dict = {}
+        elif self.digest_map_dict is not None:
+            digest_map_dict = self.digest_map_dict
+        else:
+            digest_map_dict = dump_digest_maps(self.state_types)
+        header = _HEADER.pack(_MAGIC, _VERSION, eval_typecode.encode(), flags, len(keys), self.sgg_time, self.ra_time)
+        with Path(path).open("wb") as f:
+            f.write(header)
+            f.write(keys.tobytes())
+            f.write(evals.tobytes())
+            f.write(bytes(depth_start - eval_start - evals.nbytes))
+            f.write(depths.tobytes())
+            pickle.dump(digest_map_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if self.encoding is not None:
+                pickle.dump(self.encoding, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True, game: Game | None = None) -> Result:  # noqa: FBT001, FBT002
+        with Path(path).open("rb") as f:
+            buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ) if mmap else f.read()
+        magic, version, eval_typecode, flags, size, sgg_time, ra_time = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("unsupported result file")
+        eval_typecode = eval_typecode.decode()
+        key_start, eval_start, depth_start, table_start = _layout(size, array(eval_typecode).itemsize)
+        view = memoryview(buffer)
+        return cls(
+            hash_dict=SortedIndex(view[key_start:eval_start]),
+            eval_list=view[eval_start:depth_start].cast(eval_typecode)[:size],
+            depth_list=view[depth_start:table_start].cast("i"),
+            sgg_time=sgg_time,
+            ra_time=ra_time,
+            **_read_trailer(view[table_start:], flags, game),
+        )
+
+
+@dataclass
+class LazyResult(Result):
+    expand: Callable[[State], tuple[float, float]] | None = field(default=None, repr=False, compare=False)
+
+    def state_to_params(self, state: State) -> tuple[int, int] | None:
+        if self.hash_dict.get(self.state_key(state)) is None:
+            self._expand(state)
+        return super().state_to_params(state)
+
+    def lookup_many(self, states: Sequence[State]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        evals, depths, found = super().lookup_many(states)
+        if found.all():
+            return evals, depths, found
+        for i in np.flatnonzero(~found).tolist():
+            self._expand(states[i])
+        return super().lookup_many(states)
+
+    def _expand(self, state: State) -> None:
+        if self.expand is None:
+            return
+        sgg_time, ra_time = self.expand(state)
+        self.sgg_time += sgg_time
+        self.ra_time += ra_time
+        self._lookup_index = None
@@ -1,5 +1,10 @@
 from .solver import Solver
+from .telemetry import JsonlSink, LogSink, Progress, PrometheusSink
 
 __all__ = [
+    "JsonlSink",
+    "LogSink",
+    "Progress",
+    "PrometheusSink",
     "Solver",
 ]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from array import array
+from heapq import heappop, heappush
+
+
+def is_better_eval(ev: int, depth: int, cur_ev: int, cur_depth: int) -> bool:
+    if cur_depth == -1 or cur_ev < ev:
+        return True
+    return cur_ev == ev and ev * depth < ev * cur_depth
+
+
+class BucketQueue:
+    def __init__(self):
+        self._bucket_dict: dict[int, list[array | None]] = {}
+        self._cursor_dict: dict[int, int] = {}
+        self._count_dict: dict[int, int] = {}
+        self._class_list: list[int] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._class_list)
+
+    @property
+    def key_size(self) -> int:
+        return sum(self._count_dict.values())
+
+    @property
+    def item_size(self) -> int:
+        return sum(len(arr) for buckets in self._bucket_dict.values() for arr in buckets if arr is not None)
+
+    def push(self, ev: int, depth: int, idx: int) -> None:
+        if ev == 0:
+            depth = 0
+        buckets = self._bucket_dict.get(ev)
+        if buckets is None:
+            buckets = self._bucket_dict[ev] = []
+            self._cursor_dict[ev] = depth
+            self._count_dict[ev] = 0
+            heappush(self._class_list, -ev)
+        if depth >= len(buckets):
+            buckets.extend([None] * (depth + 1 - len(buckets)))
+        arr = buckets[depth]
+        if arr is None:
+            arr = buckets[depth] = array("I")
+            self._count_dict[ev] += 1
+            cursor = self._cursor_dict[ev]
+            if (depth < cursor) if ev >= 0 else (depth > cursor):
+                self._cursor_dict[ev] = depth
+        arr.append(idx)
+
+    def pop(self) -> array:
+        ev = -self._class_list[0]
+        buckets = self._bucket_dict[ev]
+        cursor = self._cursor_dict[ev]
+        step = 1 if ev >= 0 else -1
+        while buckets[cursor] is None:
+            cursor += step
+        arr = buckets[cursor]
+        buckets[cursor] = None
+        self._count_dict[ev] -= 1
+        if self._count_dict[ev] == 0:
+            heappop(self._class_list)
+            del self._bucket_dict[ev], self._cursor_dict[ev], self._count_dict[ev]
+        else:
+            self._cursor_dict[ev] = cursor
+        return arr
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import pickle  # noqa: S403
+import time
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from game_analyzer.state.state import dump_digest_maps, merge_digest_maps
+from game_analyzer.state.zobrist import ZobristTable
+
+from .bucket_queue import BucketQueue
+
+FILE_DICT = {
+    "hash_key": "Q",
+    "hash_value": "I",
+    "eval": "i",
+    "depth": "i",
+    "child_count": "I",
+    "edge_src": "I",
+    "edge_dst": "I",
+    "patch": "q",
+    "todo_idx": "I",
+    "todo_state": "B",
+    "digest_map": "B",
+    "ra_patch": "q",
+    "ra_queue": "q",
+}
+
+
+class DigestMapLog:
+    def __init__(self):
+        self._size_dict: dict[tuple, tuple[dict | ZobristTable, object]] = {}
+
+    def delta(self) -> dict:
+        delta: dict = {}
+        for name, digest_map in dump_digest_maps().items():
+            if (name,) not in self._size_dict:
+                self._size_dict[(name,)] = (digest_map, 0)
+        for path, (container, size) in list(self._size_dict.items()):
+            if isinstance(container, ZobristTable):
+                if container.table is not size:
+                    _fragment(delta, path[:-1])[path[-1]] = container
+                    self._size_dict[path] = (container, container.table)
+                continue
+            new_size = len(container)
+            if new_size == size:
+                continue
+            fragment = _fragment(delta, path)
+            for key, value in islice(reversed(container.items()), new_size - size):
+                fragment[key] = value
+                self._track((*path, key), value)
+            self._size_dict[path] = (container, new_size)
+        return delta
+
+    def _track(self, path: tuple, value) -> None:
+        if isinstance(value, ZobristTable):
+            self._size_dict[path] = (value, value.table)
+        elif isinstance(value, dict):
+            self._size_dict[path] = (value, len(value))
+            for key, child in value.items():
+                self._track((*path, key), child)
+
+
+def _fragment(delta: dict, path: tuple) -> dict:
+    for key in path:
+        delta = delta.setdefault(key, {})
+    return delta
+
+
+class LoggedBucketQueue(BucketQueue):
+    def __init__(self):
+        super().__init__()
+        self.log = array("q")
+
+    def push(self, ev: int, depth: int, idx: int) -> None:
+        self.log.extend((ev, depth, idx))
+        super().push(ev, depth, idx)
+
+    def pop(self) -> array:
+        self.log.extend((0, 0, -1))
+        return super().pop()
+
+    @classmethod
+    def replay(cls, log: np.ndarray) -> LoggedBucketQueue:
+        queue = cls()
+        for ev, depth, idx in log.reshape(-1, 3).tolist():
+            if idx < 0:
+                BucketQueue.pop(queue)
+            else:
+                BucketQueue.push(queue, ev, depth, idx)
+        return queue
+
+
+@dataclass
+class Checkpoint:
+    path: Path
+    options: dict
+    phase: str = "search"
+    size_dict: dict[str, int] = field(default_factory=lambda: dict.fromkeys(FILE_DICT, 0))
+    todo_segment_list: list[list[int]] = field(default_factory=list)
+    cursor: int = 0
+    last_time: float = field(default_factory=time.time)
+    _digest_map_log: DigestMapLog = field(default_factory=DigestMapLog)
+
+    @classmethod
+    def create(cls, path: str | Path, options: dict) -> Checkpoint:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "meta.json").unlink(missing_ok=True)
+        for name in FILE_DICT:
+            (path / f"{name}.bin").write_bytes(b"")
+        return cls(path, options)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Checkpoint:
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        checkpoint = cls(path, meta["options"], meta["phase"], meta["size_dict"], meta["todo"], meta["cursor"])
+        for name, typecode in FILE_DICT.items():
+            os.truncate(path / f"{name}.bin", checkpoint.size_dict[name] * array(typecode).itemsize)
+        return checkpoint
+
+    def is_due(self, interval: float) -> bool:
+        return time.time() - self.last_time >= interval
+
+    def append(self, name: str, values) -> None:
+        data = memoryview(values).cast("B")
+        with (self.path / f"{name}.bin").open("ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size_dict[name] += len(data) // array(FILE_DICT[name]).itemsize
+
+    def read(self, name: str) -> bytes:
+        return (self.path / f"{name}.bin").read_bytes()
+
+    def push_todo(self, low: int, todo: list, todo_idx: array) -> None:
+        segment_list, size = [], 0
+        for start, end, idx_start, count in self.todo_segment_list:
+            if size >= low:
+                break
+            segment_list.append([start, end, idx_start, min(count, low - size)])
+            size += count
+        if len(todo) > low:
+            start = self.size_dict["todo_state"]
+            self.append("todo_state", pickle.dumps(todo[low:], protocol=pickle.HIGHEST_PROTOCOL))
+            segment_list.append([start, self.size_dict["todo_state"], self.size_dict["todo_idx"], len(todo) - low])
+            self.append("todo_idx", todo_idx[low:])
+        self.todo_segment_list = segment_list
+
+    def read_todo(self) -> tuple[list, array]:
+        data = self.read("todo_state")
+        idx_list = array("I")
+        idx_list.frombytes(self.read("todo_idx"))
+        todo, todo_idx = [], array("I")
+        for start, end, idx_start, count in self.todo_segment_list:
+            todo += pickle.loads(data[start:end])[:count]  # noqa: S301
+            todo_idx += idx_list[idx_start : idx_start + count]
+        return todo, todo_idx
+
+    def read_digest_maps(self) -> None:
+        for delta in self._read_pickles("digest_map"):
+            merge_digest_maps(delta)
+
+    def commit(self, phase: str, cursor: int = 0) -> None:
+        delta = self._digest_map_log.delta()
+        if delta:
+            self.append("digest_map", pickle.dumps(delta, protocol=pickle.HIGHEST_PROTOCOL))
+        meta = {
+            "options": self.options,
+            "phase": phase,
+            "size_dict": self.size_dict,
+            "todo": self.todo_segment_list,
+            "cursor": cursor,
+        }
+        meta_path = self.path / "meta.json.tmp"
+        meta_path.write_text(json.dumps(meta))
+        meta_path.replace(self.path / "meta.json")
+        self.phase, self.cursor = phase, cursor
+        self.last_time = time.time()
+
+    def _read_pickles(self, name: str) -> Iterator:
+        data = self.read(name)
+        f = io.BytesIO(data)
+        while f.tell() < len(data):
+            yield pickle.load(f)  # noqa: S301
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .mapped_array import CHUNK_SIZE
+
+_DTYPE_DICT = {"I": np.uint32, "Q": np.uint64, "i": np.int32}
+
+
+def _resize(values, size: int) -> None:
+    if isinstance(values, array):
+        values.frombytes(bytes((size - len(values)) * values.itemsize))
+    else:
+        values.resize(size)
+
+
+def to_array(typecode: str, values: np.ndarray) -> array:
+    arr = array(typecode)
+    arr.frombytes(values.astype(_DTYPE_DICT[typecode], copy=False).tobytes())
+    return arr
+
+
+@dataclass
+class EdgeList:
+    src_list: array = field(default_factory=lambda: array("I"))
+    dst_list: array = field(default_factory=lambda: array("I"))
+
+    def __len__(self) -> int:
+        return len(self.src_list)
+
+    def append(self, src: int, dst: int) -> None:
+        self.src_list.append(src)
+        self.dst_list.append(dst)
+
+    def clear(self) -> None:
+        del self.src_list[:]
+        del self.dst_list[:]
+
+    def freeze(self, node_size: int, offset_list=None, target_list=None, chunk_size: int = CHUNK_SIZE) -> CSRGraph:
+        offset_list = array("Q") if offset_list is None else offset_list
+        target_list = array("I") if target_list is None else target_list
+        edge_size = len(self)
+        counts = np.zeros(node_size, dtype=np.uint64)
+        for start in range(0, edge_size, chunk_size):
+            src = np.asarray(self.src_list[start : start + chunk_size], dtype=np.uint32)
+            counts += np.bincount(src, minlength=node_size).astype(np.uint64)
+        offsets = np.zeros(node_size + 1, dtype=np.uint64)
+        np.cumsum(counts, out=offsets[1:])
+        offset_list.frombytes(offsets.tobytes())
+        cursors = offsets[:-1].copy()
+        del counts, offsets
+        _resize(target_list, edge_size)
+        targets = np.asarray(target_list, dtype=np.uint32)
+        for start in range(0, edge_size, chunk_size):
+            src = np.asarray(self.src_list[start : start + chunk_size], dtype=np.uint32)
+            dst = np.asarray(self.dst_list[start : start + chunk_size], dtype=np.uint32)
+            order = np.argsort(src, kind="stable")
+            src, dst = src[order], dst[order]
+            head = np.ones(len(src), dtype=bool)
+            head[1:] = src[1:] != src[:-1]
+            head_idx = np.flatnonzero(head)
+            run_lens = np.diff(np.append(head_idx, len(src)))
+            rank = np.arange(len(src)) - np.repeat(head_idx, run_lens)
+            targets[cursors[src] + rank.astype(np.uint64)] = dst
+            cursors[src[head_idx]] += run_lens.astype(np.uint64)
+        return CSRGraph(offset_list=offset_list, target_list=target_list)
+
+
+@dataclass
+class CSRGraph:
+    offset_list: array = field(default_factory=lambda: array("Q", [0]))
+    target_list: array = field(default_factory=lambda: array("I"))
+
+    def __getitem__(self, idx: int) -> array:
+        return self.target_list[self.offset_list[idx] : self.offset_list[idx + 1]]
+
+    @property
+    def node_size(self) -> int:
+        return len(self.offset_list) - 1
+
+    @property
+    def edge_size(self) -> int:
+        return len(self.target_list)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.offset_list) * self.offset_list.itemsize + len(self.target_list) * self.target_list.itemsize
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .bucket_queue import BucketQueue, is_better_eval
+from .graph import CSRGraph, EdgeList
+
+
+@dataclass
+class GraphPatch:
+    graph: CSRGraph
+    graph_inv: CSRGraph
+    added_child_dict: dict[int, list[int]] = field(default_factory=dict)
+    added_parent_dict: dict[int, list[int]] = field(default_factory=dict)
+    removed_child_dict: dict[int, set[int]] = field(default_factory=dict)
+    removed_parent_dict: dict[int, set[int]] = field(default_factory=dict)
+    terminal_dict: dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_graph_inv(cls, graph_inv: CSRGraph) -> GraphPatch:
+        node_size = graph_inv.node_size
+        offsets = np.asarray(graph_inv.offset_list, dtype=np.uint64).astype(np.int64)
+        edge_list = EdgeList()
+        edge_list.src_list.frombytes(np.asarray(graph_inv.target_list, dtype=np.uint32).tobytes())
+        edge_list.dst_list.frombytes(np.repeat(np.arange(node_size, dtype=np.uint32), np.diff(offsets)).tobytes())
+        return cls(edge_list.freeze(node_size), graph_inv)
+
+    def children(self, idx: int) -> list[int]:
+        if idx in self.terminal_dict:
+            return []
+        child_list = list(self.graph[idx]) if idx < self.graph.node_size else []
+        if idx in self.removed_child_dict:
+            child_list = [child for child in child_list if child not in self.removed_child_dict[idx]]
+        if idx in self.added_child_dict:
+            child_list += self.added_child_dict[idx]
+        return child_list
+
+    def parents(self, idx: int) -> list[int]:
+        parent_list = list(self.graph_inv[idx]) if idx < self.graph_inv.node_size else []
+        if idx in self.removed_parent_dict:
+            parent_list = [parent for parent in parent_list if parent not in self.removed_parent_dict[idx]]
+        if idx in self.added_parent_dict:
+            parent_list += self.added_parent_dict[idx]
+        return parent_list
+
+    def add_edge(self, parent: int, child: int) -> None:
+        if child in self.removed_child_dict.get(parent, ()):
+            self.removed_child_dict[parent].discard(child)
+            self.removed_parent_dict[child].discard(parent)
+            return
+        self.added_child_dict.setdefault(parent, []).append(child)
+        self.added_parent_dict.setdefault(child, []).append(parent)
+
+    def remove_edge(self, parent: int, child: int) -> None:
+        if parent in self.added_child_dict:
+            self.added_child_dict[parent] = [idx for idx in self.added_child_dict[parent] if idx != child]
+        if child in self.added_parent_dict:
+            self.added_parent_dict[child] = [idx for idx in self.added_parent_dict[child] if idx != parent]
+        if parent < self.graph.node_size and child in self.graph[parent]:
+            self.removed_child_dict.setdefault(parent, set()).add(child)
+            self.removed_parent_dict.setdefault(child, set()).add(parent)
+
+    def edges(self) -> tuple[np.ndarray, np.ndarray]:
+        graph_inv = self.graph_inv
+        offsets = np.asarray(graph_inv.offset_list, dtype=np.uint64).astype(np.int64)
+        child = np.repeat(np.arange(graph_inv.node_size, dtype=np.int64), np.diff(offsets))
+        parent = np.asarray(graph_inv.target_list, dtype=np.uint32).astype(np.int64)
+        removed = [(p << 32) | c for c, parent_set in self.removed_parent_dict.items() for p in parent_set]
+        edge_keys = (parent.astype(np.uint64) << np.uint64(32)) | child.astype(np.uint64)
+        keep = ~np.isin(edge_keys, np.array(removed, dtype=np.uint64)) & ~np.isin(parent, list(self.terminal_dict))
+        added = [(c, p) for c, parent_list in self.added_parent_dict.items() for p in parent_list]
+        added = np.array([pair for pair in added if pair[1] not in self.terminal_dict], dtype=np.int64).reshape(-1, 2)
+        return np.concatenate([child[keep], added[:, 0]]), np.concatenate([parent[keep], added[:, 1]])
+
+    def ancestors(self, idx_list: list[int]) -> set[int]:
+        cone = set(idx_list)
+        todo = list(cone)
+        while todo:
+            for parent in self.parents(todo.pop()):
+                if parent not in cone:
+                    cone.add(parent)
+                    todo.append(parent)
+        return cone
+
+
+class ConeAnalyzer:
+    def __init__(self, patch: GraphPatch, cone: set[int], eval_list, depth_list, child_count_list, confirmed_list):  # noqa: PLR0913, PLR0917
+        self.patch = patch
+        self.cone = cone
+        self.eval_list = eval_list
+        self.depth_list = depth_list
+        self.child_count_list = child_count_list
+        self.confirmed_list = confirmed_list
+        self._queue = BucketQueue()
+
+    def run(self, default_eval: int) -> None:
+        patch = self.patch
+        cone_list = sorted(self.cone)
+        self._reset(cone_list, default_eval)
+        for idx in cone_list:
+            if self.child_count_list[idx] == 0:
+                self._confirm(idx)
+        for idx in cone_list:
+            for child in patch.children(idx):
+                if child not in self.cone and self.confirmed_list[child] and self._propagate(child, idx):
+                    self._confirm(idx)
+        while self._queue:
+            for idx in self._queue.pop():
+                self._confirm(idx)
+        for idx in cone_list:
+            if self.child_count_list[idx] > 0:
+                self.eval_list[idx], self.depth_list[idx] = 0, -1
+
+    def _reset(self, cone_list: list[int], default_eval: int) -> None:
+        patch = self.patch
+        eval_list, depth_list, child_count_list = self.eval_list, self.depth_list, self.child_count_list
+        for idx in cone_list:
+            self.confirmed_list[idx] = 0
+            child_count = len(patch.children(idx))
+            child_count_list[idx] = child_count
+            if idx in patch.terminal_dict:
+                eval_list[idx], depth_list[idx] = patch.terminal_dict[idx], 0
+            elif child_count == 0:
+                eval_list[idx], depth_list[idx] = default_eval, 0
+            else:
+                eval_list[idx], depth_list[idx] = 0, -1
+
+    def _confirm(self, start_idx: int) -> None:
+        todo_idx = [start_idx]
+        while todo_idx:
+            idx = todo_idx.pop()
+            if self.confirmed_list[idx]:
+                continue
+            self.confirmed_list[idx] = 1
+            todo_idx.extend(prev_idx for prev_idx in self.patch.parents(idx) if self._propagate(idx, prev_idx))
+            self.child_count_list[idx] = 0
+
+    def _propagate(self, idx: int, prev_idx: int) -> bool:
+        child_count_list = self.child_count_list
+        if child_count_list[prev_idx] == 0:
+            return False
+        child_count_list[prev_idx] -= 1
+        prev_ev, prev_depth = -self.eval_list[idx], self.depth_list[idx] + 1
+        if is_better_eval(prev_ev, prev_depth, self.eval_list[prev_idx], self.depth_list[prev_idx]):
+            self.eval_list[prev_idx] = prev_ev
+            self.depth_list[prev_idx] = prev_depth
+            if prev_ev >= 0:
+                self._queue.push(prev_ev, prev_depth, prev_idx)
+        return child_count_list[prev_idx] == 0
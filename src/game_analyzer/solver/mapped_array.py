@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import mmap
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+
+
+class MappedArray:
+    def __init__(self, path: str | Path, typecode: str, chunk_size: int = CHUNK_SIZE):
+        self.path = Path(path)
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self._chunk_size = chunk_size
+        self._file = self.path.open("w+b")
+        self._size = 0
+        self._capacity = 0
+        self._reserve(chunk_size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._view[: self._size][index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("index out of range")
+        return self._view[index]
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            self._view[: self._size][index] = memoryview(value).cast("B").cast(self.typecode)
+            return
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("index out of range")
+        self._view[index] = value
+
+    def __delitem__(self, index) -> None:
+        if index == slice(None):
+            self._size = 0
+            return
+        values = np.delete(np.frombuffer(self._view[: self._size], dtype=self.typecode), index)
+        self._view[: len(values)] = memoryview(values.tobytes()).cast("B").cast(self.typecode)
+        self._size = len(values)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._view[: self._size])
+
+    def __array__(self, dtype=None, copy=None):  # noqa: ARG002, PLW3201
+        values = np.frombuffer(self._view[: self._size], dtype=self.typecode)
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def append(self, value) -> None:
+        if self._size == self._capacity:
+            self._reserve(self._size + 1)
+        self._view[self._size] = value
+        self._size += 1
+
+    def extend(self, values: Iterable) -> None:
+        self.frombytes(array(self.typecode, values).tobytes())
+
+    def frombytes(self, data: bytes) -> None:
+        size = len(data) // self.itemsize
+        start = self._size
+        self.resize(start + size)
+        self._view[start : start + size] = memoryview(data).cast("B").cast(self.typecode)
+
+    def resize(self, size: int) -> None:
+        if size > self._capacity:
+            self._reserve(size)
+        self._size = size
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+    def _reserve(self, size: int) -> None:
+        capacity = max(self._capacity, self._chunk_size)
+        while capacity < size:
+            capacity += max(self._chunk_size, capacity // 2)
+        self._file.truncate(capacity * self.itemsize)
+        self._mmap = mmap.mmap(self._file.fileno(), capacity * self.itemsize)
+        self._view = memoryview(self._mmap).cast(self.typecode)
+        self._capacity = capacity
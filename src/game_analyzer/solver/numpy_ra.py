@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from heapq import heappop, heappush
+
+import numpy as np
+
+from .graph import CSRGraph
+
+
+def _eval_key(ev: np.ndarray, depth: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return -ev, np.where(ev != 0, ev * depth, depth)
+
+
+def _gather_edges(graph_offsets: np.ndarray, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    starts = graph_offsets[idx]
+    lens = graph_offsets[idx + 1] - starts
+    total = int(lens.sum())
+    heads = np.cumsum(lens) - lens
+    edge_idx = np.arange(total, dtype=np.int64) - np.repeat(heads - starts, lens)
+    return np.repeat(idx, lens), edge_idx
+
+
+def has_unique_draw_depths(child: np.ndarray, parent: np.ndarray, evals: np.ndarray, depths: np.ndarray) -> bool:
+    draw = (evals == 0) & (depths >= 0)
+    keep = draw[child] & draw[parent] & (depths[parent] > 0)
+    parent, child_depth = parent[keep], depths[child[keep]]
+    low = np.full(len(evals), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(low, parent, child_depth)
+    return bool(np.all(low[parent] == child_depth))
+
+
+class NumpyRetrogradeAnalyzer:
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        graph_inv: CSRGraph,
+        eval_list,
+        depth_list,
+        child_count_list,
+        stop_idx: int = -1,
+        queue_eval: int = 0,
+    ):
+        self.offsets = np.asarray(graph_inv.offset_list, dtype=np.uint64).astype(np.int64)
+        self.targets = np.asarray(graph_inv.target_list, dtype=np.uint32).astype(np.int64)
+        self.evals = np.array(eval_list, dtype=np.int64)
+        self.depths = np.array(depth_list, dtype=np.int64)
+        self.child_counts = np.array(child_count_list, dtype=np.int64)
+        self.confirmed = np.zeros(len(self.evals), dtype=bool)
+        self.stop_idx = stop_idx
+        self.queue_eval = queue_eval
+        self._queue_dict: dict[tuple[int, int], list[np.ndarray]] = {}
+        self._key_list: list[tuple[int, int]] = []
+
+    def run(self) -> None:
+        self._confirm(np.flatnonzero(self.child_counts == 0))
+        while self._key_list and not self._is_settled():
+            key = heappop(self._key_list)
+            queue = np.concatenate(self._queue_dict.pop(key))
+            self._confirm(np.unique(queue[~self.confirmed[queue]]))
+        unsolved = self.child_counts > 0
+        self.evals[unsolved] = 0
+        self.depths[unsolved] = -1
+
+    def _confirm(self, frontier: np.ndarray) -> None:  # noqa: PLR0914
+        evals, depths, child_counts = self.evals, self.depths, self.child_counts
+        while len(frontier) > 0:
+            self.confirmed[frontier] = True
+            child_counts[frontier] = 0
+            if self._is_settled():
+                return
+            child, edge_idx = _gather_edges(self.offsets, frontier)
+            parent = self.targets[edge_idx]
+            alive = child_counts[parent] > 0
+            child, parent = child[alive], parent[alive]
+            if len(parent) == 0:
+                return
+
+            next_ev = -evals[child]
+            next_depth = depths[child] + 1
+            key1, key2 = _eval_key(next_ev, next_depth)
+            order = np.lexsort((key2, key1, parent))
+            parent, next_ev, next_depth = parent[order], next_ev[order], next_depth[order]
+            key1, key2 = key1[order], key2[order]
+            head = np.ones(len(parent), dtype=bool)
+            head[1:] = parent[1:] != parent[:-1]
+            count = np.diff(np.append(np.flatnonzero(head), len(parent)))
+            parent, next_ev, next_depth = parent[head], next_ev[head], next_depth[head]
+            key1, key2 = key1[head], key2[head]
+
+            cur_key1, cur_key2 = _eval_key(evals[parent], depths[parent])
+            better = (depths[parent] == -1) | (key1 < cur_key1) | ((key1 == cur_key1) & (key2 < cur_key2))
+            improved = parent[better]
+            evals[improved] = next_ev[better]
+            depths[improved] = next_depth[better]
+            queued = better & (next_ev >= self.queue_eval)
+            self._add_to_queue(parent[queued], key1[queued], key2[queued])
+
+            child_counts[parent] -= count
+            frontier = parent[child_counts[parent] == 0]
+
+    def has_unique_draw_depths(self) -> bool:
+        if self.stop_idx >= 0:
+            return not (self.evals[self.stop_idx] == 0 and self.depths[self.stop_idx] > 0)
+        child = np.repeat(np.arange(len(self.evals)), np.diff(self.offsets))
+        return has_unique_draw_depths(child, self.targets, self.evals, self.depths)
+
+    def _is_settled(self) -> bool:
+        return self.stop_idx >= 0 and bool(self.confirmed[self.stop_idx])
+
+    def _add_to_queue(self, idx: np.ndarray, key1: np.ndarray, key2: np.ndarray) -> None:
+        if len(idx) == 0:
+            return
+        order = np.lexsort((key2, key1))
+        idx, key1, key2 = idx[order], key1[order], key2[order]
+        head = np.ones(len(idx), dtype=bool)
+        head[1:] = (key1[1:] != key1[:-1]) | (key2[1:] != key2[:-1])
+        start_list = np.flatnonzero(head).tolist()
+        for start, end in zip(start_list, [*start_list[1:], len(idx)], strict=True):
+            key = (int(key1[start]), int(key2[start]))
+            queue = self._queue_dict.get(key)
+            if queue is None:
+                queue = []
+                self._queue_dict[key] = queue
+                heappush(self._key_list, key)
+            queue.append(idx[start:end])
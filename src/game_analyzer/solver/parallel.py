@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+from array import array
+from dataclasses import dataclass, field
+from hashlib import blake2b
+
+from game_analyzer import Game, State, StateEncoding
+
+SEND_SIZE = 1024
+
+
+@dataclass
+class ShardGraph:
+    eval_list: array = field(default_factory=lambda: array("i"))
+    depth_list: array = field(default_factory=lambda: array("i"))
+    child_count_list: array = field(default_factory=lambda: array("I"))
+    edge_child_list: array = field(default_factory=lambda: array("I"))
+    edge_parent_list: array = field(default_factory=lambda: array("q"))
+    key_list: array = field(default_factory=lambda: array("Q"))
+    key_idx_list: array = field(default_factory=lambda: array("I"))
+    state_types: set[type[State]] = field(default_factory=set)
+    state_list: list[State] = field(default_factory=list)
+
+
+def shares_keys(game: Game, encoding: StateEncoding | None) -> bool:
+    return encoding is not None or game.init_state.digest_seed is not None
+
+
+def index_keys(game: Game, state: State, encoding: StateEncoding | None, *, canonical: bool) -> list[int]:
+    if encoding is not None:
+        key_list = [encoding.encode(mirror_state) for mirror_state in game.find_mirror_states(state)]
+    elif state.digest_seed is not None:
+        key_list = list(game.mirror_digests(state))
+    else:
+        msg = f"{type(state).__qualname__} needs a digest_seed like the init state"
+        raise TypeError(msg)
+    return [min(key_list)] if canonical else key_list
+
+
+def stable_key(game: Game, state: State) -> int:
+    key = None
+    for mirror_state in game.find_mirror_states(state):
+        data = repr((type(mirror_state).__qualname__, tuple(mirror_state.to_dict().items()))).encode()
+        mirror_key = int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+        if key is None or mirror_key < key:
+            key = mirror_key
+    return key  # type: ignore
+
+
+class _ShardSearch:
+    def __init__(self, game: Game, shard: int, inbox_list: list, pending, encoding, canonical: bool):  # noqa: FBT001, PLR0913, PLR0917
+        self.game = game
+        self.shard = shard
+        self.shard_size = len(inbox_list)
+        self.inbox_list = inbox_list
+        self.pending = pending
+        self.encoding = encoding
+        self.canonical = canonical
+        self.shared = shares_keys(game, encoding)
+        self.graph = ShardGraph()
+        self._key_dict: dict[int, int] = {}
+        self._todo: list[tuple[State, int]] = []
+        self._outbox_list: list[list] = [[] for _ in range(self.shard_size)]
+
+    def route_key(self, state: State) -> tuple[int, list[int] | None]:
+        if not self.shared:
+            return stable_key(self.game, state), None
+        key_list = index_keys(self.game, state, self.encoding, canonical=self.canonical)
+        return min(key_list), key_list
+
+    def run(self) -> ShardGraph:
+        inbox = self.inbox_list[self.shard]
+        while (item_list := inbox.get()) is not None:
+            for parent_gid, key, state in item_list:
+                self._add(parent_gid, key, state)
+            self._expand()
+            for dest, outbox in enumerate(self._outbox_list):
+                if outbox:
+                    self._send(dest)
+            if self._add_pending(-1) == 0:
+                for other_inbox in self.inbox_list:
+                    other_inbox.put(None)
+        return self.graph
+
+    def _add(self, parent_gid: int, key: int, state: State, key_list: list[int] | None = None) -> None:
+        graph = self.graph
+        local_idx = self._key_dict.get(key)
+        if local_idx is None:
+            local_idx = self._key_dict[key] = len(graph.eval_list)
+            graph.state_types.add(type(state))
+            if self.shared:
+                if key_list is None:
+                    key_list = index_keys(self.game, state, self.encoding, canonical=self.canonical)
+                graph.key_list.extend(key_list)
+                graph.key_idx_list.extend([local_idx] * len(key_list))
+            else:
+                graph.state_list.append(state)
+            res = self.game.evaluate_state(state)
+            graph.eval_list.append(0 if res is None else res)
+            graph.depth_list.append(-1 if res is None else 0)
+            graph.child_count_list.append(0)
+            if res is None:
+                self._todo.append((state, local_idx))
+        if parent_gid >= 0:
+            graph.edge_child_list.append(local_idx)
+            graph.edge_parent_list.append(parent_gid)
+
+    def _expand(self) -> None:  # noqa: PLR0914
+        game, graph, todo, key_dict = self.game, self.graph, self._todo, self._key_dict
+        shard, shard_size, route_key = self.shard, self.shard_size, self.route_key
+        edge_child_append, edge_parent_append = graph.edge_child_list.append, graph.edge_parent_list.append
+        while todo:
+            state, local_idx = todo.pop()
+            gid = local_idx * shard_size + shard
+            child_count = 0
+            for next_state in game.find_next_states(state):
+                child_count += 1
+                key, key_list = route_key(next_state)
+                dest = key % shard_size
+                if dest == shard:
+                    child_idx = key_dict.get(key)
+                    if child_idx is None:
+                        self._add(gid, key, next_state, key_list)
+                    else:
+                        edge_child_append(child_idx)
+                        edge_parent_append(gid)
+                    continue
+                outbox = self._outbox_list[dest]
+                outbox.append((gid, key, next_state))
+                if len(outbox) >= SEND_SIZE:
+                    self._send(dest)
+            graph.child_count_list[local_idx] = child_count
+            if child_count == 0:
+                graph.eval_list[local_idx] = game.default_eval
+                graph.depth_list[local_idx] = 0
+
+    def _send(self, dest: int) -> None:
+        # counted before it is queued, so the total can only reach zero once every batch is expanded
+        self._add_pending(1)
+        self.inbox_list[dest].put(self._outbox_list[dest])
+        self._outbox_list[dest] = []
+
+    def _add_pending(self, delta: int) -> int:
+        with self.pending.get_lock():
+            self.pending.value += delta
+            return self.pending.value
+
+
+def _run_shard(game: Game, shard: int, inbox_list: list, pending, result_queue, encoding, canonical) -> None:  # noqa: PLR0913, PLR0917
+    try:
+        result_queue.put((shard, _ShardSearch(game, shard, inbox_list, pending, encoding, canonical).run()))
+    except BaseException as e:  # noqa: BLE001
+        result_queue.put((shard, e))
+        for inbox in inbox_list:
+            inbox.put(None)
+
+
+def search_game_graph_sharded(
+    game: Game,
+    shard_size: int,
+    encoding: StateEncoding | None = None,
+    *,
+    canonical: bool = False,
+) -> list[ShardGraph]:
+    method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+    shared = shares_keys(game, encoding)
+    if method != "fork" and not shared:
+        # reprs of sets depend on each process's hash seed, so shards would disagree on stable_key
+        raise ValueError("workers > 1 needs a digest_seed or a state encoding when processes are not forked")
+    ctx = mp.get_context(method)
+    inbox_list = [ctx.Queue() for _ in range(shard_size)]
+    pending = ctx.Value("q", 1)
+    result_queue = ctx.Queue()
+    process_list = [
+        ctx.Process(
+            target=_run_shard,
+            args=(game, shard, inbox_list, pending, result_queue, encoding, canonical),
+            daemon=True,
+        )
+        for shard in range(shard_size)
+    ]
+    for process in process_list:
+        process.start()
+
+    try:
+        init_state = game.init_state
+        if shared:
+            init_key = min(index_keys(game, init_state, encoding, canonical=canonical))
+        else:
+            init_key = stable_key(game, init_state)
+        inbox_list[init_key % shard_size].put([(-1, init_key, init_state)])
+        result_dict = _collect(result_queue, process_list)
+    finally:
+        for process in process_list:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    for result in result_dict.values():
+        if isinstance(result, BaseException):
+            raise result
+    return [result_dict[shard] for shard in range(shard_size)]
+
+
+def _collect(result_queue, process_list: list) -> dict:
+    result_dict = {}
+    while len(result_dict) < len(process_list):
+        try:
+            shard, result = result_queue.get(timeout=1)
+        except queue.Empty:
+            if any(process.exitcode not in {None, 0} for process in process_list):
+                raise RuntimeError("a search worker exited unexpectedly") from None
+            continue
+        result_dict[shard] = result
+    return result_dict
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import Counter
+from itertools import count
+
+from game_analyzer import FrozenState, Game
+
+CALLBACK_LIST = ["find_next_states", "find_mirror_states", "evaluate_state"]
+DIGEST_NAME_LIST = ["digest", "_get_obj_digest"]
+SAMPLE_INTERVAL = 0.005
+
+
+def _code_of(obj):
+    obj = getattr(obj, "fget", obj)
+    obj = getattr(obj, "__func__", obj)
+    return getattr(obj, "__code__", None)
+
+
+class SamplingProfiler:
+    def __init__(self, game: Game, register_state, interval: float = SAMPLE_INTERVAL):
+        self.game = game
+        self.interval = interval
+        self.phase = "search"
+        self.sample_counter: Counter[tuple[str, str]] = Counter()
+        self.code_dict = {}
+        self._counter_dict = {name: count() for name in CALLBACK_LIST}
+        self._saved_dict = {}
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        for name in CALLBACK_LIST:
+            self._add_code(getattr(type(game), name, None), name)
+        for cls in type(game.init_state).__mro__:
+            for name in DIGEST_NAME_LIST:
+                self._add_code(cls.__dict__.get(name), "digest")
+        if game.symmetry is not None:
+            self._add_code(type(game.symmetry).mirror_digests, "digest")
+        if isinstance(game.init_state, FrozenState):
+            self._add_code(type(game.init_state).__post_init__, "digest")
+        self._add_code(register_state, "register_state")
+
+    def __enter__(self) -> SamplingProfiler:  # noqa: PYI034
+        game = self.game
+        for name in CALLBACK_LIST:
+            if name in vars(game):
+                self._saved_dict[name] = vars(game)[name]
+            setattr(game, name, self._wrap(getattr(game, name), self._counter_dict[name]))
+        self._thread = threading.Thread(target=self._run, name="game-analyzer-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for name in CALLBACK_LIST:
+            if name in self._saved_dict:
+                setattr(self.game, name, self._saved_dict.pop(name))
+            else:
+                delattr(self.game, name)
+
+    def wrap(self, name: str, func):
+        counter = self._counter_dict.setdefault(name, count())
+        return self._wrap(func, counter)
+
+    def report(self, phase_time_dict: dict[str, float], call_dict: dict[str, int]) -> dict[str, dict[str, float]]:
+        call_dict = {**{name: next(counter) for name, counter in self._counter_dict.items()}, **call_dict}
+
+        def new_entry(name: str) -> dict:
+            entry = {"samples": 0, "time": 0.0}
+            if name in call_dict:
+                entry["calls"] = call_dict[name]
+            return entry
+
+        profile = {}
+        for phase, phase_time in phase_time_dict.items():
+            total = sum(n for (sample_phase, _), n in self.sample_counter.items() if sample_phase == phase)
+            if total == 0:
+                profile[phase] = new_entry(phase) | {"time": phase_time}
+                continue
+            for (sample_phase, category), n in self.sample_counter.items():
+                if sample_phase != phase:
+                    continue
+                entry = profile.setdefault(category, new_entry(category))
+                entry["samples"] += n
+                entry["time"] += phase_time * n / total
+        for name in call_dict:
+            profile.setdefault(name, new_entry(name))
+        return profile
+
+    def _add_code(self, obj, category: str) -> None:
+        code = _code_of(obj)
+        if code is not None:
+            self.code_dict[code] = category
+
+    def _run(self) -> None:
+        code_dict = self.code_dict
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)  # noqa: SLF001
+            category = self.phase
+            while frame is not None:
+                if frame.f_code in code_dict:
+                    category = code_dict[frame.f_code]
+                    break
+                frame = frame.f_back
+            self.sample_counter[self.phase, category] += 1
+
+    @staticmethod
+    def _wrap(func, counter):
+        def wrapper(*args):
+            next(counter)
+            return func(*args)
+
+        return wrapper
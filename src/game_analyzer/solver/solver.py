@@ -3,70 +3,633 @@ from __future__ import annotations
 import sys
 import time
 from array import array
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
-from heapq import heappop, heappush
+from itertools import islice
+from pathlib import Path
 
-from game_analyzer import Game, HashState, Result, State
+import numpy as np
+
+from game_analyzer import DenseIndex, Game, HashIndex, HashState, Result, State, StateEncoding
+from game_analyzer.result import LazyResult
+
+from .bucket_queue import BucketQueue, is_better_eval
+from .checkpoint import Checkpoint, LoggedBucketQueue
+from .graph import CSRGraph, EdgeList, to_array
+from .incremental import ConeAnalyzer, GraphPatch
+from .mapped_array import MappedArray
+from .numpy_ra import NumpyRetrogradeAnalyzer, has_unique_draw_depths
+from .parallel import search_game_graph_sharded
+from .profile import SamplingProfiler
+from .telemetry import Progress, Telemetry
+from .threshold_ra import ThresholdRetrogradeAnalyzer
 
 sys.setrecursionlimit(10**9)
 
+BATCH_MIN_SIZE = 256
+CHECKPOINT_STEP = 4096
+BUDGET_STEP = 1024
+DICT_ITEM_NBYTES = 64
+
 
 @dataclass
 class Solver:
     _game: Game = None  # type: ignore
-    _hash_dict: dict[int, int] = field(default_factory=dict)
+    _hash_dict: dict[int, int] | HashIndex | DenseIndex = field(default_factory=dict)
     _eval_list: array = field(default_factory=lambda: array("i"))
     _depth_list: array = field(default_factory=lambda: array("i"))
-    _graph_inv: list[list[int]] = field(default_factory=list)
+    _edge_list: EdgeList = field(default_factory=EdgeList)
+    _graph_inv: CSRGraph = field(default_factory=CSRGraph)
     _child_count_list: array = field(default_factory=lambda: array("I"))
-    _queue_dict: dict[tuple[int, int], array] = field(default_factory=dict)
-    _key_list: list[tuple[int, int]] = field(default_factory=list)
+    _confirmed_list: bytearray = field(default_factory=bytearray)
+    _queue: BucketQueue = field(default_factory=BucketQueue)
+    _checkpoint: Checkpoint | None = None
+    _checkpoint_low: int = 0
+    _checkpoint_dirty: array = field(default_factory=lambda: array("I"))
+    _ra_journal: array | None = None
+    _patch: GraphPatch | None = None
+    _stop_idx: int = -1
+    _cutoff_eval: int | None = None
+    _queue_eval: int = 0
+    _search_depth: int | None = None
+    _horizon: list[State] = field(default_factory=list)
+    _horizon_idx: array = field(default_factory=lambda: array("I"))
+    _budget_check_idx: int = sys.maxsize
+    _budget_exceeded: str | None = None
+    _telemetry: Telemetry | None = None
+    _profiler: SamplingProfiler | None = None
+    _key_func: Callable[[State], int] | None = None
+    _encoding: StateEncoding | None = None
+    _state_types: set[type[State]] = field(default_factory=set)
+    index: str = "dict"
+    workers: int = 1
+    ra_backend: str = "python"
+    workdir: str | None = None
+    checkpoint_path: str | None = None
+    checkpoint_interval: float = 600.0
+    root_only: bool = False
+    win_eval: int | None = None
+    max_nodes: int | None = None
+    max_edges: int | None = None
+    max_bytes: int | None = None
+    observer: Callable[[Progress], None] | None = None
+    observe_nodes: int = 1_000_000
+    observe_interval: float = 10.0
+    profile: bool = False
+    canonical: bool = False
+
+    def __post_init__(self):
+        if self.index == "hash":
+            self._hash_dict = HashIndex()
+        elif self.index not in {"dict", "dense"}:
+            msg = f"unknown index: {self.index}"
+            raise ValueError(msg)
+        if self.ra_backend not in {"python", "numpy", "threshold"}:
+            msg = f"unknown ra_backend: {self.ra_backend}"
+            raise ValueError(msg)
+        if self.ra_backend == "threshold" and (self.root_only or self._has_budget()):
+            raise ValueError("threshold ra_backend does not support root_only or budgets")
+        if self._has_budget():
+            self._init_budget()
+        if self.profile and self.workers > 1:
+            raise ValueError("profile is not supported with workers > 1")
+        if self.observer is not None:
+            self._telemetry = Telemetry(self.observer, self.observe_nodes, self.observe_interval)
+        if self.root_only:
+            self._stop_idx = 0
+            self._cutoff_eval = None if self.win_eval is None else -self.win_eval
+        if self.workdir is not None:
+            Path(self.workdir).mkdir(parents=True, exist_ok=True)
+            self._eval_list = self._new_array("eval", "i")
+            self._depth_list = self._new_array("depth", "i")
+            self._child_count_list = self._new_array("child_count", "I")
+            self._edge_list = EdgeList(self._new_array("edge_src", "I"), self._new_array("edge_dst", "I"))
 
     @property
     def node_size(self):
         return len(self._eval_list)
 
-    def solve(self, game: Game) -> Result:
-        self._game = game
+    def solve(self, game: Game, max_depth: int | None = None) -> Result:
+        if self.profile and self._profiler is None:
+            return self._solve_profiled(game, max_depth)
+        if max_depth is not None:
+            return self._solve_bounded(game, max_depth)
+        self._set_game(game)
+        if self.checkpoint_path is not None:
+            if isinstance(game.init_state, HashState):
+                raise ValueError("checkpoint is not supported for HashState")
+            self._checkpoint = Checkpoint.create(self.checkpoint_path, self._options())
         start_sgg_time = time.time()
+        self._search()
+        if self._checkpoint is not None:
+            self._write_search_checkpoint([], array("I"), self._checkpoint_low)
+        if self._budget_exceeded is not None:
+            self._mark_horizon()
+        return self._analyze(start_sgg_time)
+
+    def _solve_profiled(self, game: Game, max_depth: int | None) -> Result:
+        with SamplingProfiler(game, Solver._register_state) as profiler:
+            self._profiler = profiler
+            self._register_state = profiler.wrap("register_state", self._register_state)
+            try:
+                result = self.solve(game, max_depth)
+            finally:
+                self._profiler = None
+                del self._register_state
+        result.profile = profiler.report(
+            {"search": result.sgg_time, "ra": result.ra_time},
+            {"ra": self._confirmed_list.count(1)},
+        )
+        return result
+
+    def _search(self) -> None:
+        game = self._game
         if isinstance(game.init_state, HashState):
+            if self._has_budget():
+                raise TypeError("budgets are not supported for HashState")
+            if self.canonical:
+                raise TypeError("canonical is not supported for HashState")
             init_idx = self._register_state(game.init_state)
             self._search_game_graph_recursive(game.init_state, init_idx)
+        elif self.root_only:
+            self._search_game_graph_lazy()
+        elif self.workers > 1:
+            self._search_game_graph_parallel()
+        elif type(game).find_next_states_batch is not Game.find_next_states_batch and not self._has_budget():
+            self._search_game_graph_batch()
         else:
             self._search_game_graph()
+
+    def solve_iterative(self, game: Game, max_depth: int, step: int = 1) -> Iterator[tuple[int, Result]]:
+        for bound in range(step, max_depth + step, step):
+            depth = min(bound, max_depth)
+            result = self.solve(game, max_depth=depth)
+            yield depth, result
+            if not self._horizon or result.budget_exceeded is not None:
+                return
+            if result.state_to_params(game.init_state)[1] != -1:
+                return
+
+    def _solve_bounded(self, game: Game, max_depth: int) -> Result:
+        if isinstance(game.init_state, HashState):
+            raise TypeError("max_depth is not supported for HashState")
+        if self.checkpoint_path is not None:
+            raise ValueError("checkpoint is not supported with max_depth")
+        if self.ra_backend == "threshold":
+            raise ValueError("max_depth is not supported with the threshold ra_backend")
+        if self._search_depth is not None and max_depth < self._search_depth:
+            msg = f"max_depth must not decrease: {max_depth} < {self._search_depth}"
+            raise ValueError(msg)
+        self._set_game(game)
+        start_sgg_time = time.time()
+        self._search_game_graph_bounded(max_depth)
+        child_counts = np.array(self._child_count_list, dtype=np.uint32)
+        for idx in np.flatnonzero(child_counts).tolist():
+            self._eval_list[idx], self._depth_list[idx] = 0, -1
+        self._mark_horizon()
+        self._observe("search", self.node_size, len(self._horizon), force=True)
+        self._freeze_graph(clear=False)
+        if self._profiler is not None:
+            self._profiler.phase = "ra"
+        self._queue = BucketQueue()
         start_ra_time = time.time()
         self._retrograde_analyze()
+        self._child_count_list[:] = to_array("I", child_counts)
+        end_solve = time.time()
+        self._observe("ra", self._confirmed_list.count(1), 0, force=True)
+        return self._make_result(start_ra_time - start_sgg_time, end_solve - start_ra_time)
+
+    def _observe(self, phase: str, processed: int, frontier: int, *, force: bool = False) -> None:
+        if self._telemetry is None:
+            return
+        edges = len(self._edge_list) if phase == "search" else self._graph_inv.edge_size
+        self._telemetry.observe(
+            phase,
+            processed,
+            self.node_size,
+            edges,
+            frontier,
+            self._queue,
+            force=force,
+        )
+
+    def _has_budget(self) -> bool:
+        return self.max_nodes is not None or self.max_edges is not None or self.max_bytes is not None
+
+    def _init_budget(self) -> None:
+        if self.workers > 1:
+            raise ValueError("budgets are not supported with workers > 1")
+        if self.checkpoint_path is not None:
+            raise ValueError("budgets are not supported with checkpoint")
+        self._budget_check_idx = 0
+
+    def _check_budget(self, idx: int) -> None:
+        if self.max_nodes is not None and idx >= self.max_nodes:
+            self._budget_exceeded = "max_nodes"
+        elif self.max_edges is not None and len(self._edge_list) >= self.max_edges:
+            self._budget_exceeded = "max_edges"
+        elif self.max_bytes is not None and self._estimate_nbytes() >= self.max_bytes:
+            self._budget_exceeded = "max_bytes"
+        if self._budget_exceeded is not None:
+            self._budget_check_idx = sys.maxsize
+            return
+        self._budget_check_idx = idx + BUDGET_STEP
+        if self.max_nodes is not None:
+            self._budget_check_idx = min(self._budget_check_idx, self.max_nodes)
+
+    def _estimate_nbytes(self) -> int:
+        if isinstance(self._hash_dict, (HashIndex, DenseIndex)):
+            hash_nbytes = self._hash_dict.nbytes
+        else:
+            hash_nbytes = sys.getsizeof(self._hash_dict) + len(self._hash_dict) * DICT_ITEM_NBYTES
+        node_nbytes = self._eval_list.itemsize + self._depth_list.itemsize + self._child_count_list.itemsize + 1
+        return hash_nbytes + self.node_size * node_nbytes + len(self._edge_list) * 8
+
+    def _mark_horizon(self) -> None:
+        if not self._horizon_idx:
+            self._queue_eval = 0
+            return
+        self._queue_eval = sys.maxsize if self.win_eval is None else self.win_eval
+        for idx in self._horizon_idx:
+            self._child_count_list[idx] = 1
+
+    @classmethod
+    def resume(cls, path: str, game: Game) -> Result:
+        checkpoint = Checkpoint.load(path)
+        solver = cls(**checkpoint.options, checkpoint_path=str(path))
+        return solver._resume(checkpoint, game)  # noqa: SLF001
+
+    def _resume(self, checkpoint: Checkpoint, game: Game) -> Result:
+        self._set_game(game)
+        self._checkpoint = checkpoint
+        checkpoint.read_digest_maps()
+        start_sgg_time = time.time()
+        keys = np.frombuffer(checkpoint.read("hash_key"), dtype=np.uint64)
+        values = np.frombuffer(checkpoint.read("hash_value"), dtype=np.uint32)
+        if isinstance(self._hash_dict, DenseIndex):
+            self._hash_dict = DenseIndex.from_arrays(self._hash_dict.size, keys, values)
+        elif isinstance(self._hash_dict, HashIndex):
+            self._hash_dict = HashIndex.from_arrays(keys, values)
+        else:
+            self._hash_dict = dict(zip(keys.tolist(), values.tolist(), strict=True))
+        self._edge_list.src_list.frombytes(checkpoint.read("edge_src"))
+        self._edge_list.dst_list.frombytes(checkpoint.read("edge_dst"))
+        evals = np.frombuffer(checkpoint.read("eval"), dtype=np.int32).copy()
+        depths = np.frombuffer(checkpoint.read("depth"), dtype=np.int32).copy()
+        child_counts = np.frombuffer(checkpoint.read("child_count"), dtype=np.uint32).copy()
+        _apply_patch(checkpoint.read("patch"), evals, depths, child_counts)
+        if checkpoint.phase == "ra":
+            confirmed = np.zeros(len(evals), dtype=np.uint8)
+            _apply_patch(checkpoint.read("ra_patch"), evals, depths, child_counts, confirmed)
+            self._confirmed_list = bytearray(confirmed.tobytes())
+            self._queue = LoggedBucketQueue.replay(np.frombuffer(checkpoint.read("ra_queue"), dtype=np.int64))
+            self._ra_journal = array("I")
+        self._eval_list.frombytes(evals.tobytes())
+        self._depth_list.frombytes(depths.tobytes())
+        self._child_count_list.frombytes(child_counts.tobytes())
+        if checkpoint.phase == "ra":
+            return self._analyze(start_sgg_time, checkpoint.cursor)
+        todo, todo_idx = checkpoint.read_todo()
+        self._checkpoint_low = len(todo)
+        self._search_game_graph(todo, todo_idx)
+        self._write_search_checkpoint([], array("I"), self._checkpoint_low)
+        return self._analyze(start_sgg_time)
+
+    def update(
+        self,
+        game: Game,
+        added: Iterable[tuple[State, State]] = (),
+        removed: Iterable[tuple[State, State]] = (),
+        evaluated: Iterable[tuple[State, int | None]] = (),
+    ) -> Result:
+        if isinstance(game.init_state, HashState):
+            raise TypeError("update is not supported for HashState")
+        if self.root_only:
+            raise ValueError("update is not supported in root_only mode")
+        if self._has_budget():
+            raise ValueError("update is not supported with budgets")
+        if self._search_depth is not None:
+            raise ValueError("update is not supported after a max_depth solve")
+        self._set_game(game)
+        start_sgg_time = time.time()
+        if self._patch is None:
+            self._patch = GraphPatch.from_graph_inv(self._graph_inv)
+        old_node_size = self.node_size
+        seed_list = self._apply_delta(self._patch, added, removed, evaluated)
+        self._confirmed_list.extend(bytes(self.node_size - old_node_size))
+        for idx in range(old_node_size, self.node_size):
+            if not self._patch.children(idx):
+                self._confirmed_list[idx] = 1
+
+        start_ra_time = time.time()
+        analyzer = ConeAnalyzer(
+            self._patch,
+            self._patch.ancestors(seed_list),
+            self._eval_list,
+            self._depth_list,
+            self._child_count_list,
+            self._confirmed_list,
+        )
+        analyzer.run(game.default_eval)
+        if not self._has_unique_draw_depths():
+            return self._solve_again(start_sgg_time)
         end_solve = time.time()
-        sgg_time = start_ra_time - start_sgg_time
-        ra_time = end_solve - start_ra_time
+        return self._make_result(start_ra_time - start_sgg_time, end_solve - start_ra_time)
+
+    def solve_lazy(self, game: Game) -> LazyResult:
+        if isinstance(game.init_state, HashState):
+            raise TypeError("solve_lazy is not supported for HashState")
+        if self.root_only:
+            raise ValueError("solve_lazy is not supported in root_only mode")
+        if self._has_budget():
+            raise ValueError("solve_lazy is not supported with budgets")
+        if self._search_depth is not None:
+            raise ValueError("solve_lazy is not supported after a max_depth solve")
+        self._set_game(game)
+        if self._patch is None:
+            self._patch = GraphPatch.from_graph_inv(self._graph_inv)
+        return LazyResult(
+            hash_dict=self._hash_dict,
+            eval_list=self._eval_list,
+            depth_list=self._depth_list,
+            sgg_time=0.0,
+            ra_time=0.0,
+            key_func=self._key_func,
+            canonical=self.canonical,
+            encoding=self._encoding,
+            state_types=self._state_types,
+            expand=self._expand_state,
+        )
+
+    def _expand_state(self, state: State) -> tuple[float, float]:
+        start_sgg_time = time.time()
+        sgg_time, ra_time = self._expand_cone(state)
+        if self._has_unique_draw_depths():
+            return sgg_time, ra_time
+        result = self._solve_again(start_sgg_time)
+        if self._state_key(state) in self._hash_dict:
+            return result.sgg_time, result.ra_time
+        # not reachable from init_state, so there is no full solve to agree with
+        sgg_time, ra_time = self._expand_cone(state)
+        return result.sgg_time + sgg_time, result.ra_time + ra_time
+
+    def _expand_cone(self, state: State) -> tuple[float, float]:
+        start_sgg_time = time.time()
+        patch = self._patch
+        old_node_size = self.node_size
+        todo, todo_idx = [], array("I")
+        self._add_state(state, todo, todo_idx)
+        self._search_game_graph(todo, todo_idx)
+        cone = set()
+        for child, parent in zip(self._edge_list.src_list, self._edge_list.dst_list, strict=True):
+            patch.add_edge(parent, child)
+            cone.add(parent)
+        self._edge_list.clear()
+        self._confirmed_list.extend(bytes(self.node_size - old_node_size))
+        for idx in range(old_node_size, self.node_size):
+            if idx not in cone:
+                self._confirmed_list[idx] = 1
+
+        start_ra_time = time.time()
+        analyzer = ConeAnalyzer(
+            patch,
+            cone,
+            self._eval_list,
+            self._depth_list,
+            self._child_count_list,
+            self._confirmed_list,
+        )
+        analyzer.run(self._game.default_eval)
+        return start_ra_time - start_sgg_time, time.time() - start_ra_time
+
+    def _has_unique_draw_depths(self) -> bool:
+        child, parent = self._patch.edges()  # type: ignore
+        return has_unique_draw_depths(child, parent, np.asarray(self._eval_list), np.asarray(self._depth_list))
+
+    def _solve_again(self, start_sgg_time: float) -> Result:
+        # the cone only keeps draw depths that any confirmation order agrees on; otherwise
+        # solve from init_state, clearing in place so a LazyResult keeps reading these tables
+        self._hash_dict.clear()
+        for column in (self._eval_list, self._depth_list, self._child_count_list):
+            del column[:]
+        self._edge_list.clear()
+        self._checkpoint = None
+        self._search()
+        result = self._analyze(start_sgg_time)
+        self._patch = GraphPatch.from_graph_inv(self._graph_inv)
+        return result
+
+    def _apply_delta(
+        self,
+        patch: GraphPatch,
+        added: Iterable[tuple[State, State]],
+        removed: Iterable[tuple[State, State]],
+        evaluated: Iterable[tuple[State, int | None]],
+    ) -> list[int]:
+        seed_list = []
+        todo, todo_idx = [], array("I")
+        for state, ev in evaluated:
+            idx = self._find_state(state)
+            seed_list.append(idx)
+            if ev is not None:
+                patch.terminal_dict[idx] = ev
+                continue
+            patch.terminal_dict.pop(idx, None)
+            if not patch.children(idx):
+                todo.append(state)
+                todo_idx.append(idx)
+        for parent, child in removed:
+            idx = self._find_state(parent)
+            patch.remove_edge(idx, self._find_state(child))
+            seed_list.append(idx)
+        for parent, child in added:
+            idx = self._find_state(parent)
+            patch.add_edge(idx, self._add_state(child, todo, todo_idx))
+            seed_list.append(idx)
+        self._search_game_graph(todo, todo_idx)
+        for child, parent in zip(self._edge_list.src_list, self._edge_list.dst_list, strict=True):
+            patch.add_edge(parent, child)
+            seed_list.append(parent)
+        self._edge_list.clear()
+        return seed_list
+
+    def _find_state(self, state: State) -> int:
+        idx = self._hash_dict.get(self._state_key(state))
+        if idx is None:
+            msg = f"unknown state: {state}"
+            raise ValueError(msg)
+        return idx
+
+    def _add_state(self, state: State, todo: list[State], todo_idx: array) -> int:
+        key = self._state_key(state)
+        idx = self._hash_dict.get(key)
+        if idx is not None:
+            return idx
+        idx = self._register_state(state, key)
+        res = self._game.evaluate_state(state)
+        if res is None:
+            todo.append(state)
+            todo_idx.append(idx)
+        else:
+            self._eval_list[idx] = res
+            self._depth_list[idx] = 0
+        return idx
+
+    def _analyze(self, start_sgg_time: float, ra_start_idx: int | None = None) -> Result:
+        self._observe("search", self.node_size, len(self._horizon), force=True)
+        self._freeze_graph()
+        if self._profiler is not None:
+            self._profiler.phase = "ra"
+        start_ra_time = time.time()
+        self._retrograde_analyze(ra_start_idx)
+        end_solve = time.time()
+        self._observe("ra", self._confirmed_list.count(1), 0, force=True)
+        return self._make_result(start_ra_time - start_sgg_time, end_solve - start_ra_time)
+
+    def _make_result(self, sgg_time: float, ra_time: float) -> Result:
         return Result(
             hash_dict=self._hash_dict,
             eval_list=self._eval_list,
             depth_list=self._depth_list,
             sgg_time=sgg_time,
             ra_time=ra_time,
+            budget_exceeded=self._budget_exceeded,
+            key_func=self._key_func,
+            canonical=self.canonical,
+            encoding=self._encoding,
+            state_types=self._state_types,
         )
 
-    def _register_state(self, state: State) -> int:
+    def _set_game(self, game: Game) -> None:
+        self._game = game
+        if self.index == "dense":
+            if isinstance(game.init_state, HashState):
+                raise TypeError("dense index is not supported for HashState")
+            encoding = game.state_encoding()
+            if not isinstance(self._hash_dict, DenseIndex):
+                self._hash_dict = DenseIndex(encoding.size)
+            self._encoding = encoding
+            self._key_func = self._canonical_code if self.canonical else encoding.encode
+        else:
+            self._key_func = game.canonical_digest if self.canonical else None
+
+    def _canonical_code(self, state: State) -> int:
+        return min(map(self._encoding.encode, self._game.find_mirror_states(state)))  # type: ignore
+
+    def _state_key(self, state: State) -> int:
+        if self._key_func is None:
+            return state.digest  # type: ignore
+        return self._key_func(state)
+
+    def _register_state(self, state: State, key: int | None = None) -> int:
         idx = self.node_size
+        if idx >= self._budget_check_idx:
+            self._check_budget(idx)
         hash_dict = self._hash_dict
-        for mirror_state in self._game.find_mirror_states(state):
-            state_hash: int = mirror_state.digest  # type: ignore
+        key_func = self._key_func
+        self._state_types.add(type(state))
+        if self.canonical:
+            hash_dict[key_func(state) if key is None else key] = idx  # type: ignore
+            self._eval_list.append(0)
+            self._depth_list.append(-1)
+            self._child_count_list.append(0)
+            return idx
+        if key_func is None:
+            mirror_hashes = self._game.mirror_digests(state)
+        else:
+            mirror_hashes = map(key_func, self._game.find_mirror_states(state))
+        for state_hash in mirror_hashes:
             if state_hash in hash_dict and hash_dict[state_hash] != idx:
                 msg = "mirror func error"
                 raise ValueError(msg)
             hash_dict[state_hash] = idx
         self._eval_list.append(0)
         self._depth_list.append(-1)
-        self._graph_inv.append([])
         self._child_count_list.append(0)
         return idx
 
+    def _options(self) -> dict:
+        return {
+            "index": self.index,
+            "workers": self.workers,
+            "ra_backend": self.ra_backend,
+            "workdir": self.workdir,
+            "checkpoint_interval": self.checkpoint_interval,
+            "root_only": self.root_only,
+            "win_eval": self.win_eval,
+            "canonical": self.canonical,
+        }
+
+    def _write_search_checkpoint(self, todo: list[State], todo_idx: array, low: int) -> int:
+        checkpoint = self._checkpoint
+        if checkpoint is None:
+            return low
+        size_dict = checkpoint.size_dict
+        node_size, edge_size = size_dict["eval"], size_dict["edge_src"]
+        hash_key_list, hash_value_list = _index_items_since(self._hash_dict, size_dict["hash_key"])
+        patch_list = array("q")
+        for idx in self._checkpoint_dirty:
+            patch_list.extend((idx, self._eval_list[idx], self._depth_list[idx], self._child_count_list[idx]))
+        checkpoint.append("hash_key", hash_key_list)
+        checkpoint.append("hash_value", hash_value_list)
+        checkpoint.append("eval", self._eval_list[node_size:])
+        checkpoint.append("depth", self._depth_list[node_size:])
+        checkpoint.append("child_count", self._child_count_list[node_size:])
+        checkpoint.append("edge_src", self._edge_list.src_list[edge_size:])
+        checkpoint.append("edge_dst", self._edge_list.dst_list[edge_size:])
+        checkpoint.append("patch", patch_list)
+        checkpoint.push_todo(low, todo, todo_idx)
+        checkpoint.commit("search")
+        del self._checkpoint_dirty[:]
+        return len(todo)
+
+    def _write_ra_checkpoint(self, cursor: int) -> None:
+        checkpoint = self._checkpoint
+        if checkpoint is None or self._ra_journal is None:
+            return
+        journal = np.frombuffer(self._ra_journal, dtype=np.uint32).astype(np.int64)
+        offsets = np.asarray(self._graph_inv.offset_list)
+        starts = offsets[journal].astype(np.int64)
+        lens = offsets[journal + 1].astype(np.int64) - starts
+        heads = np.cumsum(lens) - lens
+        edge_idx = np.arange(int(lens.sum()), dtype=np.int64) - np.repeat(heads - starts, lens)
+        parents = np.asarray(self._graph_inv.target_list)[edge_idx].astype(np.int64)
+        changed = np.unique(np.concatenate([journal, parents]))
+        rows = np.stack([
+            changed,
+            np.asarray(self._eval_list)[changed],
+            np.asarray(self._depth_list)[changed],
+            np.asarray(self._child_count_list)[changed],
+            np.frombuffer(self._confirmed_list, dtype=np.uint8)[changed],
+        ]).T.astype(np.int64)
+        checkpoint.append("ra_patch", rows.ravel())
+        checkpoint.append("ra_queue", self._queue.log)  # type: ignore
+        checkpoint.commit("ra", cursor)
+        del self._ra_journal[:]
+        del self._queue.log[:]  # type: ignore
+
+    def _is_checkpoint_due(self) -> bool:
+        return self._checkpoint is not None and self._checkpoint.is_due(self.checkpoint_interval)
+
+    def _new_array(self, name: str, typecode: str) -> array | MappedArray:
+        if self.workdir is None:
+            return array(typecode)
+        return MappedArray(Path(self.workdir) / f"{name}.bin", typecode)
+
+    def _freeze_graph(self, *, clear: bool = True) -> None:
+        self._graph_inv = self._edge_list.freeze(
+            self.node_size,
+            self._new_array("graph_offset", "Q"),
+            self._new_array("graph_target", "I"),
+        )
+        if clear:
+            self._edge_list.clear()
+
     def _search_game_graph_recursive(self, state: State, idx: int) -> None:
         eval_list = self._eval_list
         depth_list = self._depth_list
         child_count_list = self._child_count_list
-        graph_inv = self._graph_inv
+        add_edge = self._edge_list.append
         hash_dict = self._hash_dict
         evaluate_state = self._game.evaluate_state
 
@@ -83,31 +646,46 @@ class Solver:
                 else:
                     self._search_game_graph_recursive(next_state, next_idx)
             child_count_list[idx] += 1
-            graph_inv[next_idx].append(idx)
+            add_edge(next_idx, idx)
         if child_count_list[idx] == 0:
             eval_list[idx] = self._game.default_eval
             depth_list[idx] = 0
 
-    def _search_game_graph(self) -> None:  # noqa: C901, PLR0914
+    def _search_game_graph(self, todo: list[State] | None = None, todo_idx: array | None = None) -> None:  # noqa: C901, PLR0914
         eval_list = self._eval_list
         depth_list = self._depth_list
         child_count_list = self._child_count_list
-        graph_inv = self._graph_inv
+        edge_src_append = self._edge_list.src_list.append
+        edge_dst_append = self._edge_list.dst_list.append
         hash_dict = self._hash_dict
         evaluate_state = self._game.evaluate_state
         find_next_states = self._game.find_next_states
         register_state = self._register_state
+        key_func = self._key_func
         init_state = self._game.init_state
 
-        todo = [init_state]
-        todo_idx = array("I", [register_state(init_state)])
-        while todo:
+        if todo is None or todo_idx is None:
+            todo = [init_state]
+            todo_idx = array("I", [register_state(init_state)])
+        low = -1 if self._checkpoint is None else self._checkpoint_low
+        dirty_append = self._checkpoint_dirty.append
+        step = CHECKPOINT_STEP
+        while todo and self._budget_exceeded is None:
+            step -= 1
+            if step == 0:
+                step = CHECKPOINT_STEP
+                if self._is_checkpoint_due():
+                    low = self._write_search_checkpoint(todo, todo_idx, low)
+                self._observe("search", self.node_size, len(todo))
             state, idx = todo.pop(), todo_idx.pop()
+            if len(todo) < low:
+                low = len(todo)
+                dirty_append(idx)
             for next_state in find_next_states(state):
-                next_hash = next_state.digest
+                next_hash = next_state.digest if key_func is None else key_func(next_state)
                 next_idx = hash_dict.get(next_hash)
                 if next_idx is None:
-                    next_idx = register_state(next_state)
+                    next_idx = register_state(next_state, next_hash)
                     next_res = evaluate_state(next_state)
                     if next_res is None:
                         todo.append(next_state)
@@ -116,63 +694,365 @@ class Solver:
                         eval_list[next_idx] = next_res
                         depth_list[next_idx] = 0
                 child_count_list[idx] += 1
-                graph_inv[next_idx].append(idx)
+                edge_src_append(next_idx)
+                edge_dst_append(idx)
+            if child_count_list[idx] == 0:
+                eval_list[idx] = self._game.default_eval
+                depth_list[idx] = 0
+        if self._checkpoint is not None:
+            self._checkpoint_low = low
+        if todo:
+            self._horizon, self._horizon_idx = todo, todo_idx
+
+    def _search_game_graph_bounded(self, max_depth: int) -> None:  # noqa: PLR0914
+        eval_list = self._eval_list
+        depth_list = self._depth_list
+        child_count_list = self._child_count_list
+        edge_src_append = self._edge_list.src_list.append
+        edge_dst_append = self._edge_list.dst_list.append
+        hash_dict = self._hash_dict
+        evaluate_state = self._game.evaluate_state
+        find_next_states = self._game.find_next_states
+        register_state = self._register_state
+        key_func = self._key_func
+
+        if self._search_depth is None:
+            self._horizon = [self._game.init_state]
+            self._horizon_idx = array("I", [register_state(self._game.init_state)])
+            self._search_depth = 0
+        todo, todo_idx = self._horizon, self._horizon_idx
+        while todo and self._search_depth < max_depth and self._budget_exceeded is None:
+            next_todo, next_todo_idx = [], array("I")
+            for pos, (state, idx) in enumerate(zip(todo, todo_idx, strict=True)):
+                if self._budget_exceeded is not None:
+                    next_todo += todo[pos:]
+                    next_todo_idx += todo_idx[pos:]
+                    break
+                for next_state in find_next_states(state):
+                    next_hash = next_state.digest if key_func is None else key_func(next_state)
+                    next_idx = hash_dict.get(next_hash)
+                    if next_idx is None:
+                        next_idx = register_state(next_state, next_hash)
+                        next_res = evaluate_state(next_state)
+                        if next_res is None:
+                            next_todo.append(next_state)
+                            next_todo_idx.append(next_idx)
+                        else:
+                            eval_list[next_idx] = next_res
+                            depth_list[next_idx] = 0
+                    child_count_list[idx] += 1
+                    edge_src_append(next_idx)
+                    edge_dst_append(idx)
+                if child_count_list[idx] == 0:
+                    eval_list[idx] = self._game.default_eval
+                    depth_list[idx] = 0
+            todo, todo_idx = next_todo, next_todo_idx
+            self._search_depth += 1
+            self._observe("search", self.node_size, len(todo))
+        self._probe_horizon(todo, todo_idx)
+
+    def _probe_horizon(self, todo: list[State], todo_idx: array) -> None:
+        self._horizon, self._horizon_idx = [], array("I")
+        for state, idx in zip(todo, todo_idx, strict=True):
+            if next(iter(self._game.find_next_states(state)), None) is None:
+                self._eval_list[idx] = self._game.default_eval
+                self._depth_list[idx] = 0
+            else:
+                self._horizon.append(state)
+                self._horizon_idx.append(idx)
+
+    def _search_game_graph_lazy(self) -> None:  # noqa: C901, PLR0914
+        eval_list = self._eval_list
+        depth_list = self._depth_list
+        child_count_list = self._child_count_list
+        edge_src_append = self._edge_list.src_list.append
+        edge_dst_append = self._edge_list.dst_list.append
+        hash_dict = self._hash_dict
+        evaluate_state = self._game.evaluate_state
+        find_next_states = self._game.find_next_states
+        register_state = self._register_state
+        key_func = self._key_func
+        init_state = self._game.init_state
+        cutoff_eval = self._cutoff_eval
+
+        todo = [init_state]
+        todo_idx = array("I", [register_state(init_state)])
+        while todo and self._budget_exceeded is None:
+            state, idx = todo.pop(), todo_idx.pop()
+            pending = []
+            for next_state in find_next_states(state):
+                next_hash = next_state.digest if key_func is None else key_func(next_state)
+                next_idx = hash_dict.get(next_hash)
+                if next_idx is None:
+                    next_res = evaluate_state(next_state)
+                    if next_res is None:
+                        pending.append((next_state, next_hash))
+                        continue
+                    next_idx = register_state(next_state, next_hash)
+                    eval_list[next_idx] = next_res
+                    depth_list[next_idx] = 0
+                child_count_list[idx] += 1
+                edge_src_append(next_idx)
+                edge_dst_append(idx)
+                if cutoff_eval is not None and depth_list[next_idx] == 0 and eval_list[next_idx] <= cutoff_eval:
+                    break
+            else:
+                for next_state, next_hash in pending:
+                    next_idx = hash_dict.get(next_hash)
+                    if next_idx is None:
+                        next_idx = register_state(next_state, next_hash)
+                        todo.append(next_state)
+                        todo_idx.append(next_idx)
+                    child_count_list[idx] += 1
+                    edge_src_append(next_idx)
+                    edge_dst_append(idx)
             if child_count_list[idx] == 0:
                 eval_list[idx] = self._game.default_eval
                 depth_list[idx] = 0
+        if todo:
+            self._horizon, self._horizon_idx = todo, todo_idx
 
-    def _retrograde_analyze(self) -> None:  # noqa: C901
+    def _search_game_graph_batch(self) -> None:  # noqa: PLR0914
+        game = self._game
+        child_count_list = self._child_count_list
+
+        init_idx = self._register_state(game.init_state)
+        init_code = game.encode_state(game.init_state)
+        code_index = HashIndex()
+        code_index[init_code] = init_idx
+        todo_code = array("Q", [init_code])
+        todo_idx = array("I", [init_idx])
+        while todo_code:
+            parent, next_code, next_res = game.find_next_states_batch(np.frombuffer(todo_code, dtype=np.uint64))
+            parent = np.asarray(parent, dtype=np.int64)
+            next_code = np.asarray(next_code, dtype=np.uint64)
+            next_todo_code, next_todo_idx = array("Q"), array("I")
+            if len(next_code) < BATCH_MIN_SIZE:
+                next_idx = array("I")
+                for code, res in zip(next_code.tolist(), np.asarray(next_res).tolist(), strict=True):
+                    idx = code_index.get(code)
+                    if idx is None:
+                        idx = self._register_code(code, res, code_index, next_todo_code, next_todo_idx)
+                    next_idx.append(idx)
+                self._edge_list.src_list.extend(next_idx)
+            else:
+                next_idx, found = code_index.get_many(next_code)
+                new_code, first, inverse = np.unique(next_code[~found], return_index=True, return_inverse=True)
+                new_res = np.asarray(next_res)[~found][first]
+                new_idx = array("I")
+                for code, res in zip(new_code.tolist(), new_res.tolist(), strict=True):
+                    new_idx.append(self._register_code(code, res, code_index, next_todo_code, next_todo_idx))
+                next_idx[~found] = np.frombuffer(new_idx, dtype=np.uint32)[inverse.reshape(-1)]
+                self._edge_list.src_list.frombytes(next_idx.tobytes())
+            self._edge_list.dst_list.frombytes(np.frombuffer(todo_idx, dtype=np.uint32)[parent].tobytes())
+            count_list = np.bincount(parent, minlength=len(todo_code)).tolist()
+            for idx, count in zip(todo_idx, count_list, strict=True):
+                child_count_list[idx] = count
+                if count == 0:
+                    self._eval_list[idx] = game.default_eval
+                    self._depth_list[idx] = 0
+            todo_code, todo_idx = next_todo_code, next_todo_idx
+            self._observe("search", self.node_size, len(todo_code))
+
+    def _register_code(self, code: int, res: int, code_index: HashIndex, todo_code: array, todo_idx: array) -> int:
+        state = self._game.decode_state(code)
+        key = self._state_key(state)
+        idx = self._hash_dict.get(key)
+        if idx is None:
+            idx = self._register_state(state, key)
+            if res == self._game.NO_EVAL:
+                todo_code.append(code)
+                todo_idx.append(idx)
+            else:
+                self._eval_list[idx] = res
+                self._depth_list[idx] = 0
+        code_index[code] = idx
+        return idx
+
+    def _search_game_graph_parallel(self) -> None:
+        shard_list = search_game_graph_sharded(self._game, self.workers, self._encoding, canonical=self.canonical)
+        base_list = [0]
+        for shard in shard_list:
+            base_list.append(base_list[-1] + len(shard.eval_list))
+        bases = np.array(base_list, dtype=np.int64)
+        key_list, value_list = [], []
+        for shard, base in zip(shard_list, base_list, strict=False):
+            self._state_types |= shard.state_types
+            # without shared digests the workers' keys can't be used here, so each node is registered again
+            for state in shard.state_list:
+                self._register_state(state)
+            size = len(shard.eval_list)
+            for column, values in [
+                (self._eval_list, shard.eval_list),
+                (self._depth_list, shard.depth_list),
+                (self._child_count_list, shard.child_count_list),
+            ]:
+                if shard.state_list:
+                    column[base : base + size] = values
+                else:
+                    column.extend(values)
+            key_list.append(np.frombuffer(shard.key_list, dtype=np.uint64))
+            value_list.append(np.frombuffer(shard.key_idx_list, dtype=np.uint32).astype(np.int64) + base)
+            parent_gid = np.frombuffer(shard.edge_parent_list, dtype=np.int64)
+            child = np.frombuffer(shard.edge_child_list, dtype=np.uint32).astype(np.int64) + base
+            parent = bases[parent_gid % self.workers] + parent_gid // self.workers
+            self._edge_list.src_list.frombytes(child.astype(np.uint32).tobytes())
+            self._edge_list.dst_list.frombytes(parent.astype(np.uint32).tobytes())
+        self._merge_keys(np.concatenate(key_list), np.concatenate(value_list))
+
+    def _merge_keys(self, keys: np.ndarray, values: np.ndarray) -> None:
+        order = np.argsort(keys, kind="stable")
+        keys, values = keys[order], values[order]
+        same = keys[1:] == keys[:-1]
+        if np.any(same & (values[1:] != values[:-1])):
+            msg = "mirror func error"
+            raise ValueError(msg)
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = ~same
+        item_iter = zip(keys[keep].tolist(), values[keep].tolist(), strict=True)
+        hash_dict = self._hash_dict
+        if isinstance(hash_dict, dict):
+            hash_dict.update(item_iter)
+            return
+        for key, value in item_iter:
+            hash_dict[key] = value
+
+    def _retrograde_analyze(self, start_idx: int | None = None) -> None:  # noqa: C901
+        # draw depths depend on the python engine's confirmation order when a draw's children disagree
+        if self.ra_backend == "numpy" and self._retrograde_analyze_numpy():
+            return
+        if self.ra_backend == "threshold" and self._retrograde_analyze_threshold():
+            return
         child_count_list = self._child_count_list
         confirm_eval = self._confirm_eval
-        for idx in range(self.node_size):
+        if start_idx is None:
+            start_idx = 0
+            self._confirmed_list = bytearray(self.node_size)
+            if self._checkpoint is not None:
+                self._queue = LoggedBucketQueue()
+                self._ra_journal = array("I")
+        step = CHECKPOINT_STEP
+        processed = self._confirmed_list.count(1)
+        for idx in range(start_idx, self.node_size):
             if child_count_list[idx] == 0:
-                confirm_eval(idx)
-        while self._key_list:
-            key = heappop(self._key_list)
-            queue = self._queue_dict.pop(key)
-            for idx in queue:
-                confirm_eval(idx)
+                processed += confirm_eval(idx)
+                if self._is_settled():
+                    break
+                step -= 1
+                if step == 0:
+                    step = CHECKPOINT_STEP
+                    if self._is_checkpoint_due():
+                        self._write_ra_checkpoint(idx + 1)
+                    self._observe("ra", processed, 0)
+        queue = self._queue
+        while queue and not self._is_settled():
+            step -= 1
+            if step == 0:
+                step = CHECKPOINT_STEP
+                if self._is_checkpoint_due():
+                    self._write_ra_checkpoint(self.node_size)
+                self._observe("ra", processed, 0)
+            for idx in queue.pop():
+                processed += confirm_eval(idx)
+                if self._is_settled():
+                    break
         for idx in range(self.node_size):
             if child_count_list[idx] > 0:
                 self._eval_list[idx] = 0
                 self._depth_list[idx] = -1
 
-    def _confirm_eval(self, start_idx: int):  # noqa: C901
+    def _retrograde_analyze_numpy(self) -> bool:
+        analyzer = NumpyRetrogradeAnalyzer(
+            self._graph_inv,
+            self._eval_list,
+            self._depth_list,
+            self._child_count_list,
+            self._stop_idx,
+            self._queue_eval,
+        )
+        analyzer.run()
+        if not analyzer.has_unique_draw_depths():
+            return False
+        self._eval_list[:] = to_array("i", analyzer.evals)
+        self._depth_list[:] = to_array("i", analyzer.depths)
+        self._child_count_list[:] = to_array("I", analyzer.child_counts)
+        self._confirmed_list = bytearray(analyzer.confirmed.tobytes())
+        return True
+
+    def _retrograde_analyze_threshold(self) -> bool:
+        analyzer = ThresholdRetrogradeAnalyzer(
+            self._graph_inv,
+            self._eval_list,
+            self._depth_list,
+            self._child_count_list,
+        )
+        analyzer.run()
+        if not analyzer.has_unique_draw_depths():
+            return False
+        self._eval_list[:] = to_array("i", analyzer.evals)
+        self._depth_list[:] = to_array("i", analyzer.depths)
+        self._child_count_list[:] = to_array("I", analyzer.child_counts)
+        self._confirmed_list = bytearray(analyzer.confirmed.tobytes())
+        return True
+
+    def _confirm_eval(self, start_idx: int) -> int:  # noqa: C901
         eval_list = self._eval_list
         depth_list = self._depth_list
         child_count_list = self._child_count_list
+        confirmed_list = self._confirmed_list
+        graph_inv = self._graph_inv
+        stop_idx = self._stop_idx
+        queue_eval = self._queue_eval
+        push = self._queue.push
+        journal = self._ra_journal
 
+        confirmed = 0
         todo_idx = [start_idx]
         while todo_idx:
             idx = todo_idx.pop()
+            if confirmed_list[idx]:
+                continue
+            confirmed_list[idx] = 1
+            confirmed += 1
+            if journal is not None:
+                journal.append(idx)
+            if idx == stop_idx:
+                child_count_list[idx] = 0
+                return confirmed
             prev_ev, prev_depth = -eval_list[idx], depth_list[idx] + 1
-            for prev_idx in self._graph_inv[idx]:
-                if child_count_list[prev_idx] == 0:
+            for prev_idx in graph_inv[idx]:
+                child_count = child_count_list[prev_idx]
+                if child_count == 0:
                     continue
-                child_count_list[prev_idx] -= 1
-                if self._is_better_eval(prev_ev, prev_depth, prev_idx):
+                child_count -= 1
+                child_count_list[prev_idx] = child_count
+                if is_better_eval(prev_ev, prev_depth, eval_list[prev_idx], depth_list[prev_idx]):
                     eval_list[prev_idx] = prev_ev
                     depth_list[prev_idx] = prev_depth
-                    if prev_ev >= 0:
-                        self._add_to_queue(prev_idx)
-                if child_count_list[prev_idx] == 0:
+                    if prev_ev >= queue_eval:
+                        push(prev_ev, prev_depth, prev_idx)
+                if child_count == 0:
                     todo_idx.append(prev_idx)
             child_count_list[idx] = 0
-            self._graph_inv[idx] = []
-
-    def _is_better_eval(self, ev: int, depth: int, idx: int):
-        if self._depth_list[idx] == -1:
-            return True
-        if self._eval_list[idx] < ev:
-            return True
-        return self._eval_list[idx] == ev and ev * depth < self._eval_list[idx] * self._depth_list[idx]
-
-    def _add_to_queue(self, idx: int):
-        ev, depth = self._eval_list[idx], self._depth_list[idx]
-        key = (-ev, ev * depth)
-        arr = self._queue_dict.get(key)
-        if arr is None:
-            arr = array("I")
-            self._queue_dict[key] = arr
-            heappush(self._key_list, key)
-        arr.append(idx)
+        return confirmed
+
+    def _is_settled(self) -> bool:
+        return self._stop_idx >= 0 and self._confirmed_list[self._stop_idx] == 1
+
+
+def _index_items_since(index: dict[int, int] | HashIndex | DenseIndex, start: int) -> tuple[array, array]:
+    if not isinstance(index, dict):
+        return index.items_since(start)
+    key_list, value_list = array("Q"), array("I")
+    for key, value in reversed(list(islice(reversed(index.items()), len(index) - start))):
+        key_list.append(key)
+        value_list.append(value)
+    return key_list, value_list
+
+
+def _apply_patch(data: bytes, *columns: np.ndarray) -> None:
+    patch = np.frombuffer(data, dtype=np.int64).reshape(-1, len(columns) + 1)[::-1]
+    _, last = np.unique(patch[:, 0], return_index=True)
+    patch = patch[last]
+    for i, column in enumerate(columns, 1):
+        column[patch[:, 0]] = patch[:, i]
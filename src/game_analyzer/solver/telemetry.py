@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .bucket_queue import BucketQueue
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+logger = logging.getLogger("game_analyzer.solver")
+
+
+def rss_bytes() -> int:
+    try:
+        return int(Path("/proc/self/statm").read_text(encoding="utf-8").split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class Progress:
+    phase: str
+    elapsed: float
+    nodes: int
+    edges: int
+    frontier: int
+    queue_keys: int
+    queue_items: int
+    processed: int
+    nodes_per_sec: float
+    rss: int
+
+
+class Telemetry:
+    def __init__(self, observer: Callable[[Progress], None], every_nodes: int, every_seconds: float):
+        self.observer = observer
+        self.every_nodes = every_nodes
+        self.every_seconds = every_seconds
+        self.start_time = time.time()
+        self._last_time = self.start_time
+        self._last_processed = 0
+        self._last_phase = ""
+
+    def observe(  # noqa: PLR0913, PLR0917
+        self,
+        phase: str,
+        processed: int,
+        nodes: int,
+        edges: int,
+        frontier: int,
+        queue: BucketQueue,
+        *,
+        force: bool = False,
+    ) -> None:
+        now = time.time()
+        if phase != self._last_phase:
+            self._last_phase, self._last_processed, self._last_time = phase, 0, now
+        elapsed = now - self._last_time
+        if not force and processed - self._last_processed < self.every_nodes and elapsed < self.every_seconds:
+            return
+        rate = (processed - self._last_processed) / elapsed if elapsed > 0 else 0.0
+        self._last_processed, self._last_time = processed, now
+        self.observer(
+            Progress(
+                phase=phase,
+                elapsed=now - self.start_time,
+                nodes=nodes,
+                edges=edges,
+                frontier=frontier,
+                queue_keys=queue.key_size,
+                queue_items=queue.item_size,
+                processed=processed,
+                nodes_per_sec=rate,
+                rss=rss_bytes(),
+            ),
+        )
+
+
+class LogSink:
+    def __init__(self, log: logging.Logger | None = None, level: int = logging.INFO):
+        self.log = logger if log is None else log
+        self.level = level
+
+    def __call__(self, progress: Progress) -> None:
+        self.log.log(
+            self.level,
+            "%s %.1fs nodes=%d edges=%d frontier=%d queue=%d/%d rate=%.0f/s rss=%.1fMB",
+            progress.phase,
+            progress.elapsed,
+            progress.nodes,
+            progress.edges,
+            progress.frontier,
+            progress.queue_keys,
+            progress.queue_items,
+            progress.nodes_per_sec,
+            progress.rss / (1 << 20),
+        )
+
+
+class JsonlSink:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def __call__(self, progress: Progress) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.time(), **asdict(progress)}) + "\n")
+
+
+class PrometheusSink:
+    def __init__(self, path: str | Path, prefix: str = "game_analyzer"):
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def __call__(self, progress: Progress) -> None:
+        line_list = []
+        for name, value in asdict(progress).items():
+            if name == "phase":
+                continue
+            metric = f"{self.prefix}_{name}"
+            line_list.extend((f"# TYPE {metric} gauge", f'{metric}{{phase="{progress.phase}"}} {value}'))
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text("\n".join(line_list) + "\n", encoding="utf-8")
+        tmp_path.replace(self.path)
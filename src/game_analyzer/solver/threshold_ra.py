@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .graph import CSRGraph, to_array
+from .numpy_ra import NumpyRetrogradeAnalyzer, _gather_edges, has_unique_draw_depths
+
+
+# Only pays off over the numpy backend when terminal values span a wide range.
+class ThresholdRetrogradeAnalyzer:
+    def __init__(self, graph_inv: CSRGraph, eval_list, depth_list, child_count_list):
+        self.offsets = np.asarray(graph_inv.offset_list, dtype=np.uint64).astype(np.int64)
+        self.targets = np.asarray(graph_inv.target_list, dtype=np.uint32).astype(np.int64)
+        self.evals = np.array(eval_list, dtype=np.int64)
+        self.depths = np.array(depth_list, dtype=np.int64)
+        self.child_counts = np.array(child_count_list, dtype=np.int64)
+        self.confirmed = np.zeros(len(self.evals), dtype=bool)
+        self.terminal = self.child_counts == 0
+        self.sources = np.repeat(np.arange(len(self.evals)), np.diff(self.offsets))
+        self.pass_count = 0
+
+    def run(self) -> None:
+        values = self._solve_values()
+        self._solve_depths(values)
+
+    def has_unique_draw_depths(self) -> bool:
+        return has_unique_draw_depths(self.sources, self.targets, self.evals, self.depths)
+
+    def _solve_values(self) -> np.ndarray:
+        terminal_evals = self.evals[self.terminal]
+        candidates = np.unique(np.concatenate([terminal_evals, -terminal_evals, [0]]))
+        top, zero = len(candidates) - 1, len(candidates) // 2
+        positive, non_negative = self._solve_sign()
+        lo = np.where(positive, zero + 1, np.where(non_negative, zero, 0))
+        hi = np.where(non_negative, np.where(positive, top, zero), zero - 1)
+        lo[self.terminal] = hi[self.terminal] = np.searchsorted(candidates, terminal_evals)
+        while np.any(lo < hi):
+            upper = (lo < hi) & (lo > zero)
+            lower = (lo < hi) & (hi < zero)
+            split = np.where(upper, lo + hi + 1, 2 * top - lo - hi + 1) // 2
+            holds = self._solve_split(lo, hi, upper, np.where(upper, top - split, split))
+            lo, hi = (
+                np.where(upper & holds, split, np.where(lower & ~holds, top - split + 1, lo)),
+                np.where(upper & ~holds, split - 1, np.where(lower & holds, top - split, hi)),
+            )
+        return candidates[lo]
+
+    def _solve_sign(self) -> tuple[np.ndarray, np.ndarray]:  # noqa: PLR0914
+        self.pass_count += 1
+        node_size = len(self.evals)
+        thresholds = np.repeat(np.array([1, 0]), node_size)
+        terminal = np.tile(self.terminal, 2)
+        counts = np.tile(self.child_counts, 2)
+        win = terminal & (np.tile(self.evals, 2) >= thresholds)
+        lose = terminal & ~win
+        frontier = np.flatnonzero(terminal)
+        while len(frontier) > 0:
+            node, layer = frontier % node_size, frontier // node_size
+            _, edge_idx = _gather_edges(self.offsets, node)
+            lens = self.offsets[node + 1] - self.offsets[node]
+            from_lose = np.repeat(lose[frontier], lens)
+            parent = self.targets[edge_idx] + np.repeat((1 - layer) * node_size, lens)
+            new_win = np.unique(parent[from_lose])
+            new_win = new_win[~win[new_win] & ~lose[new_win]]
+            win[new_win] = True
+            parent, count = np.unique(parent[~from_lose], return_counts=True)
+            counts[parent] -= count
+            new_lose = parent[(counts[parent] == 0) & ~win[parent] & ~lose[parent]]
+            lose[new_lose] = True
+            frontier = np.concatenate([new_win, new_lose])
+        win |= (thresholds <= 0) & ~lose
+        return win[:node_size], win[node_size:]
+
+    def _solve_split(self, lo: np.ndarray, hi: np.ndarray, upper: np.ndarray, bound: np.ndarray) -> np.ndarray:  # noqa: PLR0914
+        self.pass_count += 1
+        child, parent = self.sources, self.targets
+        parent_upper, parent_bound = upper[parent], bound[parent]
+        active = (lo < hi)[parent]
+        known_true = np.where(parent_upper, hi[child] <= parent_bound, lo[child] >= parent_bound) & active
+        known_false = np.where(parent_upper, lo[child] > parent_bound, hi[child] < parent_bound) & active
+        edge_open = active & ~known_true & ~known_false
+        holds = np.zeros(len(lo), dtype=bool)
+        holds[parent[known_true & parent_upper]] = True
+        counts = np.bincount(parent[active & ~parent_upper & ~known_true], minlength=len(lo))
+        counts[parent[known_false & ~parent_upper]] = len(parent) + 1
+        holds |= (lo < hi) & ~upper & (counts == 0)
+        frontier = np.flatnonzero(holds)
+        while len(frontier) > 0:
+            _, edge_idx = _gather_edges(self.offsets, frontier)
+            target = parent[edge_idx[edge_open[edge_idx]]]
+            target = target[~holds[target]]
+            new_or = np.unique(target[upper[target]])
+            target, count = np.unique(target[~upper[target]], return_counts=True)
+            counts[target] -= count
+            frontier = np.concatenate([new_or, target[counts[target] == 0]])
+            holds[frontier] = True
+        return holds
+
+    def _solve_depths(self, values: np.ndarray) -> None:
+        keep = values[self.targets] == -values[self.sources]
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.sources[keep], minlength=len(values)), out=offsets[1:])
+        graph_inv = CSRGraph(to_array("Q", offsets), to_array("I", self.targets[keep]))
+        evals = np.where(self.terminal, np.sign(values), 0)
+        child_counts = np.bincount(self.targets[keep], minlength=len(values))
+        analyzer = NumpyRetrogradeAnalyzer(graph_inv, evals, self.depths, child_counts)
+        analyzer.run()
+        self.confirmed = analyzer.confirmed
+        self.evals = np.where(self.confirmed, values, 0)
+        self.depths = analyzer.depths
+        self.child_counts = np.where(self.confirmed, 0, self.child_counts)
@@ -1,9 +1,15 @@
 from .state import State  # noqa: I001
 from .hash_state import HashArray, HashState
+from .frozen_state import FrozenState
+from .encoding import StateEncoding
+from .symmetry import BoardSymmetry
 
 
 __all__ = [
     "State",
+    "FrozenState",
     "HashArray",
     "HashState",
+    "StateEncoding",
+    "BoardSymmetry",
 ]
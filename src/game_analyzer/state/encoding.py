@@ -0,0 +1,84 @@
+import dataclasses
+import enum
+import typing
+from collections.abc import Hashable, Mapping, Sequence
+from typing import Annotated, Literal
+
+from .state import State
+
+Spec = Mapping[str, Sequence[Hashable]]
+
+
+def _derive_values(name: str, hint) -> Sequence[Hashable]:
+    if hint is bool:
+        return (False, True)
+    if isinstance(hint, type) and issubclass(hint, enum.Enum):
+        return tuple(hint)
+    origin = typing.get_origin(hint)
+    if origin is Literal:
+        return typing.get_args(hint)
+    if origin is Annotated:
+        for meta in hint.__metadata__:
+            if isinstance(meta, Sequence) and not isinstance(meta, str):
+                return meta
+        return _derive_values(name, typing.get_args(hint)[0])
+    msg = f"cannot derive the value range of field {name!r}; annotate it or pass a spec"
+    raise TypeError(msg)
+
+
+class StateEncoding:
+    def __init__(self, state_type: type[State], spec: Spec):
+        self.state_type = state_type
+        self.spec_list: list[tuple[str, int, int, Sequence[Hashable], dict | None]] = []
+        size = 1
+        for name, values in spec.items():
+            radix = len(values)
+            if radix == 0:
+                msg = f"field {name!r} has no values"
+                raise ValueError(msg)
+            if isinstance(values, range) and values.step == 1:
+                self.spec_list.append((name, radix, values.start, values, None))
+            else:
+                digit_dict = {value: digit for digit, value in enumerate(values)}
+                if len(digit_dict) != radix:
+                    msg = f"field {name!r} has duplicate values"
+                    raise ValueError(msg)
+                self.spec_list.append((name, radix, 0, tuple(values), digit_dict))
+            size *= radix
+        self.size = size
+
+    @classmethod
+    def from_type(cls, state_type: type[State], spec: Spec | None = None) -> "StateEncoding":
+        if not dataclasses.is_dataclass(state_type):
+            msg = f"{state_type.__qualname__} is not a dataclass"
+            raise TypeError(msg)
+        spec = {} if spec is None else spec
+        hint_dict = typing.get_type_hints(state_type, include_extras=True)
+        return cls(
+            state_type,
+            {
+                f.name: spec[f.name] if f.name in spec else _derive_values(f.name, hint_dict[f.name])
+                for f in dataclasses.fields(state_type)
+            },
+        )
+
+    def encode(self, state: State) -> int:
+        code = 0
+        for name, radix, start, _, digit_dict in self.spec_list:
+            value = getattr(state, name)
+            digit = value - start if digit_dict is None else digit_dict.get(value, -1)
+            if not 0 <= digit < radix:
+                msg = f"{name}={value!r} is out of range"
+                raise ValueError(msg)
+            code = code * radix + digit
+        return code
+
+    def decode(self, code: int) -> State:
+        if not 0 <= code < self.size:
+            msg = f"code {code} is out of range"
+            raise ValueError(msg)
+        kwargs = {}
+        for name, radix, _, values, _ in reversed(self.spec_list):
+            code, digit = divmod(code, radix)
+            kwargs[name] = values[digit]
+        return self.state_type(**kwargs)
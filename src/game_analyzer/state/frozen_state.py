@@ -0,0 +1,101 @@
+import random
+from typing import ClassVar
+
+from .hashing import field_seed, obj_digest
+from .state import State
+from .zobrist import CELL_TYPES, table_digest
+
+_CLASSVAR_PREFIX_LIST = ("ClassVar", "typing.ClassVar")
+
+
+def _iter_field_names(cls: type):
+    seen = set()
+    for base in reversed(cls.__mro__):
+        for name, annotation in base.__dict__.get("__annotations__", {}).items():
+            if name in seen or name.startswith("_"):
+                continue
+            if isinstance(annotation, str):
+                if annotation.startswith(_CLASSVAR_PREFIX_LIST):
+                    continue
+            elif getattr(annotation, "__origin__", annotation) is ClassVar:
+                continue
+            seen.add(name)
+            yield name
+
+
+def _make_seeded_post_init(cls: type["FrozenState"]):
+    namespace = {f"_s{i}": field_seed(cls.digest_seed, name) for i, name in enumerate(cls._field_list)}
+    namespace |= {"_set": object.__setattr__, "_d": obj_digest}
+    expr = " ^ ".join(f"_d(_s{i}, self.{name}, {cls._bit_size})" for i, name in enumerate(cls._field_list)) or "0"
+    source = f"def __post_init__(self):\n    _set(self, 'digest', {expr})\n"
+    exec(source, namespace)  # noqa: S102
+    return namespace["__post_init__"]
+
+
+def _make_post_init(cls: type["FrozenState"]):
+    namespace = {f"_t{i}": table for i, table in enumerate(cls._table_list)}
+    namespace |= {"_set": object.__setattr__, "_fill": cls._fill_tables, "_z": table_digest}
+    expr = (
+        " ^ ".join(
+            f"_z(self.{name}, _t{i}, {cls._bit_size})" if name in cls._cell_field_set else f"_t{i}[self.{name}]"
+            for i, name in enumerate(cls._field_list)
+        )
+        or "0"
+    )
+    source = (
+        "def __post_init__(self):\n"
+        "    try:\n"
+        f"        h = {expr}\n"
+        "    except (KeyError, TypeError):\n"
+        "        h = _fill(self)\n"
+        "    _set(self, 'digest', h)\n"
+    )
+    exec(source, namespace)  # noqa: S102
+    return namespace["__post_init__"]
+
+
+class FrozenState(State):
+    __slots__ = ("digest",)
+    _field_list: ClassVar[tuple[str, ...]] = ()
+    _table_list: ClassVar[tuple[dict, ...]] = ()
+    _cell_field_set: ClassVar[frozenset[str]] = frozenset()
+
+    def __init_subclass__(cls) -> None:
+        if "_digest_map" not in cls.__dict__:
+            super().__init_subclass__()
+        cls._field_list = tuple(_iter_field_names(cls))
+        cls._bind_digest_map()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "digest", self._fill_tables())
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self._field_list)
+
+    @classmethod
+    def _bind_digest_map(cls) -> None:
+        if cls.digest_seed is not None:
+            cls._table_list = ()
+            cls.__post_init__ = _make_seeded_post_init(cls)
+            return
+        cls._table_list = tuple(cls._digest_map.setdefault(name, {}) for name in cls._field_list)
+        cls.__post_init__ = _make_post_init(cls)
+
+    def _fill_tables(self) -> int:
+        cls = type(self)
+        h = 0
+        for name, table in zip(self._field_list, self._table_list, strict=True):
+            value = getattr(self, name)
+            if isinstance(value, CELL_TYPES):
+                if name not in cls._cell_field_set:
+                    cls._cell_field_set |= {name}
+                    cls.__post_init__ = _make_post_init(cls)
+                h ^= table_digest(value, table, self._bit_size)
+                continue
+            if value not in table:
+                table[value] = random.randrange(1 << self._bit_size)
+            h ^= table[value]
+        return h
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self._field_list}
@@ -1,8 +1,9 @@
-import random
-from collections.abc import Callable, Hashable, MutableSequence
+from collections.abc import Callable, MutableSequence
 from dataclasses import dataclass
 
+from .hashing import field_seed, index_seed, obj_digest
 from .state import State
+from .zobrist import table_digest
 
 
 class HashArray(MutableSequence):
@@ -14,6 +15,7 @@ class HashArray(MutableSequence):
         callback: Callable[[int], None] | None = None,
         digest_map: dict | None = None,
         bit_size: int = 60,
+        seed: int | None = None,
     ):
         if digest_map is None:
             digest_map = {}
@@ -24,6 +26,7 @@ class HashArray(MutableSequence):
         self._callback = callback
         self._digest_map = digest_map
         self._bit_size = bit_size
+        self._seed = seed
         self._digest: int = 0
 
         for i in range(len(self)):
@@ -74,24 +77,31 @@ class HashArray(MutableSequence):
 
     def _get_digest(self, index):
         value = self._inner[index]
-        if isinstance(value, Hashable):
-            return self._digest_map[index][value]
         if isinstance(value, HashArray):
             return value.digest
-        raise TypeError("Value must be hasharray or digestable")
+        if self._seed is not None:
+            return obj_digest(index_seed(self._seed, index), value, self._bit_size)
+        return table_digest(value, self._digest_map[index], self._bit_size)
 
     def _digest_value(self, index, value):
+        if self._seed is not None:
+            self._digest_seeded_value(index, value)
+            return
         if index not in self._digest_map:
             self._digest_map[index] = {}
-        if isinstance(value, Hashable):
-            if value not in self._digest_map[index]:
-                self._digest_map[index][value] = random.randrange(1 << self._bit_size)
-            self._add_digest(self._digest_map[index][value])
-        elif isinstance(value, MutableSequence):
+        if isinstance(value, MutableSequence):
             value = HashArray(value, self._add_digest, self._digest_map[index])
             self._inner[index] = value
         else:
-            raise TypeError("Value must be mutable-sequence or digestable")
+            self._add_digest(table_digest(value, self._digest_map[index], self._bit_size))
+
+    def _digest_seeded_value(self, index, value):
+        seed = index_seed(self._seed, index)
+        if isinstance(value, MutableSequence):
+            value = HashArray(value, self._add_digest, bit_size=self._bit_size, seed=seed)
+            self._inner[index] = value
+        else:
+            self._add_digest(obj_digest(seed, value, self._bit_size))
 
     def _add_digest(self, value: int):
         self._digest ^= value
@@ -122,24 +132,39 @@ class HashState(State):
 
     def _get_digest(self, name: str):
         value = getattr(self, name)
-        if isinstance(value, Hashable):
-            return self._digest_map[name][value]
         if isinstance(value, HashArray):
             return value.digest
-        raise TypeError("Value must be hasharray or digestable")
+        if self.digest_seed is not None:
+            return obj_digest(field_seed(self.digest_seed, name), value, self._bit_size)
+        return table_digest(value, self._digest_map[name], self._bit_size)
+
+    def _get_digest_with(self, digest_map: dict) -> int:
+        if self.digest_seed is not None:
+            return self.digest
+        h = 0
+        for k, v in self.to_dict().items():
+            if not k.startswith("_"):
+                h ^= table_digest(v, digest_map.setdefault(k, {}), self._bit_size)
+        return h
 
     def _digest_value(self, name: str, value):
+        if self.digest_seed is not None:
+            self._digest_seeded_value(field_seed(self.digest_seed, name), name, value)
+            return
         if name not in self._digest_map:
             self._digest_map[name] = {}
-        if isinstance(value, Hashable):
-            if value not in self._digest_map[name]:
-                self._digest_map[name][value] = random.randrange(1 << self._bit_size)
-            self._add_digest(self._digest_map[name][value])
-        elif isinstance(value, MutableSequence):
+        if isinstance(value, MutableSequence):
             value = HashArray(value, self._add_digest, self._digest_map[name])
             super().__setattr__(name, value)
         else:
-            raise TypeError("Value must be mutable-sequence or digestable")
+            self._add_digest(table_digest(value, self._digest_map[name], self._bit_size))
+
+    def _digest_seeded_value(self, seed: int, name: str, value):
+        if isinstance(value, MutableSequence):
+            value = HashArray(value, self._add_digest, bit_size=self._bit_size, seed=seed)
+            super().__setattr__(name, value)
+        else:
+            self._add_digest(obj_digest(seed, value, self._bit_size))
 
     def _add_digest(self, value: int):
         if not hasattr(self, "_digest"):
@@ -0,0 +1,153 @@
+import enum
+import struct
+from collections.abc import Hashable, MutableSequence, Sequence
+from functools import cache
+from hashlib import blake2b
+
+import numpy as np
+
+from .zobrist import ZobristTable, flat_cells, int_cells
+
+_MASK = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_MUL1 = 0xBF58476D1CE4E5B9
+_MUL2 = 0x94D049BB133111EB
+_INT64_MIN = -(1 << 63)
+_NONE_KEY = 0x6E6F6E65
+_STR_TAG = 0x737472
+_BYTES_TAG = 0x6279746573
+_FLOAT_TAG = 0x666C6F6174
+_TUPLE_TAG = 0x7475706C65
+
+
+def mix64(x: int) -> int:
+    x = ((x ^ (x >> 30)) * _MUL1) & _MASK
+    x = ((x ^ (x >> 27)) * _MUL2) & _MASK
+    return x ^ (x >> 31)
+
+
+def _bytes_key(data: bytes, tag: int) -> int:
+    return mix64(tag ^ int.from_bytes(blake2b(data, digest_size=8).digest(), "little"))
+
+
+def _int_key(value: int) -> int:
+    key = value & _MASK
+    value >>= 64
+    while value not in {0, -1}:
+        key = mix64(key ^ (value & _MASK))
+        value >>= 64
+    return key
+
+
+def value_key(value: Hashable) -> int:  # noqa: C901, PLR0911
+    if isinstance(value, (int, np.integer, np.bool_)):
+        return _int_key(int(value))
+    if value is None:
+        return _NONE_KEY
+    if isinstance(value, str):
+        return _bytes_key(value.encode("utf-8", "surrogatepass"), _STR_TAG)
+    if isinstance(value, bytes):
+        return _bytes_key(value, _BYTES_TAG)
+    if isinstance(value, float):
+        if value.is_integer():
+            return _int_key(int(value))
+        return _bytes_key(struct.pack("<d", value), _FLOAT_TAG)
+    if isinstance(value, enum.Enum):
+        return value_key((type(value).__qualname__, value.name))
+    if isinstance(value, tuple):
+        key = _TUPLE_TAG ^ len(value)
+        for element in value:
+            key = mix64((key + value_key(element) * _GAMMA) & _MASK)
+        return key
+    if isinstance(value, frozenset):
+        return sum(map(value_key, value)) & _MASK
+    msg = f"{type(value).__qualname__} values have no stable seeded digest"
+    raise TypeError(msg)
+
+
+@cache
+def field_seed(seed: int, name: str) -> int:
+    return mix64((seed * _GAMMA + value_key(name)) & _MASK)
+
+
+def index_seed(seed: int, index: int) -> int:
+    return mix64((seed ^ (index * _GAMMA)) & _MASK)
+
+
+def value_digest(seed: int, value: Hashable, bit_size: int) -> int:
+    key = value & _MASK if type(value) is int and _INT64_MIN <= value <= _MASK else value_key(value)
+    x = (seed + key * _GAMMA) & _MASK
+    x = ((x ^ (x >> 30)) * _MUL1) & _MASK
+    x = ((x ^ (x >> 27)) * _MUL2) & _MASK
+    return (x ^ (x >> 31)) >> (64 - bit_size)
+
+
+def _mix_digests(seeds, keys: np.ndarray, bit_size: int) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        x = seeds + keys * np.uint64(_GAMMA)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(_MUL1)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(_MUL2)
+    return (x ^ (x >> np.uint64(31))) >> np.uint64(64 - bit_size)
+
+
+@cache
+def index_seeds(seed: int, size: int) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        x = np.uint64(seed) ^ (np.arange(size, dtype=np.uint64) * np.uint64(_GAMMA))
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(_MUL1)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(_MUL2)
+    return x ^ (x >> np.uint64(31))
+
+
+class _SeededZobristTable(ZobristTable):
+    def __init__(self, seed: int, bit_size: int):
+        super().__init__(bit_size)
+        self._seed = seed
+
+    def _fill(self, row_size: int, offset: int, end: int) -> np.ndarray:
+        keys = np.arange(offset, end, dtype=np.int64).view(np.uint64)
+        return _mix_digests(index_seeds(self._seed, row_size)[:, None], keys[None, :], self._bit_size)
+
+
+@cache
+def seeded_table(seed: int, bit_size: int) -> _SeededZobristTable:
+    return _SeededZobristTable(seed, bit_size)
+
+
+def array_digest(seed: int, board: np.ndarray, bit_size: int) -> int:
+    try:
+        return seeded_table(seed, bit_size).digest(board)
+    except ValueError:
+        flat = flat_cells(board)
+    digests = _mix_digests(index_seeds(seed, len(flat)), flat.astype(np.uint64), bit_size)
+    return int(np.bitwise_xor.reduce(digests))
+
+
+def obj_digest(seed: int, obj, bit_size: int) -> int:
+    if type(obj) is int:
+        return value_digest(seed, obj, bit_size)
+    if isinstance(obj, np.ndarray):
+        return array_digest(seed, obj, bit_size)
+    if isinstance(obj, (tuple, bytes, MutableSequence)):
+        cells = int_cells(obj)
+        if cells is not None:
+            return array_digest(seed, cells, bit_size)
+        h = 0
+        for i, v in enumerate(obj):
+            h ^= obj_digest(index_seed(seed, i), v, bit_size)
+        return h
+    if isinstance(obj, Hashable):
+        return value_digest(seed, obj, bit_size)
+    raise TypeError("Value must be mutable-sequence or digestable")
+
+
+def value_digests(seed: int, column: Sequence[Hashable], bit_size: int) -> np.ndarray:
+    if all(type(value) is int for value in column):
+        try:
+            keys = np.array(column, dtype=np.int64).view(np.uint64)
+        except OverflowError:
+            pass
+        else:
+            return _mix_digests(np.uint64(seed), keys, bit_size)
+    digest_dict = {value: obj_digest(seed, value, bit_size) for value in set(column)}
+    return np.fromiter(map(digest_dict.__getitem__, column), dtype=np.uint64, count=len(column))
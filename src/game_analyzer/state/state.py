@@ -1,14 +1,77 @@
 import random
-from collections.abc import Hashable, MutableSequence
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from operator import attrgetter
 from typing import ClassVar
 
+import numpy as np
+
+from .hashing import field_seed, obj_digest, value_digests
+from .zobrist import CELL_TYPES, ZobristTable, table_digest
+
+
+def _iter_state_classes():
+    todo = [State]
+    while todo:
+        cls = todo.pop()
+        yield f"{cls.__module__}.{cls.__qualname__}", cls
+        todo.extend(cls.__subclasses__())
+
+
+def dump_digest_maps(state_types: Iterable[type] | None = None) -> dict[str, dict]:
+    class_iter = _iter_state_classes() if state_types is None else map(_state_class_item, state_types)
+    return {name: cls.__dict__["_digest_map"] for name, cls in class_iter if cls.__dict__.get("_digest_map")}
+
+
+def state_classes(names: Iterable[str]) -> set[type]:
+    class_dict = dict(_iter_state_classes())
+    return {class_dict[name] for name in names}
+
+
+def _state_class_item(cls: type) -> tuple[str, type]:
+    return f"{cls.__module__}.{cls.__qualname__}", cls
+
+
+def merge_digest_maps(digest_map_dict: dict[str, dict]) -> None:
+    class_dict = dict(_iter_state_classes())
+    for name, digest_map in digest_map_dict.items():
+        if name not in class_dict:
+            msg = f"unknown state class: {name}"
+            raise ValueError(msg)
+        _merge_digest_map(class_dict[name]._digest_map, digest_map, apply=False)  # noqa: SLF001
+    for name, digest_map in digest_map_dict.items():
+        _merge_digest_map(class_dict[name]._digest_map, digest_map, apply=True)  # noqa: SLF001
+        class_dict[name]._bind_digest_map()  # noqa: SLF001
+
+
+def loaded_digest(state: "State", digest_map_dict: dict[str, dict]) -> int:
+    cls = type(state)
+    return state._get_digest_with(digest_map_dict.setdefault(f"{cls.__module__}.{cls.__qualname__}", {}))  # noqa: SLF001
+
+
+def _merge_digest_map(target: dict, source: dict, *, apply: bool) -> None:
+    for key, value in source.items():
+        if key not in target:
+            if apply:
+                target[key] = value
+            continue
+        current = target[key]
+        if isinstance(current, dict) and isinstance(value, dict):
+            _merge_digest_map(current, value, apply=apply)
+        elif isinstance(current, ZobristTable) and isinstance(value, ZobristTable):
+            if current.conflicts(value):
+                raise ValueError("digest tables conflict")
+            if apply:
+                current.merge(value)
+        elif current != value:
+            raise ValueError("digest tables conflict")
+
 
-@dataclass
 class State:
+    __slots__ = ()
     __hash__ = None
     _digest_map: ClassVar[dict] = {}
     _bit_size: ClassVar[int] = 60
+    digest_seed: ClassVar[int | None] = None
 
     def __init_subclass__(cls) -> None:
         cls._digest_map = {}
@@ -16,6 +79,8 @@ class State:
 
     @property
     def digest(self) -> int:
+        if self.digest_seed is not None:
+            return self._get_seeded_digest()
         h = 0
         for k, v in self.to_dict().items():
             if k not in self._digest_map:
@@ -23,19 +88,86 @@ class State:
             h ^= self._get_obj_digest(v, self._digest_map[k])
         return h
 
+    @classmethod
+    def digest_many(cls, states: Sequence["State"]) -> np.ndarray:
+        digests = np.zeros(len(states), dtype=np.uint64)
+        if len(states) == 0:
+            return digests
+        state_type = type(states[0])
+        if (
+            state_type.digest is not State.digest
+            or state_type.to_dict is not State.to_dict
+            or any(type(state) is not state_type for state in states)
+        ):
+            return np.fromiter((state.digest for state in states), dtype=np.uint64, count=len(states))
+        if state_type is not cls:
+            return state_type.digest_many(states)
+        if cls.digest_seed is not None:
+            return cls._digest_many_seeded(states)
+        digest_map = cls._digest_map
+        column_list = []
+        for k in states[0].to_dict():
+            column = list(map(attrgetter(k), states))
+            try:
+                value_set = set(column)
+            except TypeError:
+                value_set = None
+            if value_set is None or any(isinstance(value, CELL_TYPES) for value in value_set):
+                return np.fromiter((state.digest for state in states), dtype=np.uint64, count=len(states))
+            column_list.append((k, column, value_set))
+        for k, column, value_set in column_list:
+            mapping = digest_map.setdefault(k, {})
+            for value in value_set - mapping.keys():
+                mapping[value] = random.randrange(1 << cls._bit_size)
+            digests ^= np.fromiter(map(mapping.__getitem__, column), dtype=np.uint64, count=len(states))
+        return digests
+
+    @classmethod
+    def _digest_many_seeded(cls, states: Sequence["State"]) -> np.ndarray:
+        digests = np.zeros(len(states), dtype=np.uint64)
+        for k in states[0].to_dict():
+            column = list(map(attrgetter(k), states))
+            try:
+                digests ^= value_digests(field_seed(cls.digest_seed, k), column, cls._bit_size)
+            except TypeError:
+                return np.fromiter((state.digest for state in states), dtype=np.uint64, count=len(states))
+        return digests
+
     def to_dict(self) -> dict:
         return self.__dict__
 
+    @classmethod
+    def _bind_digest_map(cls) -> None:
+        pass
+
+    def _get_seeded_digest(self) -> int:
+        h = 0
+        seed, bit_size = self.digest_seed, self._bit_size
+        for k, v in self.to_dict().items():
+            h ^= obj_digest(field_seed(seed, k), v, bit_size)
+        return h
+
+    def _get_digest_with(self, digest_map: dict) -> int:
+        if self.digest_seed is not None:
+            return self.digest
+        h = 0
+        for k, v in self.to_dict().items():
+            h ^= table_digest(v, digest_map.setdefault(k, {}), self._bit_size)
+        return h
+
+    def _get_digest_without(self, name: str) -> int:
+        h = 0
+        seed, bit_size = self.digest_seed, self._bit_size
+        for k, v in self.to_dict().items():
+            if k == name:
+                continue
+            if seed is not None:
+                h ^= obj_digest(field_seed(seed, k), v, bit_size)
+                continue
+            if k not in self._digest_map:
+                self._digest_map[k] = {}
+            h ^= self._get_obj_digest(v, self._digest_map[k])
+        return h
+
     def _get_obj_digest(self, obj, mapping) -> int:
-        if isinstance(obj, Hashable):
-            if obj not in mapping:
-                mapping[obj] = random.randrange(1 << self._bit_size)
-            return mapping[obj]
-        if isinstance(obj, MutableSequence):
-            h = 0
-            for i, v in enumerate(obj):
-                if i not in mapping:
-                    mapping[i] = {}
-                h ^= self._get_obj_digest(v, mapping[i])
-            return h
-        raise TypeError("Value must be mutable-sequence or digestable")
+        return table_digest(obj, mapping, self._bit_size)
@@ -0,0 +1,110 @@
+import dataclasses
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from .frozen_state import FrozenState
+from .hash_state import HashArray, HashState
+from .hashing import field_seed, seeded_table
+from .state import State
+from .zobrist import CellDictTable, ZobristTable, int_cells, zobrist_table
+
+
+class BoardSymmetry:
+    def __init__(self, field: str, perm_list: Sequence[Sequence[int]]):
+        perm_array = np.array(perm_list, dtype=np.int64).reshape(len(perm_list), -1)
+        cell_size = perm_array.shape[1]
+        identity = np.arange(cell_size)
+        if any(not np.array_equal(np.sort(perm), identity) for perm in perm_array):
+            msg = f"every symmetry of {field!r} must be a permutation of {cell_size} cells"
+            raise ValueError(msg)
+        perm_array = np.unique(np.vstack([identity, perm_array]), axis=0)
+        identity_idx = int(np.flatnonzero((perm_array == identity).all(axis=1))[0])
+        perm_array[[0, identity_idx]] = perm_array[[identity_idx, 0]]
+        self.field = field
+        self.cell_size = cell_size
+        self.perm_array = perm_array
+        self._inverse_array = np.argsort(perm_array, axis=1)
+        self._table_dict: dict[int, CellDictTable] = {}
+        self._permuted_dict: dict[int, tuple[ZobristTable, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.perm_array)
+
+    @classmethod
+    def dihedral(cls, field: str, height: int, width: int) -> "BoardSymmetry":
+        grid = np.arange(height * width).reshape(height, width)
+        if height == width:
+            grid_list = [np.rot90(grid, k) for k in range(4)]
+            grid_list += [np.fliplr(g) for g in grid_list]
+        else:
+            grid_list = [grid, np.fliplr(grid), np.flipud(grid), np.rot90(grid, 2)]
+        return cls(field, [g.ravel() for g in grid_list])
+
+    def mirror_states(self, state: State) -> Iterator[State]:
+        board = getattr(state, self.field)
+        for perm in self.perm_array:
+            yield dataclasses.replace(state, **{self.field: self._permute_board(board, perm)})
+
+    def mirror_digests(self, state: State) -> list[int]:
+        cached = isinstance(state, (FrozenState, HashState))
+        if not cached and type(state).digest is not State.digest:
+            return [mirror_state.digest for mirror_state in self.mirror_states(state)]
+        try:
+            table, cells = self._cell_table(state, getattr(state, self.field))
+            cells = table.cover(cells)
+        except (TypeError, ValueError):
+            return [mirror_state.digest for mirror_state in self.mirror_states(state)]
+        if len(cells) != self.cell_size:
+            msg = f"{self.field!r} has {len(cells)} cells but the symmetry permutes {self.cell_size}"
+            raise ValueError(msg)
+        flat_table, base = self._permuted_table(table)
+        digests = np.bitwise_xor.reduce(flat_table.take(base + cells), axis=1)
+        rest = state.digest ^ int(digests[0]) if cached else state._get_digest_without(self.field)  # noqa: SLF001
+        return (digests ^ np.uint64(rest)).tolist()
+
+    def _cell_table(self, state: State, board) -> tuple[ZobristTable, np.ndarray]:
+        if isinstance(board, HashArray):
+            board = board._inner  # noqa: SLF001
+        if isinstance(board, np.ndarray):
+            cells, vectorized = board, True
+        else:
+            cells = int_cells(board)
+            vectorized = cells is not None and isinstance(board, (tuple, bytes))
+            if cells is None:
+                if not set(map(type, board)) <= {int, bool}:
+                    msg = f"{self.field!r} cells must be integers"
+                    raise TypeError(msg)
+                cells = np.fromiter(board, dtype=np.int64, count=len(board))
+        state_type = type(state)
+        bit_size = state_type._bit_size  # noqa: SLF001
+        if state_type.digest_seed is not None:
+            return seeded_table(field_seed(state_type.digest_seed, self.field), bit_size), cells
+        mapping = state_type._digest_map.setdefault(self.field, {})  # noqa: SLF001
+        if vectorized:
+            return zobrist_table(mapping, bit_size), cells
+        table = self._table_dict.get(id(mapping))
+        if table is None or table.mapping is not mapping:
+            table = self._table_dict[id(mapping)] = CellDictTable(mapping, bit_size)
+        return table, cells
+
+    def _permuted_table(self, table: ZobristTable) -> tuple[np.ndarray, np.ndarray]:
+        entry = self._permuted_dict.get(id(table))
+        if entry is None or entry[0] is not table or entry[1] is not table.table:
+            column_size = table.table.shape[1]
+            permuted = table.table[self._inverse_array]
+            index = np.arange(len(self) * self.cell_size, dtype=np.int64).reshape(len(self), self.cell_size)
+            entry = (table, table.table, permuted.ravel(), index * column_size - table.offset)
+            self._permuted_dict[id(table)] = entry
+        return entry[2], entry[3]
+
+    @staticmethod
+    def _permute_board(board, perm: np.ndarray):
+        if isinstance(board, np.ndarray):
+            return board.ravel()[perm].reshape(board.shape)
+        cells = [board[i] for i in perm]
+        if isinstance(board, bytes):
+            return bytes(cells)
+        if isinstance(board, tuple):
+            return tuple(cells)
+        return cells
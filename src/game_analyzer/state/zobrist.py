@@ -0,0 +1,167 @@
+import random
+from collections.abc import Hashable, MutableSequence
+
+import numpy as np
+
+CELL_TYPES = (tuple, bytes, np.ndarray)
+INTEGER_TYPES = (int, np.integer, np.bool_)
+VECTOR_SIZE = 16
+MAX_COLUMN_SIZE = 1 << 16
+_DTYPE_RANGE_DICT = {np.dtype(np.bool_): (0, 1), np.dtype(np.int8): (-128, 127), np.dtype(np.uint8): (0, 255)}
+
+
+def flat_cells(board: np.ndarray) -> np.ndarray:
+    flat = board.ravel()
+    if flat.dtype.kind == "b":
+        return flat.view(np.uint8)
+    if flat.dtype.kind not in "iu":
+        msg = f"board fields must have an integer or bool dtype, not {flat.dtype}"
+        raise TypeError(msg)
+    return flat
+
+
+def int_cells(obj: tuple | bytes | MutableSequence) -> np.ndarray | None:
+    if len(obj) < VECTOR_SIZE:
+        return None
+    if isinstance(obj, bytes):
+        return np.frombuffer(obj, dtype=np.uint8)
+    if not set(map(type, obj)) <= {int, bool}:
+        if not all(isinstance(v, INTEGER_TYPES) or (isinstance(v, float) and v.is_integer()) for v in obj):
+            return None
+        obj = [int(v) for v in obj]
+    try:
+        return np.fromiter(obj, dtype=np.int64, count=len(obj))
+    except OverflowError:
+        return None
+
+
+class ZobristTable:
+    def __init__(self, bit_size: int = 60):
+        self.table = np.zeros((0, 0), dtype=np.uint64)
+        self.offset = 0
+        self._bit_size = bit_size
+        self._flat_table = self.table.ravel()
+        self._base = np.zeros(0, dtype=np.int64)
+
+    def __getstate__(self) -> dict:
+        return {"table": self.table, "offset": self.offset, "bit_size": self._bit_size}
+
+    def __setstate__(self, state: dict) -> None:
+        self._bit_size = state["bit_size"]
+        self._set_table(state["table"], state["offset"])
+
+    def digest(self, board: np.ndarray) -> int:
+        flat = self.cover(board)
+        if len(flat) == 0:
+            return 0
+        return int(np.bitwise_xor.reduce(self._flat_table.take(self._base[: len(flat)] + flat)))
+
+    def cover(self, board: np.ndarray) -> np.ndarray:
+        dtype_range = _DTYPE_RANGE_DICT.get(board.dtype)
+        flat = flat_cells(board)
+        if len(flat) == 0:
+            return flat
+        if flat.dtype == np.uint64:
+            flat = flat.astype(np.int64)
+        lo, hi = dtype_range or (int(flat.min()), int(flat.max()))
+        row_size, column_size = self.table.shape
+        if len(flat) > row_size or lo < self.offset or hi >= self.offset + column_size:
+            self._grow(len(flat), lo, hi)
+        return flat
+
+    def conflicts(self, other: "ZobristTable") -> bool:
+        row_size = min(len(self.table), len(other.table))
+        lo = max(self.offset, other.offset)
+        hi = min(self.offset + self.table.shape[1], other.offset + other.table.shape[1])
+        if row_size == 0 or lo >= hi:
+            return False
+        own = self.table[:row_size, lo - self.offset : hi - self.offset]
+        return not np.array_equal(own, other.table[:row_size, lo - other.offset : hi - other.offset])
+
+    def merge(self, other: "ZobristTable") -> None:
+        if other.table.size == 0:
+            return
+        if self.table.size == 0:
+            self._set_table(other.table, other.offset)
+            return
+        offset = min(self.offset, other.offset)
+        end = max(self.offset + self.table.shape[1], other.offset + other.table.shape[1])
+        table = self._fill(max(len(self.table), len(other.table)), offset, end)
+        for source in (other, self):
+            start = source.offset - offset
+            table[: len(source.table), start : start + source.table.shape[1]] = source.table
+        self._set_table(table, offset)
+
+    def _grow(self, cell_size: int, lo: int, hi: int) -> None:
+        row_size, column_size = self.table.shape
+        offset, end = (
+            (min(lo, self.offset), max(hi + 1, self.offset + column_size)) if column_size > 0 else (lo, hi + 1)
+        )
+        if end - offset > MAX_COLUMN_SIZE:
+            msg = f"board values span [{offset}, {end}), too wide for a Zobrist table"
+            raise ValueError(msg)
+        table = self._fill(max(cell_size, row_size), offset, end)
+        start = self.offset - offset
+        table[:row_size, start : start + column_size] = self.table
+        self._set_table(table, offset)
+
+    def _fill(self, row_size: int, offset: int, end: int) -> np.ndarray:
+        rng = np.random.default_rng(random.getrandbits(64))
+        return rng.integers(0, 1 << self._bit_size, size=(row_size, end - offset), dtype=np.uint64)
+
+    def _set_table(self, table: np.ndarray, offset: int) -> None:
+        self.table, self.offset = table, offset
+        self._flat_table = table.ravel()
+        self._base = np.arange(len(table), dtype=np.int64) * table.shape[1] - offset
+
+
+class CellDictTable(ZobristTable):
+    def __init__(self, mapping: dict, bit_size: int = 60):
+        super().__init__(bit_size)
+        self.mapping = mapping
+
+    def _fill(self, row_size: int, offset: int, end: int) -> np.ndarray:
+        table = np.empty((row_size, end - offset), dtype=np.uint64)
+        for i in range(row_size):
+            if i not in self.mapping:
+                self.mapping[i] = {}
+            cell_mapping = self.mapping[i]
+            for value in range(offset, end):
+                if value not in cell_mapping:
+                    cell_mapping[value] = random.randrange(1 << self._bit_size)
+                table[i, value - offset] = cell_mapping[value]
+        return table
+
+
+def zobrist_table(mapping: dict, bit_size: int) -> ZobristTable:
+    table = mapping.get(np.ndarray)
+    if table is None:
+        table = mapping[np.ndarray] = ZobristTable(bit_size)
+    return table
+
+
+def table_digest(obj, mapping: dict, bit_size: int) -> int:  # noqa: C901
+    if isinstance(obj, np.ndarray):
+        try:
+            return zobrist_table(mapping, bit_size).digest(obj)
+        except ValueError:
+            obj = flat_cells(obj).tolist()
+    elif isinstance(obj, (tuple, bytes)):
+        cells = int_cells(obj)
+        if cells is not None:
+            try:
+                return zobrist_table(mapping, bit_size).digest(cells)
+            except ValueError:
+                pass
+    if isinstance(obj, (tuple, bytes, MutableSequence)):
+        h = 0
+        for i, v in enumerate(obj):
+            if i not in mapping:
+                mapping[i] = {}
+            h ^= table_digest(v, mapping[i], bit_size)
+        return h
+    if isinstance(obj, Hashable):
+        if obj not in mapping:
+            mapping[obj] = random.randrange(1 << bit_size)
+        return mapping[obj]
+    raise TypeError("Value must be mutable-sequence or digestable")
@@ -0,0 +1,64 @@
+import pickle
+import random
+from heapq import heappop, heappush
+
+from game_analyzer.solver.bucket_queue import BucketQueue
+
+
+def heap_order(op_list):
+    queue_dict, key_list, order = {}, [], []
+    for op in op_list:
+        if op is None:
+            if not key_list:
+                continue
+            key = heappop(key_list)
+            order.append(queue_dict.pop(key))
+            continue
+        ev, depth, idx = op
+        key = (-ev, ev * depth)
+        if key not in queue_dict:
+            queue_dict[key] = []
+            heappush(key_list, key)
+        queue_dict[key].append(idx)
+    while key_list:
+        order.append(queue_dict.pop(heappop(key_list)))
+    return order
+
+
+def bucket_order(op_list):
+    queue, order = BucketQueue(), []
+    for op in op_list:
+        if op is None:
+            if queue:
+                order.append(list(queue.pop()))
+        else:
+            queue.push(*op)
+    while queue:
+        order.append(list(queue.pop()))
+    return order
+
+
+def test_same_order_as_heap():
+    rnd = random.Random(0)
+    for _ in range(200):
+        op_list = []
+        for idx in range(rnd.randrange(1, 60)):
+            if rnd.random() < 0.3:
+                op_list.append(None)
+            else:
+                op_list.append((rnd.choice([-2, -1, 0, 1, 3]), rnd.randrange(20), idx))
+        assert bucket_order(op_list) == heap_order(op_list)
+
+
+def test_sizes_and_pickle():
+    queue = BucketQueue()
+    assert not queue
+    for idx, (ev, depth) in enumerate([(1, 3), (1, 3), (1, 5), (0, 2)]):
+        queue.push(ev, depth, idx)
+    assert queue.key_size == 3
+    assert queue.item_size == 4
+    queue = pickle.loads(pickle.dumps(queue))
+    assert list(queue.pop()) == [0, 1]
+    assert list(queue.pop()) == [2]
+    assert list(queue.pop()) == [3]
+    assert not queue
@@ -0,0 +1,38 @@
+import random
+
+from game_analyzer import Solver
+from game_analyzer.solver.graph import EdgeList
+from tests.solver.problems.stones import CASE8
+from tests.solver.test_solver_by_stones import Stones
+
+
+def test_freeze_keeps_insertion_order():
+    rng = random.Random(0)
+    node_size = 50
+    edge_list = EdgeList()
+    expected = [[] for _ in range(node_size)]
+    for _ in range(1000):
+        src, dst = rng.randrange(node_size), rng.randrange(node_size)
+        edge_list.append(src, dst)
+        expected[src].append(dst)
+    graph = edge_list.freeze(node_size)
+    assert graph.node_size == node_size
+    assert graph.edge_size == 1000
+    for idx in range(node_size):
+        assert list(graph[idx]) == expected[idx]
+
+
+def test_freeze_empty():
+    graph = EdgeList().freeze(3)
+    assert graph.edge_size == 0
+    assert [list(graph[idx]) for idx in range(3)] == [[], [], []]
+
+
+# 4.1 bytes/edge (list[list[int]]: 36.7 bytes/edge)
+def test_graph_bytes_per_edge():
+    stones = Stones(**CASE8)
+    solver = Solver()
+    solver.solve(stones)
+    graph = solver._graph_inv
+    assert graph.edge_size == 985149
+    assert graph.nbytes / graph.edge_size < 5
@@ -0,0 +1,117 @@
+import random
+from array import array
+
+from game_analyzer import Solver
+from game_analyzer.solver.graph import EdgeList
+from game_analyzer.solver.numpy_ra import NumpyRetrogradeAnalyzer
+from tests.solver.problems.graph import CASE_LIST as GRAPH_CASE_LIST
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.shiritori import CASE_LIST as SHIRITORI_CASE_LIST
+from tests.solver.problems.stones import CASE2, CASE6, CASE8
+from tests.solver.test_solver_by_graph import Graph
+from tests.solver.test_solver_by_lrud import LRUD
+from tests.solver.test_solver_by_shiritori import Shiritori
+from tests.solver.test_solver_by_stones import Stones
+from tests.solver.test_solver_root_only import TicTacToe
+
+
+def build_random_solver(seed, node_size, value_list, ra_backend):
+    rnd = random.Random(seed)
+    solver = Solver(ra_backend=ra_backend)
+    eval_list = [0] * node_size
+    depth_list = [-1] * node_size
+    child_count_list = [0] * node_size
+    for idx in range(node_size):
+        if rnd.random() < 0.25:
+            eval_list[idx] = rnd.choice(value_list)
+            depth_list[idx] = 0
+    edge_list = EdgeList()
+    for _ in range(node_size * 3):
+        src, dst = rnd.randrange(node_size), rnd.randrange(node_size)
+        if depth_list[src] == -1:
+            edge_list.append(dst, src)
+            child_count_list[src] += 1
+    for idx in range(node_size):
+        if child_count_list[idx] == 0:
+            depth_list[idx] = 0
+    solver._eval_list = array("i", eval_list)
+    solver._depth_list = array("i", depth_list)
+    solver._child_count_list = array("I", child_count_list)
+    solver._edge_list = edge_list
+    solver._freeze_graph()
+    return solver
+
+
+def test_same_as_python_on_random_graphs():
+    for seed in range(300):
+        node_size = random.Random(seed).randrange(2, 100)
+        value_list = [[-1, 1], [-1, 0, 1], list(range(-5, 6))][seed % 3]
+        python_solver = build_random_solver(seed, node_size, value_list, "python")
+        numpy_solver = build_random_solver(seed, node_size, value_list, "numpy")
+        python_solver._retrograde_analyze()
+        numpy_solver._retrograde_analyze()
+        assert python_solver._eval_list == numpy_solver._eval_list
+        assert python_solver._depth_list == numpy_solver._depth_list
+
+
+def test_draw_depth_follows_python_order():
+    solver = build_random_solver(0, 1, [0], "numpy")
+    # 0 -> 1 -> 2 (draw), 0 -> 3 -> 4 -> 5 (draw), 0 -> 5
+    child_list = [[1, 3, 5], [2], [], [4], [5], []]
+    edge_list = EdgeList()
+    for idx, children in enumerate(child_list):
+        for child in children:
+            edge_list.append(child, idx)
+    solver._eval_list = array("i", [0] * 6)
+    solver._depth_list = array("i", [-1, -1, 0, -1, -1, 0])
+    solver._child_count_list = array("I", map(len, child_list))
+    solver._edge_list = edge_list
+    solver._freeze_graph()
+    analyzer = NumpyRetrogradeAnalyzer(
+        solver._graph_inv,
+        solver._eval_list,
+        solver._depth_list,
+        solver._child_count_list,
+    )
+    analyzer.run()
+    assert not analyzer.has_unique_draw_depths()
+    solver._retrograde_analyze()
+    assert list(solver._depth_list) == [2, 1, 0, 2, 1, 0]
+
+
+def test_unique_draw_depths_stay_vectorized():
+    solver = Solver()
+    solver._set_game(TicTacToe((0,) * 9))
+    solver._search()
+    solver._freeze_graph()
+    analyzer = NumpyRetrogradeAnalyzer(
+        solver._graph_inv,
+        solver._eval_list,
+        solver._depth_list,
+        solver._child_count_list,
+    )
+    analyzer.run()
+    assert analyzer.has_unique_draw_depths()
+    assert (analyzer.evals == 0).sum() > 0
+
+
+def assert_same_result(game, state_list):
+    python_result = Solver().solve(game)
+    numpy_result = Solver(ra_backend="numpy").solve(game)
+    for state in state_list:
+        assert python_result.state_to_params(state) == numpy_result.state_to_params(state)
+
+
+def test_same_as_python_by_problems():
+    for case in [CASE2, CASE6, CASE8]:
+        stones = Stones(**case)
+        assert_same_result(stones, [type(stones.init_state)(stones=i) for i in range(case["init_stones"] + 1)])
+    for case, _ in LRUD_CASE_LIST:
+        lrud = LRUD(**case)
+        assert_same_result(lrud, [lrud.init_state])
+    for case, _ in GRAPH_CASE_LIST:
+        graph = Graph(**case)
+        assert_same_result(graph, [graph.init_state])
+    for case, _ in SHIRITORI_CASE_LIST[:3]:
+        shiritori = Shiritori(**case)
+        assert_same_result(shiritori, [type(shiritori.init_state)(last=word[-3:]) for word in shiritori.words])
@@ -0,0 +1,52 @@
+import numpy as np
+
+from game_analyzer import Solver, StateEncoding
+from tests.solver.problems.stones import CASE_LIST
+from tests.solver.test_solver_by_stones import Stones, StonesState
+
+
+class BatchStones(Stones):
+    def encode_state(self, state):
+        return state.stones
+
+    def decode_state(self, code):
+        return StonesState(stones=code)
+
+    def find_next_states_batch(self, codes):
+        next_stones = codes.astype(np.int64)[:, None] - np.array(self.hand_list)[None, :]
+        parent, hand = np.nonzero(next_stones >= 0)
+        return parent, next_stones[parent, hand], np.full(len(parent), self.NO_EVAL)
+
+
+def test_solver_batch_by_stones():
+    for case, ans in CASE_LIST:
+        stones = BatchStones(**case)
+        result = Solver().solve(stones)
+        ev, depth = result.state_to_params(stones.init_state)
+        assert ev == ans
+
+
+def test_solver_batch_same_as_serial():
+    case = {"init_stones": 300, "hand_list": [1, 3, 4, 7]}
+    batch_result = Solver().solve(BatchStones(**case))
+    serial_result = Solver().solve(Stones(**case))
+    for i in range(case["init_stones"] + 1):
+        state = StonesState(stones=i)
+        assert batch_result.state_to_params(state) == serial_result.state_to_params(state)
+
+
+class EncodedStones(Stones):
+    def state_encoding(self):
+        return StateEncoding(StonesState, {"stones": range(self.init_state.stones + 1)})
+
+
+def test_default_batch_hook():
+    case = {"init_stones": 30, "hand_list": [1, 3, 4, 7]}
+    game = EncodedStones(**case)
+    assert game.decode_state(game.encode_state(StonesState(stones=12))) == StonesState(stones=12)
+    codes = np.array([30, 5, 2, 0], dtype=np.uint64)
+    parent, next_code, next_res = game.find_next_states_batch(codes)
+    expected = BatchStones(**case).find_next_states_batch(codes)
+    assert parent.tolist() == expected[0].tolist()
+    assert next_code.tolist() == expected[1].tolist()
+    assert next_res.tolist() == expected[2].tolist()
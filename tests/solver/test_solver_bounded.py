@@ -0,0 +1,103 @@
+import pytest
+
+from game_analyzer import Solver
+from tests.solver.problems.graph import CASE_LIST as GRAPH_CASE_LIST
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_by_graph import Graph
+from tests.solver.test_solver_by_lrud import LRUD
+from tests.solver.test_solver_by_stones import Stones
+from tests.solver.test_solver_by_stones_hashstate import Stones as HashStones
+from tests.solver.test_solver_root_only import TicTacToe
+from tests.solver.test_solver_update import NodeState, TableGame
+
+GAME_LIST = [
+    *(Stones(**case) for case, _ in STONES_CASE_LIST[:6]),
+    *(LRUD(**case) for case, _ in LRUD_CASE_LIST[:3]),
+    TicTacToe((1, 0, 0, 0, -1, 0, 0, 0, 0)),
+    TicTacToe((1, 1, 0, -1, -1, 0, 0, 0, 0)),
+]
+
+
+def test_bounded_root_is_sound():
+    for game in GAME_LIST:
+        ev, depth = Solver().solve(game).state_to_params(game.init_state)
+        for ra_backend in ["python", "numpy"]:
+            for max_depth in range(depth + 2):
+                bounded_ev, bounded_depth = (
+                    Solver(ra_backend=ra_backend, win_eval=1)
+                    .solve(game, max_depth=max_depth)
+                    .state_to_params(game.init_state)
+                )
+                if ev != 0 and max_depth >= depth:
+                    assert (bounded_ev, bounded_depth) == (ev, depth)
+                elif bounded_depth != -1:
+                    assert bounded_ev == ev
+                    assert bounded_depth >= depth
+
+
+def test_bounded_score_game():
+    for case, _ in GRAPH_CASE_LIST:
+        game = Graph(**case)
+        expected = Solver().solve(game).state_to_params(game.init_state)
+        for ra_backend in ["python", "numpy"]:
+            for max_depth in [1, 2]:
+                result = Solver(ra_backend=ra_backend).solve(game, max_depth=max_depth)
+                assert result.state_to_params(game.init_state) == (0, -1)
+            *_, (_, result) = Solver(ra_backend=ra_backend).solve_iterative(game, 30)
+            assert result.state_to_params(game.init_state) == expected
+
+
+def test_bounded_explores_neighbourhood():
+    game = TicTacToe((0,) * 9)
+    full_solver, bounded_solver = Solver(), Solver()
+    full_solver.solve(game)
+    result = bounded_solver.solve(game, max_depth=3)
+    assert result.state_to_params(game.init_state) == (0, -1)
+    assert bounded_solver.node_size == 1 + 9 + 72 + 252
+    assert bounded_solver.node_size < full_solver.node_size
+
+
+def test_iterative_deepening_reuses_graph():
+    for game in GAME_LIST:
+        ev, depth = Solver().solve(game).state_to_params(game.init_state)
+        solver = Solver(win_eval=1)
+        bound_list = []
+        node_size_list = []
+        for bound, result in solver.solve_iterative(game, depth + 1):
+            bound_list.append(bound)
+            node_size_list.append(solver.node_size)
+            fresh_solver = Solver(win_eval=1)
+            fresh = fresh_solver.solve(game, max_depth=bound)
+            assert fresh_solver.node_size == solver.node_size
+            assert result.state_to_params(game.init_state) == fresh.state_to_params(game.init_state)
+        assert bound_list == list(range(1, len(bound_list) + 1))
+        assert node_size_list == sorted(node_size_list)
+        if ev != 0:
+            assert bound_list[-1] <= depth
+            assert result.state_to_params(game.init_state) == (ev, depth)
+
+
+def test_bounded_must_not_shrink():
+    game = TicTacToe((0,) * 9)
+    solver = Solver()
+    solver.solve(game, max_depth=2)
+    with pytest.raises(ValueError, match="must not decrease"):
+        solver.solve(game, max_depth=1)
+
+
+def test_bounded_hashstate():
+    case, _ = STONES_CASE_LIST[0]
+    with pytest.raises(TypeError):
+        Solver().solve(HashStones(**case), max_depth=3)
+
+
+def test_bounded_rejects_incremental_solves():
+    game = TableGame({0: [1], 1: [2], 2: [3]}, {3: -1})
+    solver = Solver(win_eval=1)
+    solver.solve(game, max_depth=2)
+    updated = TableGame({0: [1], 1: [2], 2: [3, 5]}, {3: -1, 5: -1})
+    with pytest.raises(ValueError, match="max_depth"):
+        solver.update(updated, added=[(NodeState(node=2), NodeState(node=5))])
+    with pytest.raises(ValueError, match="max_depth"):
+        solver.solve_lazy(game)
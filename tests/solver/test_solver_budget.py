@@ -0,0 +1,86 @@
+import pytest
+
+from game_analyzer import Solver
+from tests.solver.problems.graph import CASE_LIST as GRAPH_CASE_LIST
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_by_graph import Graph
+from tests.solver.test_solver_by_stones_hashstate import Stones as HashStones
+from tests.solver.test_solver_root_only import TicTacToe
+
+
+def assert_sound(result, solver, expected, expected_solver):
+    for digest, idx in solver._hash_dict.items():
+        ev, depth = result.eval_list[idx], result.depth_list[idx]
+        if depth == -1:
+            continue
+        expected_idx = expected_solver._hash_dict[digest]
+        assert ev == expected.eval_list[expected_idx]
+        if ev != 0:
+            assert depth >= expected.depth_list[expected_idx]
+
+
+def test_budget_partial_result():
+    game = TicTacToe((0,) * 9)
+    expected_solver = Solver()
+    expected = expected_solver.solve(game)
+    for kwargs, budget in [
+        ({"max_nodes": 1000}, "max_nodes"),
+        ({"max_edges": 2000}, "max_edges"),
+        ({"max_bytes": 100_000}, "max_bytes"),
+        ({"max_bytes": 100_000, "index": "hash"}, "max_bytes"),
+    ]:
+        for ra_backend in ["python", "numpy"]:
+            solver = Solver(ra_backend=ra_backend, **kwargs)
+            result = solver.solve(game)
+            assert result.budget_exceeded == budget
+            assert solver.node_size < expected_solver.node_size
+            assert result.state_to_params(game.init_state) == (0, -1)
+            assert_sound(result, solver, expected, expected_solver)
+    solver = Solver(max_nodes=1000)
+    solver.solve(game)
+    assert solver.node_size <= 1000 + 9
+
+
+def test_budget_score_game():
+    for case, _ in GRAPH_CASE_LIST:
+        game = Graph(**case)
+        expected_solver = Solver()
+        expected = expected_solver.solve(game)
+        for max_nodes in range(1, 6):
+            for ra_backend in ["python", "numpy"]:
+                solver = Solver(max_nodes=max_nodes, ra_backend=ra_backend)
+                result = solver.solve(game)
+                assert result.budget_exceeded == "max_nodes"
+                assert result.state_to_params(game.init_state) == (0, -1)
+                assert_sound(result, solver, expected, expected_solver)
+
+
+def test_budget_not_exceeded():
+    game = TicTacToe((1, 0, 0, 0, -1, 0, 0, 0, 0))
+    expected = Solver().solve(game)
+    result = Solver(max_nodes=10_000, max_edges=100_000, max_bytes=1 << 30).solve(game)
+    assert result.budget_exceeded is None
+    assert expected.budget_exceeded is None
+    assert result.state_to_params(game.init_state) == expected.state_to_params(game.init_state)
+
+
+def test_budget_root_only_and_bounded():
+    game = TicTacToe((0,) * 9)
+    expected_solver = Solver()
+    expected = expected_solver.solve(game)
+    solver = Solver(root_only=True, max_nodes=500)
+    result = solver.solve(game)
+    assert result.budget_exceeded == "max_nodes"
+    assert_sound(result, solver, expected, expected_solver)
+    solver = Solver(max_nodes=500)
+    bound_list = [bound for bound, _ in solver.solve_iterative(game, 9)]
+    assert bound_list == [1, 2, 3, 4]
+    assert solver.node_size <= 500 + 9
+
+
+def test_budget_unsupported():
+    with pytest.raises(ValueError, match="workers"):
+        Solver(workers=2, max_nodes=10)
+    case, _ = STONES_CASE_LIST[0]
+    with pytest.raises(TypeError):
+        Solver(max_nodes=10).solve(HashStones(**case))
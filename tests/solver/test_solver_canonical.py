@@ -0,0 +1,73 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from game_analyzer import Solver
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_batch import BatchStones
+from tests.solver.test_solver_by_stones_hashstate import Stones as HashStones
+from tests.solver.test_solver_root_only import TicTacToe, TicTacToeState
+
+ROTATE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+FLIP = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def symmetry_list():
+    perm_list = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        perm = tuple(perm[i] for i in ROTATE)
+        perm_list.extend((perm, tuple(perm[i] for i in FLIP)))
+    return perm_list
+
+
+class SymmetricTicTacToe(TicTacToe):
+    def find_mirror_states(self, state):
+        board_set = {tuple(state.board[i] for i in perm) for perm in symmetry_list()}
+        for board in board_set:
+            yield TicTacToeState(board=board, turn=state.turn)
+
+
+def all_states(limit=4):
+    for cells in itertools.product([0, 1, -1], repeat=9):
+        filled = sum(cell != 0 for cell in cells)
+        if filled <= limit and sum(cells) in {0, 1}:
+            yield TicTacToeState(board=cells, turn=1 if sum(cells) == 0 else -1)
+
+
+def test_canonical_same_as_mirror():
+    game = SymmetricTicTacToe((0,) * 9)
+    mirror_solver, canonical_solver = Solver(), Solver(canonical=True)
+    expected = mirror_solver.solve(game)
+    result = canonical_solver.solve(game)
+    assert canonical_solver.node_size == mirror_solver.node_size
+    assert len(canonical_solver._hash_dict) == canonical_solver.node_size
+    assert len(mirror_solver._hash_dict) > 4 * mirror_solver.node_size
+    state_list = list(all_states())
+    for state in state_list:
+        assert result.state_to_params(state) == expected.state_to_params(state)
+    evals, depths, found = result.lookup_many(state_list)
+    expected_evals, expected_depths, expected_found = expected.lookup_many(state_list)
+    assert np.array_equal(found, expected_found)
+    assert np.array_equal(evals, expected_evals)
+    assert np.array_equal(depths, expected_depths)
+
+
+def test_canonical_modes():
+    game = SymmetricTicTacToe((1, 0, 0, 0, -1, 0, 0, 0, 0))
+    expected = Solver().solve(game).state_to_params(game.init_state)
+    for kwargs in [{"index": "hash"}, {"ra_backend": "numpy"}, {"root_only": True}, {"workers": 2}]:
+        assert Solver(canonical=True, **kwargs).solve(game).state_to_params(game.init_state) == expected
+    ev, depth = expected
+    assert Solver(canonical=True).solve(game, max_depth=depth).state_to_params(game.init_state) == expected
+    lazy = Solver(canonical=True).solve_lazy(game)
+    assert lazy.state_to_params(TicTacToeState(board=(0, 0, 1, 0, -1, 0, 0, 0, 0), turn=1)) == expected
+
+
+def test_canonical_batch_and_hashstate():
+    case, ans = STONES_CASE_LIST[3]
+    game = BatchStones(**case)
+    assert Solver(canonical=True).solve(game).state_to_params(game.init_state)[0] == ans
+    with pytest.raises(TypeError):
+        Solver(canonical=True).solve(HashStones(**case))
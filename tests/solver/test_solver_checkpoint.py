@@ -0,0 +1,101 @@
+import pytest
+
+from game_analyzer import Solver
+from game_analyzer.solver import solver as solver_module
+from game_analyzer.solver.checkpoint import Checkpoint
+from tests.solver.test_solver_by_lrud import LRUD, LRUDState
+from tests.solver.test_solver_by_stones import Stones, StonesState
+
+CASE = {"init_stones": 300, "hand_list": [1, 3, 4, 7]}
+LRUD_CASE = {"h": 5, "w": 6, "init_cd": (2, 1), "s_list": "RLDRRUDDLRL", "t_list": "URRDRLLDLRD", "max_step": 11}
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptedStones(Stones):
+    def __init__(self, limit, **kwargs):
+        super().__init__(**kwargs)
+        self.limit = limit
+
+    def find_next_states(self, state):
+        self.limit -= 1
+        if self.limit < 0:
+            raise Interrupted
+        return super().find_next_states(state)
+
+
+class InterruptedSolver(Solver):
+    limit: int = 0
+
+    def _confirm_eval(self, start_idx):
+        self.limit -= 1
+        if self.limit < 0:
+            raise Interrupted
+        return super()._confirm_eval(start_idx)
+
+
+@pytest.fixture(autouse=True)
+def small_checkpoint_step(monkeypatch):
+    monkeypatch.setattr(solver_module, "CHECKPOINT_STEP", 7)
+
+
+def assert_same_result(result, expected):
+    assert list(result.eval_list) == list(expected.eval_list)
+    assert list(result.depth_list) == list(expected.depth_list)
+
+
+def test_checkpoint_resume_search(tmp_path):
+    expected = Solver().solve(Stones(**CASE))
+    for limit in [10, 100, 250]:
+        path = tmp_path / str(limit)
+        with pytest.raises(Interrupted):
+            Solver(checkpoint_path=str(path), checkpoint_interval=0).solve(InterruptedStones(limit, **CASE))
+        StonesState._digest_map.clear()
+        result = Solver.resume(str(path), Stones(**CASE))
+        assert_same_result(result, expected)
+        for i in range(CASE["init_stones"] + 1):
+            state = StonesState(stones=i)
+            assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+def test_checkpoint_resume_ra(tmp_path):
+    expected = Solver().solve(LRUD(**LRUD_CASE))
+    for index in ["dict", "hash"]:
+        path = tmp_path / index
+        solver = InterruptedSolver(index=index, checkpoint_path=str(path), checkpoint_interval=0)
+        solver.limit = 100
+        with pytest.raises(Interrupted):
+            solver.solve(LRUD(**LRUD_CASE))
+        result = Solver.resume(str(path), LRUD(**LRUD_CASE))
+        assert_same_result(result, expected)
+        init_state = LRUDState(r=2, c=1, step=0, turn=0)
+        assert result.state_to_params(init_state) == expected.state_to_params(init_state)
+
+
+def test_checkpoint_is_incremental(tmp_path):
+    Solver(checkpoint_path=str(tmp_path), checkpoint_interval=0).solve(Stones(**CASE))
+    edge_size = (tmp_path / "edge_src.bin").stat().st_size // 4
+    node_size = (tmp_path / "eval.bin").stat().st_size // 4
+    assert node_size == CASE["init_stones"] + 1
+    assert edge_size == sum(max(0, CASE["init_stones"] - hand + 1) for hand in CASE["hand_list"])
+
+
+def test_checkpoint_writes_each_entry_once(tmp_path):
+    Solver(checkpoint_path=str(tmp_path), checkpoint_interval=0).solve(Stones(**CASE))
+    checkpoint = Checkpoint.load(tmp_path)
+    node_size = checkpoint.size_dict["eval"]
+    name = f"{StonesState.__module__}.{StonesState.__qualname__}"
+    delta_list = [delta[name]["stones"] for delta in checkpoint._read_pickles("digest_map") if name in delta]
+    key_list = [key for delta in delta_list for key in delta]
+    assert len(key_list) == len(set(key_list)) == len(StonesState._digest_map["stones"])
+    assert sum(map(len, checkpoint._read_pickles("todo_state"))) <= node_size
+    assert 0 < checkpoint.size_dict["ra_patch"] // 5 < 3 * node_size
+
+
+def test_resume_after_finished_search(tmp_path):
+    expected = Solver().solve(Stones(**CASE))
+    Solver(checkpoint_path=str(tmp_path), checkpoint_interval=1e9, ra_backend="numpy").solve(Stones(**CASE))
+    result = Solver.resume(str(tmp_path), Stones(**CASE))
+    assert_same_result(result, expected)
@@ -0,0 +1,101 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from game_analyzer import DenseIndex, Result, Solver, StateEncoding
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_by_lrud import LRUD, LRUDState
+from tests.solver.test_solver_by_stones_hashstate import Stones as HashStones
+from tests.solver.test_solver_canonical import SymmetricTicTacToe, all_states
+
+
+class DenseLRUD(LRUD):
+    def state_encoding(self):
+        return StateEncoding.from_type(
+            LRUDState,
+            {"r": range(self.h + 2), "c": range(self.w + 2), "step": range(self.max_step + 1)},
+        )
+
+
+class DenseTicTacToe(SymmetricTicTacToe):
+    def state_encoding(self):
+        board_list = list(itertools.product([0, 1, -1], repeat=9))
+        return StateEncoding(type(self.init_state), {"board": board_list, "turn": [1, -1]})
+
+
+def test_dense_same_as_dict():
+    for case, ans in LRUD_CASE_LIST:
+        game = DenseLRUD(**case)
+        solver = Solver(index="dense")
+        result = solver.solve(game)
+        assert isinstance(solver._hash_dict, DenseIndex)
+        assert result.state_to_params(game.init_state)[0] == ans
+        expected = Solver().solve(game)
+        encoding = game.state_encoding()
+        state_list = [encoding.decode(code) for code in range(encoding.size)]
+        for state in state_list:
+            assert result.state_to_params(state) == expected.state_to_params(state)
+        evals, depths, found = result.lookup_many(state_list)
+        expected_evals, expected_depths, expected_found = expected.lookup_many(state_list)
+        assert np.array_equal(found, expected_found)
+        assert np.array_equal(evals[found], expected_evals[found])
+        assert np.array_equal(depths[found], expected_depths[found])
+
+
+def test_dense_mirror_and_canonical():
+    game = DenseTicTacToe((0,) * 9)
+    expected = Solver().solve(game)
+    for canonical in [False, True]:
+        solver = Solver(index="dense", canonical=canonical)
+        result = solver.solve(game)
+        if canonical:
+            assert len(solver._hash_dict) == solver.node_size
+        for state in all_states(3):
+            assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+def test_dense_save_load(tmp_path):
+    case, _ = LRUD_CASE_LIST[0]
+    game = DenseLRUD(**case)
+    result = Solver(index="dense").solve(game)
+    result.save(tmp_path / "lrud.bin")
+    loaded = Result.load(tmp_path / "lrud.bin")
+    assert loaded.encoding.size == game.state_encoding().size
+    encoding = game.state_encoding()
+    for state in map(encoding.decode, range(encoding.size)):
+        assert loaded.state_to_params(state) == result.state_to_params(state)
+    game = DenseTicTacToe((0,) * 9)
+    result = Solver(index="dense", canonical=True).solve(game)
+    result.save(tmp_path / "tictactoe.bin")
+    loaded = Result.load(tmp_path / "tictactoe.bin", game=game)
+    state_list = list(all_states(3))
+    assert [loaded.state_to_params(state) for state in state_list] == [
+        result.state_to_params(state) for state in state_list
+    ]
+    _, _, found = loaded.lookup_many(state_list)
+    assert found.all()
+
+
+def test_dense_index():
+    index = DenseIndex(10)
+    index[7] = 0
+    index[3] = 1
+    index[7] = 2
+    assert len(index) == 2
+    assert 7 in index
+    assert 8 not in index
+    assert index.get(11) is None
+    assert list(index.items()) == [(7, 2), (3, 1)]
+    values, found = index.get_many(np.array([3, 4, 7, 100], dtype=np.uint64))
+    assert found.tolist() == [True, False, True, False]
+    assert values[found].tolist() == [1, 2]
+    with pytest.raises(ValueError):
+        index[10] = 0
+
+
+def test_dense_hashstate():
+    case, _ = STONES_CASE_LIST[0]
+    with pytest.raises(TypeError):
+        Solver(index="dense").solve(HashStones(**case))
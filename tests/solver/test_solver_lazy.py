@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+from game_analyzer import HashState, Solver
+from tests.solver.problems.shiritori import CASE_LIST as SHIRITORI_CASE_LIST
+from tests.solver.test_solver_by_shiritori import Shiritori, ShiritoriState
+from tests.solver.test_solver_update import NodeState, TableGame, random_table
+
+
+def test_lazy_same_as_full_solve():
+    for seed in range(200):
+        rnd = random.Random(seed)
+        node_size = rnd.randrange(2, 40)
+        game = TableGame(*random_table(rnd, node_size))
+        expected = Solver().solve(game)
+        solver = Solver()
+        result = solver.solve_lazy(game)
+        assert solver.node_size == 0
+        order = list(range(1, node_size))
+        rnd.shuffle(order)
+        for node in [*order, 0]:
+            state = NodeState(node=node)
+            if expected.state_to_params(state) is not None:
+                assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+def test_lazy_shiritori_per_word():
+    for case, ans_list in SHIRITORI_CASE_LIST:
+        game = Shiritori(**case)
+        solver = Solver(index="hash")
+        result = solver.solve_lazy(game)
+        state = ShiritoriState(last=game.words[0][-3:])
+        assert result.state_to_params(state)[0] == ans_list[0]
+        first_node_size = solver.node_size
+        assert first_node_size < len({word[-3:] for word in game.words}) + 1
+        evals, _, found = result.lookup_many([ShiritoriState(last=word[-3:]) for word in game.words])
+        assert found.all()
+        assert evals.tolist() == ans_list
+        assert solver.node_size >= first_node_size
+
+
+def test_lazy_lookup_many_after_expand():
+    game = TableGame({0: [1, 2], 1: [3], 2: [], 3: []}, {})
+    result = Solver().solve_lazy(game)
+    assert result.state_to_params(NodeState(node=1)) == (1, 1)
+    evals, depths, found = result.lookup_many([NodeState(node=node) for node in range(4)])
+    assert found.all()
+    assert np.array_equal(depths, [1, 1, 0, 0])
+    assert np.array_equal(evals, [1, 1, -1, -1])
+    assert result.sgg_time > 0
+
+
+def test_lazy_hashstate():
+    class Dummy(HashState):
+        pass
+
+    class DummyGame(TableGame):
+        pass
+
+    game = DummyGame({}, {})
+    game.init_state = Dummy()
+    with pytest.raises(TypeError):
+        Solver().solve_lazy(game)
@@ -0,0 +1,99 @@
+import pytest
+
+from game_analyzer import Solver
+from game_analyzer.solver import parallel
+from tests.solver.problems.graph import CASE_LIST as GRAPH_CASE_LIST
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.shiritori import CASE1, CASE1_ANSWER, CASE3, CASE3_ANSWER
+from tests.solver.problems.stones import CASE2, CASE2_ANSWER, CASE6, CASE6_ANSWER, CASE8
+from tests.solver.test_solver_by_graph import Graph
+from tests.solver.test_solver_by_lrud import LRUD
+from tests.solver.test_solver_by_shiritori import Shiritori, ShiritoriState
+from tests.solver.test_solver_by_stones import Stones
+from tests.solver.test_solver_canonical import all_states
+from tests.solver.test_solver_dense import DenseTicTacToe
+from tests.solver.test_solver_symmetry import SeededTicTacToe, SeededTicTacToeState
+
+
+def test_parallel_by_stones():
+    for case, ans in [[CASE2, CASE2_ANSWER], [CASE6, CASE6_ANSWER]]:
+        stones = Stones(**case)
+        result = Solver(workers=3).solve(stones)
+        ev, depth = result.state_to_params(stones.init_state)
+        assert ev == ans
+
+
+def test_parallel_by_lrud():
+    for case, ans in LRUD_CASE_LIST:
+        lrud = LRUD(**case)
+        result = Solver(workers=2).solve(lrud)
+        ev, depth = result.state_to_params(lrud.init_state)
+        assert ev == ans
+
+
+def test_parallel_by_graph():
+    for case, ans in GRAPH_CASE_LIST:
+        graph = Graph(**case)
+        result = Solver(workers=2).solve(graph)
+        ev, depth = result.state_to_params(graph.init_state)
+        assert ev == ans
+
+
+def test_parallel_by_shiritori():
+    for case, ans_list in [[CASE1, CASE1_ANSWER], [CASE3, CASE3_ANSWER]]:
+        shiritori = Shiritori(**case)
+        result = Solver(workers=2).solve(shiritori)
+        for i in range(len(shiritori.words)):
+            ev, depth = result.state_to_params(ShiritoriState(shiritori.words[i][-3:]))
+            assert ev == ans_list[i]
+
+
+def test_parallel_same_as_serial():
+    stones = Stones(**CASE8)
+    serial = Solver()
+    serial.solve(stones)
+    parallel = Solver(workers=4)
+    parallel.solve(stones)
+    assert parallel.node_size == serial.node_size
+    assert parallel._graph_inv.edge_size == serial._graph_inv.edge_size
+    for i in range(CASE8["init_stones"] + 1):
+        state = type(stones.init_state)(stones=i)
+        idx, serial_idx = parallel._hash_dict[state.digest], serial._hash_dict[state.digest]
+        assert parallel._eval_list[idx] == serial._eval_list[serial_idx]
+        assert parallel._depth_list[idx] == serial._depth_list[serial_idx]
+
+
+def test_parallel_shared_keys():
+    game = DenseTicTacToe((0,) * 9)
+    expected_solver = Solver()
+    expected = expected_solver.solve(game)
+    for canonical in [False, True]:
+        solver = Solver(index="dense", canonical=canonical, workers=3)
+        result = solver.solve(game)
+        assert solver.node_size == expected_solver.node_size
+        for state in all_states(3):
+            assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+class BrokenStones(Stones):
+    def find_next_states(self, state):
+        if state.stones == 1:
+            raise RuntimeError("broken")
+        return super().find_next_states(state)
+
+
+def test_parallel_worker_error():
+    with pytest.raises(RuntimeError, match="broken"):
+        Solver(workers=2).solve(BrokenStones(**CASE2))
+
+
+def test_parallel_without_fork(monkeypatch):
+    monkeypatch.setattr(parallel.mp, "get_all_start_methods", lambda: ["spawn"])
+    with pytest.raises(ValueError, match="digest_seed"):
+        Solver(workers=2).solve(Stones(**CASE2))
+    game = SeededTicTacToe((0,) * 9)
+    expected = Solver().solve(game)
+    result = Solver(workers=2).solve(game)
+    for state in all_states(3):
+        seeded_state = SeededTicTacToeState(board=state.board, turn=state.turn)
+        assert result.state_to_params(seeded_state) == expected.state_to_params(seeded_state)
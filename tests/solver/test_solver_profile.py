@@ -0,0 +1,32 @@
+import pytest
+
+from game_analyzer import Solver
+from tests.solver.test_solver_root_only import TicTacToe
+from tests.solver.test_solver_time import Stones
+
+
+def test_profile_attributes_callbacks():
+    game = Stones(init_stones=3000, hand_list=list(range(1, 50)))
+    solver = Solver(profile=True)
+    result = solver.solve(game)
+    profile = result.profile
+    assert profile["find_next_states"]["calls"] == solver.node_size
+    assert profile["find_mirror_states"]["calls"] == solver.node_size
+    assert profile["evaluate_state"]["calls"] == solver.node_size - 1
+    assert profile["register_state"]["calls"] == solver.node_size
+    assert profile["ra"]["calls"] == solver.node_size
+    assert "calls" not in profile.get("digest", {})
+    total = sum(entry["time"] for entry in profile.values())
+    assert total == pytest.approx(result.sgg_time + result.ra_time)
+    assert sum(entry["samples"] for entry in profile.values()) > 0
+    assert "find_next_states" not in vars(game)
+
+
+def test_profile_bounded_and_disabled():
+    game = TicTacToe((0,) * 9)
+    assert Solver().solve(game).profile is None
+    result = Solver(profile=True).solve(game, max_depth=3)
+    assert result.profile["find_next_states"]["calls"] >= 1 + 9 + 72
+    assert result.profile["register_state"]["calls"] == 1 + 9 + 72 + 252
+    with pytest.raises(ValueError, match="profile"):
+        Solver(profile=True, workers=2)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+
+from game_analyzer import Game, Solver, State
+from tests.solver.problems.graph import CASE_LIST as GRAPH_CASE_LIST
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.shiritori import CASE_LIST as SHIRITORI_CASE_LIST
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_by_graph import Graph
+from tests.solver.test_solver_by_lrud import LRUD
+from tests.solver.test_solver_by_shiritori import Shiritori
+from tests.solver.test_solver_by_stones import Stones
+from tests.solver.test_solver_by_stones_hashstate import Stones as HashStones
+
+LINE_LIST = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+
+@dataclass
+class TicTacToeState(State):
+    board: tuple
+    turn: int
+
+
+class TicTacToe(Game):
+    def __init__(self, board):
+        self.init_state = TicTacToeState(board=board, turn=1)
+        self.default_eval = 0
+
+    def find_next_states(self, state):
+        for i, cell in enumerate(state.board):
+            if cell == 0:
+                board = list(state.board)
+                board[i] = state.turn
+                yield TicTacToeState(board=tuple(board), turn=-state.turn)
+
+    def find_mirror_states(self, state):
+        yield state
+
+    def evaluate_state(self, state):
+        for a, b, c in LINE_LIST:
+            if state.board[a] != 0 and state.board[a] == state.board[b] == state.board[c]:
+                return -1
+        return None
+
+
+def assert_same_root(game, **kwargs):
+    expected = Solver().solve(game).state_to_params(game.init_state)
+    for ra_backend in ["python", "numpy"]:
+        result = Solver(root_only=True, ra_backend=ra_backend, **kwargs).solve(game)
+        assert result.state_to_params(game.init_state) == expected
+
+
+def test_root_only_same_as_full_solve():
+    for case, _ in STONES_CASE_LIST:
+        assert_same_root(Stones(**case))
+    for case, _ in LRUD_CASE_LIST:
+        assert_same_root(LRUD(**case))
+    for case, _ in SHIRITORI_CASE_LIST:
+        assert_same_root(Shiritori(**case))
+
+
+def test_root_only_score_game():
+    for case, _ in GRAPH_CASE_LIST:
+        assert_same_root(Graph(**case))
+        assert_same_root(Graph(**case), win_eval=max(case["point_list"]))
+    game = Graph(**GRAPH_CASE_LIST[0][0])
+    assert Solver(root_only=True).solve(game).state_to_params(game.init_state) == (2, 3)
+
+
+def test_root_only_hashstate():
+    for case, ans in STONES_CASE_LIST[:4]:
+        stones = HashStones(**case)
+        ev, depth = Solver(root_only=True).solve(stones).state_to_params(stones.init_state)
+        assert ev == ans
+
+
+def test_root_only_cuts_siblings():
+    for board in [(0,) * 9, (1, 0, 0, 0, -1, 0, 0, 0, 0), (1, 1, 0, -1, -1, 0, 0, 0, 0)]:
+        game = TicTacToe(board)
+        full_solver, root_solver = Solver(), Solver(root_only=True, win_eval=1)
+        expected = full_solver.solve(game).state_to_params(game.init_state)
+        assert root_solver.solve(game).state_to_params(game.init_state) == expected
+        assert root_solver.node_size < full_solver.node_size
+    assert root_solver.node_size == 2
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+from game_analyzer import BoardSymmetry, Solver
+from tests.solver.test_solver_canonical import SymmetricTicTacToe, all_states
+from tests.solver.test_solver_root_only import TicTacToe, TicTacToeState
+
+
+class BoardSymmetricTicTacToe(TicTacToe):
+    def __init__(self, board):
+        super().__init__(board)
+        self.symmetry = BoardSymmetry.dihedral("board", 3, 3)
+
+    def find_mirror_states(self, state):
+        return self.symmetry.mirror_states(state)
+
+
+@dataclass
+class SeededTicTacToeState(TicTacToeState):
+    digest_seed: ClassVar[int] = 3
+
+
+class SeededTicTacToe(BoardSymmetricTicTacToe):
+    def __init__(self, board):
+        super().__init__(board)
+        self.init_state = SeededTicTacToeState(board=board, turn=1)
+
+    def find_next_states(self, state):
+        for next_state in super().find_next_states(state):
+            yield SeededTicTacToeState(board=next_state.board, turn=next_state.turn)
+
+
+def test_symmetry_same_as_mirror_states():
+    expected_solver = Solver()
+    expected = expected_solver.solve(SymmetricTicTacToe((0,) * 9))
+    game = BoardSymmetricTicTacToe((0,) * 9)
+    for kwargs in [{}, {"canonical": True}, {"ra_backend": "numpy"}, {"workers": 2}]:
+        solver = Solver(**kwargs)
+        result = solver.solve(game)
+        assert solver.node_size == expected_solver.node_size
+        for state in all_states(3):
+            assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+def test_seeded_symmetry():
+    expected = Solver().solve(SymmetricTicTacToe((0,) * 9))
+    game = SeededTicTacToe((0,) * 9)
+    for kwargs in [{}, {"canonical": True}, {"workers": 2}, {"workers": 2, "canonical": True}]:
+        result = Solver(**kwargs).solve(game)
+        for state in all_states(3):
+            seeded_state = SeededTicTacToeState(board=state.board, turn=state.turn)
+            assert result.state_to_params(seeded_state) == expected.state_to_params(state)
+    assert not SeededTicTacToeState._digest_map
+
+
+def test_profile_with_symmetry():
+    result = Solver(profile=True).solve(BoardSymmetricTicTacToe((0,) * 9))
+    assert result.profile["register_state"]["calls"] > 0
+    assert "calls" not in result.profile.get("digest", {})
@@ -0,0 +1,70 @@
+import json
+import logging
+
+from game_analyzer import Solver
+from game_analyzer.solver import JsonlSink, LogSink, PrometheusSink
+from tests.solver.test_solver_by_stones import Stones
+from tests.solver.test_solver_root_only import TicTacToe
+
+
+def test_observer_reports_both_phases():
+    game = TicTacToe((0,) * 9)
+    for ra_backend in ["python", "numpy"]:
+        progress_list = []
+        solver = Solver(ra_backend=ra_backend, observer=progress_list.append, observe_nodes=1000)
+        solver.solve(game)
+        phase_list = [progress.phase for progress in progress_list]
+        assert phase_list[0] == "search"
+        assert phase_list[-1] == "ra"
+        search_list = [progress for progress in progress_list if progress.phase == "search"]
+        assert len(search_list) >= 2
+        assert search_list[-1].nodes == solver.node_size
+        assert search_list[-1].edges == solver._graph_inv.edge_size
+        assert progress_list[-1].edges == solver._graph_inv.edge_size
+        assert all(progress.rss >= 0 for progress in progress_list)
+
+
+def test_observer_bounded_layers():
+    progress_list = []
+    game = TicTacToe((0,) * 9)
+    solver = Solver(observer=progress_list.append, observe_nodes=0)
+    solver.solve(game, max_depth=4)
+    assert [progress.frontier for progress in progress_list if progress.phase == "search"][:2] == [9, 72]
+
+
+def test_sinks(tmp_path, caplog):
+    game = TicTacToe((1, 0, 0, 0, -1, 0, 0, 0, 0))
+    jsonl_path = tmp_path / "progress.jsonl"
+    prom_path = tmp_path / "progress.prom"
+    jsonl_sink, prom_sink, log_sink = JsonlSink(jsonl_path), PrometheusSink(prom_path), LogSink()
+
+    def observer(progress):
+        jsonl_sink(progress)
+        prom_sink(progress)
+        log_sink(progress)
+
+    with caplog.at_level(logging.INFO, logger="game_analyzer.solver"):
+        solver = Solver(observer=observer)
+        solver.solve(game)
+    record_list = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert [record["phase"] for record in record_list] == ["search", "ra"]
+    assert record_list[-1]["nodes"] == solver.node_size
+    text = prom_path.read_text()
+    assert f'game_analyzer_nodes{{phase="ra"}} {solver.node_size}' in text
+    assert "# TYPE game_analyzer_rss gauge" in text
+    assert len(caplog.records) == 2
+    assert caplog.records[0].getMessage().startswith("search")
+
+
+def test_ra_processed_counts_confirmed_nodes():
+    game = Stones(init_stones=20000, hand_list=[1, 3, 4])
+    pair_list = []
+
+    def observer(progress):
+        if progress.phase == "ra":
+            pair_list.append((progress.processed, solver._confirmed_list.count(1)))
+
+    solver = Solver(observer=observer, observe_nodes=0)
+    solver.solve(game)
+    assert len(pair_list) >= 2
+    assert all(processed == confirmed for processed, confirmed in pair_list)
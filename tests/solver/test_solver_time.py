@@ -1,6 +1,7 @@
-from game_analyzer import State, Game, Solver
+from game_analyzer import FrozenState, State, Game, Solver
 from dataclasses import dataclass
 from tests.solver.problems.stones import CASE_LIST
+from tests.solver.test_solver_batch import BatchStones
 
 
 @dataclass
@@ -79,3 +80,43 @@ def test_solver_time():
     solver = Solver()
     result = solver.solve(stones)
     ev, depth = result.state_to_params(stones.init_state)
+
+
+# 0.38 s
+def test_solver_batch_time():
+    stones = BatchStones(init_stones=20000, hand_list=list(range(1, 100)))
+    solver = Solver()
+    result = solver.solve(stones)
+    ev, depth = result.state_to_params(stones.init_state)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenStonesState(FrozenState):
+    stones: int
+
+
+class FrozenStones(Stones):
+    def __init__(self, init_stones, hand_list):
+        super().__init__(init_stones, hand_list)
+        self.init_state = FrozenStonesState(stones=init_stones)
+
+    def find_next_states(self, state):
+        for hand in self.hand_list:
+            next_stones = state.stones - hand
+            if next_stones >= 0:
+                yield FrozenStonesState(stones=next_stones)
+
+
+def test_find_next_states_with_frozen_digest_time():
+    stones = FrozenStones(init_stones=20000, hand_list=list(range(1, 100)))
+    for i in range(20000):
+        state = FrozenStonesState(stones=i)
+        for s in stones.find_next_states(state):
+            s.digest
+
+
+def test_solver_frozen_time():
+    stones = FrozenStones(init_stones=20000, hand_list=list(range(1, 100)))
+    solver = Solver()
+    result = solver.solve(stones)
+    ev, depth = result.state_to_params(stones.init_state)
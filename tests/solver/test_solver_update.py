@@ -0,0 +1,129 @@
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from game_analyzer import Game, Solver, State
+from tests.solver.problems.shiritori import CASE_LIST as SHIRITORI_CASE_LIST
+from tests.solver.test_solver_by_shiritori import Shiritori, ShiritoriState
+
+
+@dataclass
+class NodeState(State):
+    node: int
+
+
+class TableGame(Game):
+    def __init__(self, child_dict, eval_dict):
+        self.child_dict = child_dict
+        self.eval_dict = eval_dict
+        self.init_state = NodeState(node=0)
+        self.default_eval = -1
+
+    def find_next_states(self, state):
+        for child in self.child_dict.get(state.node, []):
+            yield NodeState(node=child)
+
+    def find_mirror_states(self, state):
+        yield state
+
+    def evaluate_state(self, state):
+        return self.eval_dict.get(state.node)
+
+
+def random_table(rnd, node_size):
+    child_dict = {node: [rnd.randrange(node_size) for _ in range(rnd.randrange(4))] for node in range(node_size)}
+    eval_dict = {node: rnd.choice([-1, 0, 1]) for node in range(1, node_size) if rnd.random() < 0.15}
+    return child_dict, eval_dict
+
+
+def assert_same_as_full_solve(result, game, node_size):
+    expected = Solver().solve(game)
+    for node in range(node_size):
+        state = NodeState(node=node)
+        if expected.state_to_params(state) is not None:
+            assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+def test_update_same_as_full_solve():
+    for seed in range(200):
+        rnd = random.Random(seed)
+        node_size = rnd.randrange(2, 40)
+        child_dict, eval_dict = random_table(rnd, node_size)
+        solver = Solver()
+        solver.solve(TableGame(child_dict, eval_dict))
+        for _ in range(3):
+            added, removed, evaluated = [], [], []
+            for _ in range(rnd.randrange(1, 4)):
+                parent = rnd.randrange(node_size)
+                if NodeState(node=parent).digest not in solver._hash_dict or parent in eval_dict:
+                    continue
+                action = rnd.randrange(3)
+                if action == 0 and child_dict[parent]:
+                    child = child_dict[parent].pop(rnd.randrange(len(child_dict[parent])))
+                    child_dict[parent] = [c for c in child_dict[parent] if c != child]
+                    removed.append((NodeState(node=parent), NodeState(node=child)))
+                elif action == 1:
+                    child = rnd.randrange(node_size + 10)
+                    if child not in child_dict:
+                        child_dict[child] = [rnd.randrange(node_size + 10) for _ in range(2)]
+                        for grandchild in child_dict[child]:
+                            child_dict.setdefault(grandchild, [])
+                    child_dict[parent].append(child)
+                    added.append((NodeState(node=parent), NodeState(node=child)))
+                elif parent != 0:
+                    eval_dict[parent] = rnd.choice([-1, 0, 1])
+                    evaluated.append((NodeState(node=parent), eval_dict[parent]))
+            game = TableGame(child_dict, eval_dict)
+            result = solver.update(game, added=added, removed=removed, evaluated=evaluated)
+            assert_same_as_full_solve(result, game, max(child_dict) + 1)
+
+
+def test_update_terminal_to_internal():
+    child_dict = {0: [1, 2], 1: [], 2: [3], 3: []}
+    eval_dict = {2: 1}
+    solver = Solver()
+    solver.solve(TableGame(child_dict, eval_dict))
+    del eval_dict[2]
+    game = TableGame(child_dict, eval_dict)
+    result = solver.update(game, evaluated=[(NodeState(node=2), None)])
+    assert_same_as_full_solve(result, game, 4)
+
+
+def test_update_draw_depth_follows_full_solve():
+    for index in ["dict", "hash"]:
+        child_dict = {0: [1], 1: [2], 2: []}
+        solver = Solver(index=index)
+        solver.solve(TableGame(child_dict, {2: 0}))
+        child_dict[0].append(2)
+        game = TableGame(child_dict, {2: 0})
+        result = solver.update(game, added=[(NodeState(node=0), NodeState(node=2))])
+        assert result.state_to_params(NodeState(node=0)) == (0, 1)
+        assert_same_as_full_solve(result, game, 3)
+
+
+def test_update_shiritori_add_word():
+    for case, _ in SHIRITORI_CASE_LIST:
+        words = case["words"]
+        solver = Solver()
+        solver.solve(Shiritori(words=words[:-1]))
+        game = Shiritori(words=words)
+        new_last = words[-1][-3:]
+        added = [(ShiritoriState(last=-1), ShiritoriState(last=new_last))]
+        added += [
+            (ShiritoriState(last=word[-3:]), ShiritoriState(last=new_last))
+            for word in {w[-3:] for w in words[:-1]}
+            if word == words[-1][:3]
+        ]
+        result = solver.update(game, added=added)
+        expected = Solver().solve(game)
+        for word in words:
+            state = ShiritoriState(last=word[-3:])
+            assert result.state_to_params(state) == expected.state_to_params(state)
+
+
+def test_update_unknown_state():
+    solver = Solver()
+    solver.solve(TableGame({0: [1]}, {1: 1}))
+    with pytest.raises(ValueError, match="unknown state"):
+        solver.update(TableGame({0: [1]}, {1: 1}), removed=[(NodeState(node=5), NodeState(node=1))])
@@ -0,0 +1,78 @@
+from array import array
+
+from game_analyzer import Solver
+from game_analyzer.solver.graph import EdgeList
+from game_analyzer.solver.mapped_array import MappedArray
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.shiritori import CASE1, CASE1_ANSWER
+from tests.solver.problems.stones import CASE2, CASE2_ANSWER
+from tests.solver.test_solver_batch import BatchStones
+from tests.solver.test_solver_by_lrud import LRUD
+from tests.solver.test_solver_by_shiritori import Shiritori, ShiritoriState
+from tests.solver.test_solver_by_stones import Stones, StonesState
+
+
+def test_mapped_array(tmp_path):
+    values = MappedArray(tmp_path / "values.bin", "i", chunk_size=4)
+    for i in range(10):
+        values.append(-i)
+    values.extend([10, 11])
+    values[0] = 5
+    assert len(values) == 12
+    assert list(values) == [5, -1, -2, -3, -4, -5, -6, -7, -8, -9, 10, 11]
+    assert values[-1] == 11
+    assert list(values[2:4]) == [-2, -3]
+    values[:] = array("i", range(12))
+    assert list(values) == list(range(12))
+    del values[3]
+    del values[-1]
+    del values[::4]
+    assert list(values) == [1, 2, 4, 6, 7, 8, 10]
+    del values[:]
+    assert len(values) == 0
+
+
+def test_freeze_to_mapped_array(tmp_path):
+    edge_list = EdgeList(MappedArray(tmp_path / "src.bin", "I"), MappedArray(tmp_path / "dst.bin", "I"))
+    edge_list.append(2, 0)
+    edge_list.append(1, 0)
+    edge_list.append(2, 1)
+    graph = edge_list.freeze(
+        3, MappedArray(tmp_path / "offset.bin", "Q"), MappedArray(tmp_path / "target.bin", "I"), chunk_size=2
+    )
+    assert [list(graph[idx]) for idx in range(3)] == [[], [0], [0, 1]]
+
+
+def test_workdir_by_stones(tmp_path):
+    stones = Stones(**CASE2)
+    result = Solver(workdir=str(tmp_path)).solve(stones)
+    ev, depth = result.state_to_params(stones.init_state)
+    assert ev == CASE2_ANSWER
+    assert (tmp_path / "graph_target.bin").exists()
+
+
+def test_workdir_by_shiritori(tmp_path):
+    shiritori = Shiritori(**CASE1)
+    result = Solver(workdir=str(tmp_path)).solve(shiritori)
+    for word, ans in zip(shiritori.words, CASE1_ANSWER, strict=True):
+        ev, depth = result.state_to_params(ShiritoriState(word[-3:]))
+        assert ev == ans
+
+
+def test_workdir_same_as_memory(tmp_path):
+    for i, (case, _) in enumerate(LRUD_CASE_LIST):
+        memory_result = Solver().solve(LRUD(**case))
+        for ra_backend in ["python", "numpy"]:
+            workdir = tmp_path / f"{i}_{ra_backend}"
+            mapped_result = Solver(workdir=str(workdir), ra_backend=ra_backend).solve(LRUD(**case))
+            assert list(mapped_result.eval_list) == list(memory_result.eval_list)
+            assert list(mapped_result.depth_list) == list(memory_result.depth_list)
+
+
+def test_workdir_batch(tmp_path):
+    case = {"init_stones": 300, "hand_list": [1, 3, 4, 7]}
+    mapped_result = Solver(workdir=str(tmp_path)).solve(BatchStones(**case))
+    memory_result = Solver().solve(Stones(**case))
+    for i in range(case["init_stones"] + 1):
+        state = StonesState(stones=i)
+        assert mapped_result.state_to_params(state) == memory_result.state_to_params(state)
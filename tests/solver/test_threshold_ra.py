@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from game_analyzer import Solver
+from game_analyzer.solver.threshold_ra import ThresholdRetrogradeAnalyzer
+from tests.solver.problems.graph import CASE_LIST as GRAPH_CASE_LIST
+from tests.solver.problems.lrud import CASE_LIST as LRUD_CASE_LIST
+from tests.solver.problems.stones import CASE2, CASE6
+from tests.solver.test_numpy_ra import build_random_solver
+from tests.solver.test_solver_by_graph import Graph
+from tests.solver.test_solver_by_lrud import LRUD
+from tests.solver.test_solver_by_stones import Stones
+
+
+def test_same_as_python_on_random_graphs():
+    for seed in range(400):
+        node_size = random.Random(seed).randrange(2, 100)
+        value_list = [[-1, 1], [-1, 0, 1], list(range(-5, 6)), list(range(-500, 501, 37))][seed % 4]
+        python_solver = build_random_solver(seed, node_size, value_list, "python")
+        threshold_solver = build_random_solver(seed, node_size, value_list, "threshold")
+        python_solver._retrograde_analyze()
+        threshold_solver._retrograde_analyze()
+        assert python_solver._eval_list == threshold_solver._eval_list
+        assert python_solver._depth_list == threshold_solver._depth_list
+
+
+def test_pass_count_is_logarithmic():
+    solver = build_random_solver(0, 2000, list(range(-1000, 1001)), "threshold")
+    analyzer = ThresholdRetrogradeAnalyzer(
+        solver._graph_inv,
+        solver._eval_list,
+        solver._depth_list,
+        solver._child_count_list,
+    )
+    analyzer.run()
+    assert analyzer.pass_count <= 12
+
+
+def test_same_as_python_by_problems():
+    game_list = [Stones(**CASE2), Stones(**CASE6)]
+    game_list += [LRUD(**case) for case, _ in LRUD_CASE_LIST]
+    game_list += [Graph(**case) for case, _ in GRAPH_CASE_LIST]
+    for game in game_list:
+        expected = Solver().solve(game)
+        result = Solver(ra_backend="threshold").solve(game)
+        assert list(result.eval_list) == list(expected.eval_list)
+        assert list(result.depth_list) == list(expected.depth_list)
+
+
+def test_unsupported_options():
+    with pytest.raises(ValueError):
+        Solver(ra_backend="threshold", root_only=True)
+    with pytest.raises(ValueError):
+        Solver(ra_backend="threshold", max_nodes=10)
+    with pytest.raises(ValueError):
+        Solver(ra_backend="threshold").solve(Stones(**CASE2), max_depth=3)
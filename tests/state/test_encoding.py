@@ -0,0 +1,65 @@
+import enum
+import itertools
+from dataclasses import dataclass
+from typing import Annotated, Literal
+
+import pytest
+
+from game_analyzer import FrozenState, State, StateEncoding
+
+
+class Color(enum.Enum):
+    RED = 1
+    BLUE = 2
+
+
+@dataclass
+class TypedState(State):
+    r: Annotated[int, range(-1, 4)]
+    turn: Literal[0, 1]
+    confirm: bool
+    color: Color
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenTypedState(FrozenState):
+    position: Annotated[int, range(10)]
+    turn: bool
+
+
+def test_roundtrip_from_annotations():
+    encoding = StateEncoding.from_type(TypedState)
+    assert encoding.size == 5 * 2 * 2 * 2
+    code_list = []
+    for r, turn, confirm, color in itertools.product(range(-1, 4), [0, 1], [False, True], Color):
+        state = TypedState(r, turn, confirm, color)
+        code = encoding.encode(state)
+        assert encoding.decode(code) == state
+        code_list.append(code)
+    assert sorted(code_list) == list(range(encoding.size))
+
+
+def test_frozen_state_and_spec():
+    encoding = StateEncoding.from_type(FrozenTypedState, {"position": range(3, 6)})
+    assert encoding.size == 6
+    state = encoding.decode(encoding.encode(FrozenTypedState(4, True)))
+    assert state == FrozenTypedState(4, True)
+    assert state.digest == FrozenTypedState(4, True).digest
+
+
+def test_errors():
+    encoding = StateEncoding.from_type(TypedState)
+    with pytest.raises(ValueError):
+        encoding.encode(TypedState(4, 0, False, Color.RED))
+    with pytest.raises(ValueError):
+        encoding.encode(TypedState(0, 2, False, Color.RED))
+    with pytest.raises(ValueError):
+        encoding.decode(encoding.size)
+
+    @dataclass
+    class UntypedState(State):
+        x: int
+
+    with pytest.raises(TypeError):
+        StateEncoding.from_type(UntypedState)
+    assert StateEncoding.from_type(UntypedState, {"x": [10, 20]}).encode(UntypedState(20)) == 1
@@ -0,0 +1,74 @@
+import dataclasses
+import pickle
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from game_analyzer import FrozenState
+from game_analyzer.state.state import dump_digest_maps, merge_digest_maps
+
+
+@pytest.fixture
+def fixed_random_seed():
+    state = random.getstate()
+    random.seed(0)
+    yield
+    random.setstate(state)
+
+
+@dataclass(frozen=True, slots=True)
+class Point(FrozenState):
+    r: int
+    c: int
+    turn: bool = False
+
+
+def test_digest_is_cached(fixed_random_seed):
+    p1 = Point(1, 2)
+    assert p1.digest == Point(1, 2).digest
+    assert p1.digest != Point(2, 1).digest
+    assert p1.digest != Point(1, 2, True).digest
+    assert p1.digest == Point._digest_map["r"][1] ^ Point._digest_map["c"][2] ^ Point._digest_map["turn"][False]
+
+
+def test_slots_and_immutable():
+    p = Point(1, 2)
+    assert not hasattr(p, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        p.r = 3
+    assert p == Point(1, 2)
+    assert hash(p) == hash(Point(1, 2))
+    assert p.to_dict() == {"r": 1, "c": 2, "turn": False}
+
+
+def test_replace_and_pickle():
+    p = Point(1, 2)
+    assert dataclasses.replace(p, r=5).digest == Point(5, 2).digest
+    q = pickle.loads(pickle.dumps(p))
+    assert q == p
+    assert q.digest == p.digest
+
+
+def test_merge_digest_maps_rebinds_tables():
+    p = Point(3, 4)
+    saved = pickle.loads(pickle.dumps(dump_digest_maps()))
+    name = f"{Point.__module__}.{Point.__qualname__}"
+    saved[name]["r"][-7] = 12345
+    merge_digest_maps(saved)
+    assert Point(-7, 4).digest == 12345 ^ Point._digest_map["c"][4] ^ Point._digest_map["turn"][False]
+    saved[name]["r"][3] ^= 1
+    with pytest.raises(ValueError, match="conflict"):
+        merge_digest_maps(saved)
+    assert Point(3, 4).digest == p.digest
+    with pytest.raises(ValueError, match="unknown"):
+        merge_digest_maps({"missing.State": {}})
+
+
+def test_subclass_adds_fields():
+    @dataclass(frozen=True, slots=True)
+    class Point3(Point):
+        h: int = 0
+
+    assert Point3._field_list == ("r", "c", "turn", "h")
+    assert Point3(1, 2, False, 1).digest != Point3(1, 2, False, 0).digest
@@ -0,0 +1,150 @@
+import enum
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import ClassVar
+
+import pytest
+
+from game_analyzer import FrozenState, HashState, Solver, State
+from game_analyzer.state.hashing import field_seed, obj_digest, value_digest, value_digests
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_by_stones import Stones
+
+
+class Color(enum.Enum):
+    RED = 1
+    BLUE = 2
+
+
+@dataclass(frozen=True)
+class Point:
+    x: int
+    y: int
+
+
+@dataclass
+class SeededState(State):
+    digest_seed: ClassVar[int] = 7
+    pos: int
+    name: str
+    board: list
+
+
+@dataclass
+class SeededHashState(HashState):
+    digest_seed: ClassVar[int] = 7
+    pos: int
+    name: str
+    board: list
+
+
+@dataclass(frozen=True, slots=True)
+class SeededFrozenState(FrozenState):
+    digest_seed: ClassVar[int] = 7
+    pos: int
+    name: str
+
+
+@dataclass
+class OtherSeedState(State):
+    digest_seed: ClassVar[int] = 8
+    pos: int
+    name: str
+    board: list
+
+
+def test_seeded_digest_has_no_table():
+    state = SeededState(3, "a", [1, [2, 3]])
+    assert state.digest == SeededState(3, "a", [1, [2, 3]]).digest
+    assert state.digest != SeededState(3, "a", [1, [3, 2]]).digest
+    assert state.digest != OtherSeedState(3, "a", [1, [2, 3]]).digest
+    assert state.digest < 1 << 60
+    assert not SeededState._digest_map
+
+
+def test_seeded_classes_agree():
+    state = SeededState(3, "a", [1, [2, 3]])
+    hash_state = SeededHashState(3, "a", [1, [2, 3]])
+    assert hash_state.digest == state.digest
+    hash_state.board[1][0] = 5
+    hash_state.pos = 4
+    assert hash_state.digest == SeededState(4, "a", [1, [5, 3]]).digest
+    assert not SeededHashState._digest_map
+    frozen = SeededFrozenState(3, "a")
+    assert frozen.digest == value_digest(field_seed(7, "pos"), 3, 60) ^ value_digest(field_seed(7, "name"), "a", 60)
+    assert not SeededFrozenState._digest_map
+
+
+def test_value_digests_match_scalar():
+    seed = field_seed(7, "x")
+    for column in [
+        [0, -1, 5, 2**63 - 1, -(2**63)],
+        [2**63, 2**70, -(2**70), 1],
+        [True, 1, 1.0, 1.5, None, "1", b"1", (1, "1"), Color.RED, frozenset({1, 2})],
+    ]:
+        expected = [obj_digest(seed, value, 60) for value in column]
+        assert value_digests(seed, column, 60).tolist() == expected
+    assert value_digest(seed, True, 60) == value_digest(seed, 1.0, 60)
+    assert len({value_digest(seed, value, 60) for value in [1, 1.5, None, "1", b"1", (1,), Color.RED]}) == 7
+
+
+def test_seeded_digest_rejects_unstable_values():
+    with pytest.raises(TypeError, match="object"):
+        SeededState(3, object(), []).digest
+    with pytest.raises(TypeError, match="object"):
+        State.digest_many([SeededState(3, "a", []), SeededState(3, object(), [])])
+    with pytest.raises(TypeError, match="Point"):
+        SeededFrozenState(3, Point(1, 2))
+
+
+def test_digest_many_seeded():
+    states = [SeededState(i % 5, str(i % 3), []) for i in range(20)]
+    assert State.digest_many(states).tolist() == [state.digest for state in states]
+    states = [SeededState(i, "a", [i]) for i in range(3)]
+    assert State.digest_many(states).tolist() == [state.digest for state in states]
+
+
+@pytest.mark.parametrize("hash_seed", ["0", "1"])
+def test_digest_stable_across_processes(hash_seed):
+    code = (
+        "from tests.state.test_hashing import SeededState, SeededFrozenState;"
+        "print(SeededState(3, 'a', [1, [2, 'b']]).digest, SeededFrozenState(3, 'a').digest)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={"PYTHONHASHSEED": hash_seed, "PYTHONPATH": ":".join(sys.path)},
+    ).stdout.split()
+    assert [int(value) for value in output] == [
+        SeededState(3, "a", [1, [2, "b"]]).digest,
+        SeededFrozenState(3, "a").digest,
+    ]
+
+
+@dataclass
+class SeededStonesState(State):
+    digest_seed: ClassVar[int] = 0
+    stones: int
+
+
+class SeededStones(Stones):
+    def __init__(self, init_stones, hand_list):
+        super().__init__(init_stones, hand_list)
+        self.init_state = SeededStonesState(init_stones)
+
+    def find_next_states(self, state):
+        for hand in self.hand_list:
+            if state.stones >= hand:
+                yield SeededStonesState(state.stones - hand)
+
+
+def test_seeded_solve():
+    for case, ans in STONES_CASE_LIST[:3]:
+        game = SeededStones(**case)
+        for kwargs in [{}, {"workers": 2}]:
+            result = Solver(**kwargs).solve(game)
+            assert result.state_to_params(game.init_state)[0] == ans
+    assert not SeededStonesState._digest_map
@@ -0,0 +1,115 @@
+import random
+from dataclasses import dataclass
+from typing import ClassVar
+
+import numpy as np
+import pytest
+
+from game_analyzer import BoardSymmetry, FrozenState, HashState, State
+
+
+@pytest.fixture
+def fixed_random_seed():
+    random.seed(0)
+
+
+@dataclass
+class BoardState(State):
+    board: object
+    turn: int
+
+
+@dataclass
+class SeededBoardState(State):
+    digest_seed: ClassVar[int] = 11
+    board: object
+    turn: int
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenBoardState(FrozenState):
+    board: object
+    turn: int
+
+
+@dataclass
+class BoardHashState(HashState):
+    board: object
+    turn: int
+
+
+@dataclass
+class CustomDigestState(BoardState):
+    @property
+    def digest(self):
+        return hash(self.board) & ((1 << 60) - 1)
+
+
+def random_board(size, rng):
+    return rng.integers(-1, 2, size).tolist()
+
+
+def assert_same_as_mirror_states(symmetry, state):
+    assert symmetry.mirror_digests(state) == [mirror_state.digest for mirror_state in symmetry.mirror_states(state)]
+
+
+def test_dihedral():
+    assert len(BoardSymmetry.dihedral("board", 3, 3)) == 8
+    assert len(BoardSymmetry.dihedral("board", 2, 3)) == 4
+    assert len(BoardSymmetry.dihedral("board", 1, 1)) == 1
+    symmetry = BoardSymmetry.dihedral("board", 2, 2)
+    assert symmetry.perm_array[0].tolist() == [0, 1, 2, 3]
+    board_set = {tuple(mirror.board) for mirror in symmetry.mirror_states(BoardState((1, 2, 3, 4), 0))}
+    assert board_set == {
+        (1, 2, 3, 4),
+        (2, 4, 1, 3),
+        (4, 3, 2, 1),
+        (3, 1, 4, 2),
+        (2, 1, 4, 3),
+        (4, 2, 3, 1),
+        (3, 4, 1, 2),
+        (1, 3, 2, 4),
+    }
+    with pytest.raises(ValueError):
+        BoardSymmetry("board", [[0, 0, 1]])
+
+
+@pytest.mark.parametrize(
+    ("state_type", "convert"),
+    [
+        (BoardState, tuple),
+        (BoardState, list),
+        (BoardState, np.array),
+        (BoardState, lambda board: np.array(board, dtype=np.int8).reshape(3, 3)),
+        (SeededBoardState, tuple),
+        (SeededBoardState, np.array),
+        (FrozenBoardState, tuple),
+        (BoardHashState, list),
+    ],
+)
+def test_mirror_digests_match(fixed_random_seed, state_type, convert):
+    rng = np.random.default_rng(0)
+    symmetry = BoardSymmetry.dihedral("board", 3, 3)
+    for turn in [0, 1]:
+        for _ in range(20):
+            assert_same_as_mirror_states(symmetry, state_type(convert(random_board(9, rng)), turn))
+
+
+def test_large_boards(fixed_random_seed):
+    rng = np.random.default_rng(1)
+    symmetry = BoardSymmetry.dihedral("board", 8, 8)
+    for state_type in [BoardState, SeededBoardState, FrozenBoardState]:
+        for _ in range(10):
+            board = tuple(random_board(64, rng))
+            assert_same_as_mirror_states(symmetry, state_type(board, 0))
+    assert_same_as_mirror_states(symmetry, BoardState(bytes(range(64)), 0))
+    assert_same_as_mirror_states(symmetry, BoardState(tuple(range(100, 164)), 0))
+
+
+def test_mirror_digests_fallback(fixed_random_seed):
+    symmetry = BoardSymmetry.dihedral("board", 2, 2)
+    assert_same_as_mirror_states(symmetry, BoardState(("x", "o", "", "x"), 0))
+    assert_same_as_mirror_states(symmetry, BoardState((0, 1 << 40, 0, 0), 0))
+    assert_same_as_mirror_states(symmetry, CustomDigestState((0, 1, 2, 3), 0))
+    with pytest.raises(ValueError):
+        symmetry.mirror_digests(BoardState((0, 1, 2), 0))
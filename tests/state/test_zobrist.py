@@ -0,0 +1,187 @@
+import pickle
+import random
+from dataclasses import dataclass
+from typing import ClassVar
+
+import numpy as np
+import pytest
+
+from game_analyzer import FrozenState, HashState, State
+from game_analyzer.state.hashing import field_seed, index_seed, value_digest
+from game_analyzer.state.state import dump_digest_maps, merge_digest_maps
+from game_analyzer.state.zobrist import ZobristTable
+
+
+@pytest.fixture
+def fixed_random_seed():
+    state = random.getstate()
+    random.seed(0)
+    for cls in [BoardState, FrozenBoardState, BoardHashState]:
+        cls._digest_map.clear()
+        cls._bind_digest_map()
+    yield
+    random.setstate(state)
+
+
+@dataclass
+class BoardState(State):
+    board: object
+    turn: int = 0
+
+
+@dataclass
+class NestedState(State):
+    cells: object
+
+
+@dataclass
+class SeededBoardState(State):
+    digest_seed: ClassVar[int] = 5
+    board: object
+    turn: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenBoardState(FrozenState):
+    board: tuple
+    turn: int = 0
+
+
+@dataclass
+class BoardHashState(HashState):
+    board: object
+    turn: int
+
+
+def random_boards(size, cell_size=64, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(-1, 2, cell_size, dtype=np.int8) for _ in range(size)]
+
+
+def test_zobrist_table():
+    table = ZobristTable()
+    board = np.array([[1, 0], [-1, 2]])
+    digest = table.digest(board)
+    expected = 0
+    for cell, value in enumerate(board.ravel()):
+        expected ^= int(table.table[cell, value - table.offset])
+    assert digest == expected
+    assert table.digest(np.array([[1, 0], [-1, 3]])) != digest
+    assert table.digest(np.array([7, -9, 0, 0, 5])) != 0
+    assert table.table.shape == (5, 17)
+    assert table.digest(board) == digest
+    assert table.digest(np.array([True, False])) == table.digest(np.array([1, 0], dtype=np.uint8))
+    assert table.digest(np.array([], dtype=np.int64)) == 0
+    assert pickle.loads(pickle.dumps(table)).digest(board) == digest
+    with pytest.raises(TypeError):
+        table.digest(np.array([0.5]))
+    with pytest.raises(ValueError):
+        table.digest(np.array([0, 1 << 40]))
+
+
+def test_table_cells_are_bounded(fixed_random_seed):
+    boards = random_boards(500)
+    digest_list = [BoardState(board).digest for board in boards]
+    assert digest_list == [BoardState(board.copy()).digest for board in boards]
+    assert len(set(digest_list)) == len(boards)
+    tuple_list = [tuple(int(v) for v in board) for board in boards]
+    assert [BoardState(board).digest for board in tuple_list] == digest_list
+    assert [BoardState(bytes(board.view(np.uint8))).digest for board in boards] != digest_list
+    assert list(BoardState._digest_map["board"]) == [np.ndarray]
+    assert BoardState._digest_map["board"][np.ndarray].table.shape == (64, 384)
+
+
+def test_short_tuples_and_lists(fixed_random_seed):
+    assert BoardState((1, 2)).digest == BoardState([1, 2]).digest
+    assert BoardState((1, 2)).digest != BoardState((2, 1)).digest
+    for i in range(20):
+        BoardState((i, i + 1)).digest
+    assert set(BoardState._digest_map["board"]) == {0, 1}
+    assert NestedState(("a", (1, 2))).digest == NestedState(["a", [1, 2]]).digest
+    assert NestedState(("a", (1, 2))).digest != NestedState(("a", (2, 1))).digest
+
+
+def test_digest_many_cells(fixed_random_seed):
+    states = [BoardState(tuple(int(v) for v in board), i % 2) for i, board in enumerate(random_boards(30))]
+    states += [BoardState((i, "x"), i % 2) for i in range(5)]
+    assert State.digest_many(states).tolist() == [state.digest for state in states]
+    seeded = [SeededBoardState(state.board, state.turn) for state in states]
+    assert State.digest_many(seeded).tolist() == [state.digest for state in seeded]
+
+
+def test_seeded_cells_match_per_index():
+    seed = field_seed(5, "board")
+    for board in [tuple(range(-20, 20)), (3, -1, 2), tuple(random_boards(1, 100)[0].tolist())]:
+        expected = value_digest(field_seed(5, "turn"), 0, 60)
+        for i, v in enumerate(board):
+            expected ^= value_digest(index_seed(seed, i), v, 60)
+        assert SeededBoardState(board).digest == expected
+        assert SeededBoardState(list(board)).digest == expected
+        assert SeededBoardState(np.array(board)).digest == expected
+        assert SeededBoardState(np.array(board, dtype=np.int16)).digest == expected
+    wide = (0, 1 << 40, -(1 << 40)) * 10
+    expected = value_digest(field_seed(5, "turn"), 0, 60)
+    for i, v in enumerate(wide):
+        expected ^= value_digest(index_seed(seed, i), v, 60)
+    assert SeededBoardState(np.array(wide)).digest == expected
+    assert SeededBoardState(bytes(range(40))).digest == SeededBoardState(tuple(range(40))).digest
+    assert not SeededBoardState._digest_map
+
+
+def test_wide_cells_fall_back_per_index(fixed_random_seed):
+    narrow = tuple(range(20))
+    wide = tuple(range(0, 1_600_000, 100_000))
+    for cls in [BoardState, FrozenBoardState]:
+        digest = cls(wide).digest
+        assert digest == cls(wide).digest
+        assert digest != cls(wide[::-1]).digest
+        assert cls(narrow).digest == cls(narrow).digest
+        assert cls(wide).digest == digest
+    assert BoardState(np.array(wide)).digest == BoardState(wide).digest
+    assert BoardHashState(list(wide), 0).digest == BoardHashState(wide, 0).digest
+    assert BoardState._digest_map["board"][np.ndarray].table.shape == (20, 20)
+
+
+def test_frozen_state_cells(fixed_random_seed):
+    boards = [tuple(int(v) for v in board) for board in random_boards(100)]
+    digest_list = [FrozenBoardState(board).digest for board in boards]
+    assert FrozenBoardState._cell_field_set == {"board"}
+    assert digest_list == [FrozenBoardState(board).digest for board in boards]
+    assert len(set(digest_list)) == len(boards)
+    assert list(FrozenBoardState._digest_map["board"]) == [np.ndarray]
+    assert FrozenBoardState((1, 2)).digest == FrozenBoardState((1, 2)).digest
+    assert FrozenBoardState(b"abc").digest == FrozenBoardState((97, 98, 99)).digest
+
+
+def test_hash_state_cells(fixed_random_seed):
+    board = random_boards(1)[0]
+    state = BoardHashState(board, 0)
+    digest = state.digest
+    state.board = tuple(range(20))
+    state.turn = 1
+    assert state.digest == BoardHashState(tuple(range(20)), 1).digest
+    state.board = board
+    state.turn = 0
+    assert state.digest == digest
+    state.board = [(1, 2), (3, 4)]
+    state.board[0] = (1, 3)
+    assert state.digest == BoardHashState([(1, 3), (3, 4)], 0).digest
+
+
+def test_dump_and_load_tables(fixed_random_seed):
+    board = random_boards(1)[0]
+    digest = BoardState(board).digest
+    digest_maps = pickle.loads(pickle.dumps(dump_digest_maps()))
+    BoardState._digest_map.clear()
+    merge_digest_maps(digest_maps)
+    assert BoardState(board).digest == digest
+
+
+def test_equal_cells_share_digest(fixed_random_seed):
+    board = (0,) * 15 + (1,)
+    for other in [(0,) * 15 + (True,), (0,) * 15 + (1.0,), (0,) * 15 + (np.int64(1),), (False,) * 15 + (1,)]:
+        for cls in [BoardState, SeededBoardState, FrozenBoardState]:
+            assert cls(board) == cls(other)
+            assert cls(board).digest == cls(other).digest
+        assert BoardHashState(list(board), 0).digest == BoardHashState(list(other), 0).digest
+    assert BoardState((0,) * 15 + (1.5,)).digest != BoardState(board).digest
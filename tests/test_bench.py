@@ -0,0 +1,76 @@
+import copy
+import json
+from pathlib import Path
+
+from game_analyzer.bench import BACKEND_DICT, SIZE_LIST, WORKLOAD_DICT, compare, run_isolated, run_suite
+from game_analyzer.bench.runner import iter_cases
+from game_analyzer.bench.__main__ import main
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+
+
+def test_run_suite_same_root_across_backends():
+    backend_list = [backend for backend in BACKEND_DICT if backend != "parallel"]
+    report = run_suite(list(WORKLOAD_DICT), [300], backend_list, isolate=False)
+    record_list = report["results"]
+    assert len(record_list) == len(WORKLOAD_DICT) * (len(backend_list) - 1) + 1
+    for workload in WORKLOAD_DICT:
+        root_set = {tuple(record["root"]) for record in record_list if record["workload"] == workload}
+        assert len(root_set) == 1
+    for record in record_list:
+        assert record["nodes"] > 0
+        assert record["nodes_per_sec"] > 0
+        assert record["peak_rss"] >= record["start_rss"]
+    json.dumps(report)
+
+
+def test_run_isolated():
+    record = run_isolated("stones", 300, "parallel")
+    assert record["nodes"] == 300
+    assert record["peak_rss"] > 0
+
+
+def test_compare_thresholds():
+    report = run_suite(["stones"], [300], ["python"], isolate=False)
+    baseline = copy.deepcopy(report)
+    assert compare(report, baseline) == []
+    record = baseline["results"][0]
+    record["total_time"] = record["sgg_time"] = record["ra_time"] = 1.0
+    record["peak_rss"] //= 2
+    assert compare(report, baseline) == [
+        {
+            "case": ("stones", 300, "python", 0),
+            "metric": "peak_rss",
+            "baseline": record["peak_rss"],
+            "current": report["results"][0]["peak_rss"],
+        }
+    ]
+    record["total_time"] = 1e-3
+    record["root"] = [0, -1]
+    metric_list = [regression["metric"] for regression in compare(report, baseline, min_time=0)]
+    assert "root" in metric_list
+    assert "total_time" in metric_list
+    assert "total_time" not in [regression["metric"] for regression in compare(report, baseline)]
+
+
+def test_committed_baseline():
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    size_list = [size for size in SIZE_LIST if size <= 10**5]
+    case_list = [(record["workload"], record["size"], record["backend"]) for record in baseline["results"]]
+    assert case_list == list(iter_cases(WORKLOAD_DICT, size_list, BACKEND_DICT))
+    assert not any("error" in record for record in baseline["results"])
+    report = run_suite(list(WORKLOAD_DICT), [10**3], ["python"], isolate=False)
+    assert compare(report, baseline, time_threshold=float("inf"), memory_threshold=float("inf")) == []
+
+
+def test_main(tmp_path):
+    output = tmp_path / "bench.json"
+    args = ["--workloads", "stones", "graph", "--backends", "python", "--sizes", "300", "--no-isolate"]
+    assert main([*args, "--output", str(output)]) == 0
+    baseline = json.loads(output.read_text())
+    assert [record["workload"] for record in baseline["results"]] == ["stones", "graph"]
+    assert main([*args, "--baseline", str(output), "--memory-threshold", "1"]) == 0
+    for record in baseline["results"]:
+        record["root"] = None
+    output.write_text(json.dumps(baseline))
+    assert main([*args, "--baseline", str(output)]) == 1
@@ -0,0 +1,102 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from game_analyzer import DenseIndex, HashIndex, Solver, SortedIndex
+from tests.solver.problems.shiritori import CASE_LIST as SHIRITORI_CASE_LIST
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_by_shiritori import Shiritori, ShiritoriState
+from tests.solver.test_solver_by_stones import Stones
+
+
+@pytest.fixture
+def fixed_random_seed():
+    state = random.getstate()
+    random.seed(0)
+    yield
+    random.setstate(state)
+
+
+def test_same_as_dict(fixed_random_seed):
+    index = HashIndex()
+    expected = {}
+    for i in range(10000):
+        key = random.randrange(1 << 60) if i % 2 else i
+        index[key] = i
+        expected[key] = i
+    assert len(index) == len(expected)
+    for key, value in expected.items():
+        assert key in index
+        assert index[key] == value
+        assert index.get(key) == value
+    assert index.get(1 << 61) is None
+    with pytest.raises(KeyError):
+        index[1 << 61]
+
+
+def test_overwrite():
+    index = HashIndex()
+    index[3] = 1
+    index[3] = 2
+    assert len(index) == 1
+    assert index[3] == 2
+
+
+def test_clear():
+    for index in [HashIndex(), DenseIndex(100)]:
+        for key in range(50):
+            index[key] = key
+        index.clear()
+        assert len(index) == 0
+        assert 3 not in index
+        index[7] = 1
+        assert list(index.items()) == [(7, 1)]
+
+
+def test_get_many(fixed_random_seed):
+    keys = [random.randrange(1 << 60) for _ in range(1000)]
+    index = HashIndex.from_arrays(np.array(keys, dtype=np.uint64), np.arange(1000, dtype=np.uint32))
+    values, found = index.get_many(np.array([*keys, 1 << 61], dtype=np.uint64))
+    assert found[:-1].all()
+    assert not found[-1]
+    assert values[:-1].tolist() == list(range(1000))
+
+
+def test_pickle(fixed_random_seed):
+    index = HashIndex()
+    for i in range(100):
+        index[random.randrange(1 << 60)] = i
+    loaded = pickle.loads(pickle.dumps(index))
+    assert dict(loaded.items()) == dict(index.items())
+
+
+def test_solver_with_hash_index():
+    for case, ans in STONES_CASE_LIST:
+        stones = Stones(**case)
+        result = Solver(index="hash").solve(stones)
+        ev, depth = result.state_to_params(stones.init_state)
+        assert ev == ans
+    for case, ans_list in SHIRITORI_CASE_LIST:
+        shiritori = Shiritori(**case)
+        result = Solver(index="hash").solve(shiritori)
+        for i in range(len(shiritori.words)):
+            ev, depth = result.state_to_params(ShiritoriState(shiritori.words[i][-3:]))
+            assert ev == ans_list[i]
+
+
+def test_sorted_index(fixed_random_seed):
+    keys = np.array(sorted(random.sample(range(1 << 60), 1000)), dtype=np.uint64)
+    index = SortedIndex(keys)
+    assert len(index) == len(keys)
+    for value, key in enumerate(keys.tolist()):
+        assert index[key] == value
+        assert key in index
+    assert index.get(keys[-1].item() + 1) is None
+    assert index.get(0) is None
+    queries = np.concatenate([keys[::3], np.array([0, (1 << 64) - 1], dtype=np.uint64)])
+    values, found = index.get_many(queries)
+    assert found[:-2].all()
+    assert not found[-2:].any()
+    assert (values[:-2] == np.arange(0, len(keys), 3)).all()
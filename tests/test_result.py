@@ -0,0 +1,143 @@
+from array import array
+
+import pytest
+
+from game_analyzer import Result, Solver
+from tests.solver.problems.stones import CASE_LIST as STONES_CASE_LIST
+from tests.solver.test_solver_canonical import SymmetricTicTacToe, all_states
+from tests.solver.test_solver_by_lrud import LRUD, LRUDState
+from tests.solver.test_solver_by_stones import Stones, StonesState
+from tests.solver.test_solver_root_only import TicTacToeState
+
+LRUD_CASE = {"h": 5, "w": 6, "init_cd": (2, 1), "s_list": "RLDRRUDDLRL", "t_list": "URRDRLLDLRD", "max_step": 11}
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load(tmp_path, mmap):
+    for i, (case, _) in enumerate(STONES_CASE_LIST):
+        stones = Stones(**case)
+        result = Solver(index="hash" if i % 2 else "dict").solve(stones)
+        result.save(tmp_path / f"{i}.bin")
+        loaded = Result.load(tmp_path / f"{i}.bin", mmap=mmap)
+        for stone in range(case["init_stones"] + 1):
+            state = StonesState(stones=stone)
+            assert loaded.state_to_params(state) == result.state_to_params(state)
+        assert loaded.state_to_params(StonesState(stones=-1)) is None
+
+
+def test_load_restores_digest_maps(tmp_path):
+    lrud = LRUD(**LRUD_CASE)
+    result = Solver().solve(lrud)
+    result.save(tmp_path / "lrud.bin")
+    expected = result.state_to_params(lrud.init_state)
+    LRUDState._digest_map.clear()
+    loaded = Result.load(tmp_path / "lrud.bin")
+    assert loaded.state_to_params(LRUDState(r=2, c=1, step=0, turn=0)) == expected
+
+
+def test_load_keeps_live_tables(tmp_path, monkeypatch):
+    case = STONES_CASE_LIST[0][0]
+    result = Solver().solve(Stones(**case))
+    state_list = [StonesState(stones=stone) for stone in range(case["init_stones"] + 1)]
+    state_list = [state for state in state_list if result.state_to_params(state) is not None]
+    expected = [result.state_to_params(state) for state in state_list]
+    result.save(tmp_path / "stones.bin")
+    monkeypatch.setitem(StonesState._digest_map, "stones", {})
+    live = Solver().solve(Stones(**case))
+    table = dict(StonesState._digest_map["stones"])
+    loaded = Result.load(tmp_path / "stones.bin")
+    assert StonesState._digest_map["stones"] == table
+    assert [live.state_to_params(state) for state in state_list] == expected
+    assert [loaded.state_to_params(state) for state in state_list] == expected
+    evals, depths, found = loaded.lookup_many(state_list)
+    assert found.all()
+    assert list(zip(evals.tolist(), depths.tolist(), strict=True)) == expected
+
+
+def test_save_keeps_only_own_tables(tmp_path, monkeypatch):
+    Solver().solve(Stones(**STONES_CASE_LIST[0][0]))
+    lrud = LRUD(**LRUD_CASE)
+    result = Solver().solve(lrud)
+    expected = result.state_to_params(lrud.init_state)
+    result.save(tmp_path / "lrud.bin")
+    monkeypatch.setitem(StonesState._digest_map, "stones", {})
+    Solver().solve(Stones(**STONES_CASE_LIST[0][0]))
+    loaded = Result.load(tmp_path / "lrud.bin")
+    assert loaded.digest_map_dict is None
+    assert loaded.state_types == {LRUDState}
+    assert loaded.state_to_params(lrud.init_state) == expected
+    evals, depths, found = loaded.lookup_many([lrud.init_state])
+    assert found.all()
+    assert (evals[0], depths[0]) == expected
+
+
+def test_save_load_canonical(tmp_path, monkeypatch):
+    game = SymmetricTicTacToe((0,) * 9)
+    state_list = list(all_states())
+    result = Solver(canonical=True).solve(game)
+    expected = [result.state_to_params(state) for state in state_list]
+    result.save(tmp_path / "canonical.bin")
+    with pytest.raises(ValueError, match="game"):
+        Result.load(tmp_path / "canonical.bin")
+    loaded = Result.load(tmp_path / "canonical.bin", game=game)
+    assert [loaded.state_to_params(state) for state in state_list] == expected
+    monkeypatch.setitem(TicTacToeState._digest_map, "board", {})
+    Solver(canonical=True).solve(game)
+    loaded = Result.load(tmp_path / "canonical.bin", game=game)
+    assert loaded.digest_map_dict is not None
+    assert [loaded.state_to_params(state) for state in state_list] == expected
+    evals, depths, found = loaded.lookup_many(state_list)
+    assert found.all()
+    assert list(zip(evals.tolist(), depths.tolist(), strict=True)) == expected
+    loaded.save(tmp_path / "resaved.bin")
+    resaved = Result.load(tmp_path / "resaved.bin", game=game)
+    assert [resaved.state_to_params(state) for state in state_list] == expected
+
+
+def test_save_score(tmp_path):
+    result = Result(
+        hash_dict={7: 1, 3: 0, 11: 1},
+        eval_list=array("i", [1000, -70000]),
+        depth_list=array("i", [2, 5]),
+        sgg_time=1.5,
+        ra_time=2.5,
+    )
+    result.save(tmp_path / "score.bin")
+    loaded = Result.load(tmp_path / "score.bin")
+    assert list(loaded.hash_dict) == [3, 7, 11]
+    assert [loaded.eval_list[loaded.hash_dict[key]] for key in [3, 7, 11]] == [1000, -70000, -70000]
+    assert [loaded.depth_list[loaded.hash_dict[key]] for key in [3, 7, 11]] == [2, 5, 5]
+    assert (loaded.sgg_time, loaded.ra_time) == (1.5, 2.5)
+
+
+def test_load_bad_file(tmp_path):
+    (tmp_path / "bad.bin").write_bytes(bytes(64))
+    with pytest.raises(ValueError, match="unsupported"):
+        Result.load(tmp_path / "bad.bin")
+
+
+@pytest.mark.parametrize("index", ["dict", "hash"])
+def test_lookup_many(tmp_path, index):
+    lrud = LRUD(**LRUD_CASE)
+    result = Solver(index=index).solve(lrud)
+    states = [
+        LRUDState(r=r, c=c, step=step, turn=turn)
+        for r in range(-1, 7)
+        for c in range(-1, 8)
+        for step in range(12)
+        for turn in range(2)
+    ]
+    result.save(tmp_path / "lrud.bin")
+    for res in [result, Result.load(tmp_path / "lrud.bin")]:
+        evals, depths, found = res.lookup_many(states)
+        for state, ev, depth, ok in zip(states, evals.tolist(), depths.tolist(), found.tolist()):
+            params = res.state_to_params(state)
+            assert ok == (params is not None)
+            assert (ev, depth) == (params if ok else (0, -1))
+
+
+def test_digest_many():
+    states = [StonesState(stones=i) for i in [5, 3, 100000, 5]]
+    digests = StonesState.digest_many(states)
+    assert digests.tolist() == [state.digest for state in states]
+    assert LRUDState.digest_many([]).tolist() == []